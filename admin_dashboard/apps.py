@@ -3,3 +3,6 @@ from django.apps import AppConfig
 
 class AdminDashboardConfig(AppConfig):
     name = 'admin_dashboard'
+
+    def ready(self):
+        from . import signals  # noqa: F401
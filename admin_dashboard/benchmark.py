@@ -0,0 +1,352 @@
+import itertools
+import json
+import math
+import threading
+import time
+import uuid
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.contrib.sessions.models import Session
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import close_old_connections, connection, transaction
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+from django.urls import get_resolver
+from magang.models import Departement, Lowongan, Pendaftar, TransaksiPendaftaran
+from magang.services.cv_processing_service import CvProcessingService
+from magang.services.cv_storage_service import CvStorageService
+from .counter_service import DashboardCounterService
+from .signals import invalidate_dashboard_cache
+
+# PDF minimal untuk skenario submit pendaftaran
+BENCHMARK_PDF = b'%PDF-1.4\n1 0 obj << /Type /Catalog >> endobj\ntrailer << /Root 1 0 R >>\n%%EOF\n'
+# NIK pendaftar buatan benchmark: 99 + token run (4 digit) + nomor urut, dihapus setelah selesai
+BENCHMARK_NIK_PREFIX = '99'
+PERCENTILES = (50, 95, 99)
+
+
+def percentile(sorted_values, pct):
+    """Persentil nearest-rank dari list yang sudah terurut"""
+    if not sorted_values:
+        return 0.0
+    rank = max(math.ceil(pct / 100 * len(sorted_values)), 1)
+    return sorted_values[rank - 1]
+
+
+def _allowed_host():
+    for host in settings.ALLOWED_HOSTS:
+        host = host.lstrip('.')
+        if host and host != '*':
+            return host
+    return 'localhost'
+
+
+class EndpointBenchmark:
+    """
+    Load test in-process semua endpoint HTTP melalui django.test.Client: tanpa server,
+    tetapi melewati URL routing, middleware, view dan database yang sebenarnya.
+    Setiap endpoint dijalankan bergantian dengan sejumlah thread bersamaan; latency,
+    throughput dan jumlah query dicatat per endpoint.
+    Skenario tulis hanya dijalankan dengan writes=True dan hanya yang bisa diulang tanpa
+    mengubah isi data (status dikirim ulang dengan nilai yang sama, update dengan data yang
+    sama). updated_at transaksi dikembalikan dan pendaftaran dari skenario submit dihapus
+    lagi di cleanup(); versi feed lowongan tetap naik (ETag dan cache pencarian berganti)
+    karena versi tidak boleh mundur. Route create/delete/import dilewati.
+    Test Client tidak pernah menutup koneksi database; dengan close_connections=True setiap
+    request diapit close_old_connections() seperti handler WSGI, sehingga biaya connect,
+    CONN_MAX_AGE, CONN_HEALTH_CHECKS dan pool ikut terukur.
+    """
+
+    # Route /dashboard/api/* yang sengaja tidak dijalankan karena membuat atau menghapus data
+    SKIPPED_ROUTES = {
+        'api_lowongan_create': 'membuat data',
+        'api_lowongan_delete': 'menghapus data',
+        'api_departemen_create': 'membuat data',
+        'api_departemen_delete': 'menghapus data',
+        'api_pendaftar_import': 'membuat data',
+    }
+
+    def __init__(self, username=None, writes=False, close_connections=False):
+        self.writes = writes
+        self.close_connections = close_connections
+        self.username = username
+        self.temporary_user = None
+        self.nik_prefix = f'{BENCHMARK_NIK_PREFIX}{uuid.uuid4().int % 10000:04d}'
+        self.nik_counter = itertools.count(1)
+        self.clients = []
+        # updated_at asli transaksi yang disentuh skenario update status, dikembalikan di cleanup()
+        self.original_updated_at = {}
+
+    # === SETUP ===
+
+    def setup(self):
+        """Menyiapkan user staff untuk endpoint dashboard"""
+        User = get_user_model()
+        if self.username:
+            self.user = User.objects.get(username=self.username)
+            if not (self.user.is_staff or self.user.is_superuser):
+                raise ValueError(f'User {self.username} bukan staff')
+        else:
+            self.user = User.objects.create_user(f'benchmark-{uuid.uuid4().hex[:8]}', is_staff=True)
+            self.temporary_user = self.user
+
+    def _ensure_clients(self, count):
+        """
+        Satu Client per thread (cookie session tidak dibagi antar thread). Login dilakukan
+        di awal secara berurutan agar tidak bersaing menulis tabel session (SQLite terkunci).
+        """
+        while len(self.clients) < count:
+            # Exception dari view dijadikan respons 500 dan dihitung sebagai error
+            client = Client(HTTP_HOST=_allowed_host(), raise_request_exception=False)
+            client.force_login(self.user)
+            self.clients.append(client)
+
+    def scenarios(self):
+        """
+        Daftar skenario: dict name, route (nama URL), method, path, expected (status yang dianggap
+        berhasil) dan fungsi opsional body() untuk request POST/PUT
+        """
+        lowongan = Lowongan.objects.order_by('-tanggal_mulai').first()
+        dept = Departement.objects.order_by('id_dept').first()
+        transaksi = TransaksiPendaftaran.objects.order_by('-created_at').first()
+        decided = list(
+            TransaksiPendaftaran.objects.exclude(status='pending').order_by('-updated_at')
+            .values_list('id_transaksi_pendaftaran', 'status', 'updated_at')[:20]
+        )
+
+        scenarios = [
+            {'name': 'lowongan feed', 'route': 'get_lowongan_api', 'path': '/api/lowongan/'},
+            {'name': 'lowongan feed search', 'route': 'get_lowongan_api', 'path': '/api/lowongan/?search=intern'},
+            {'name': 'dashboard stats', 'route': 'dashboard_stats', 'path': '/dashboard/api/stats/'},
+            {'name': 'dashboard trend', 'route': 'trend_data', 'path': '/dashboard/api/trend/'},
+            {'name': 'dashboard department', 'route': 'department_data', 'path': '/dashboard/api/department/'},
+            {'name': 'recent applicants', 'route': 'recent_applicants', 'path': '/dashboard/api/recent-applicants/'},
+            {'name': 'dashboard bootstrap', 'route': 'dashboard_bootstrap', 'path': '/dashboard/api/bootstrap/'},
+            {'name': 'cache stats', 'route': 'cache_stats', 'path': '/dashboard/api/cache-stats/'},
+            {'name': 'request metrics', 'route': 'request_metrics', 'path': '/dashboard/api/request-metrics/'},
+            {'name': 'lowongan list', 'route': 'api_lowongan_list', 'path': '/dashboard/api/lowongan/'},
+            {'name': 'departemen list', 'route': 'api_departemen_list', 'path': '/dashboard/api/departemen/'},
+            {'name': 'pending applicants', 'route': 'api_pendaftar_pending', 'path': '/dashboard/api/pendaftar/pending/'},
+            {'name': 'applicant history', 'route': 'api_pendaftar_history', 'path': '/dashboard/api/pendaftar/history/'},
+            {'name': 'applicant export', 'route': 'api_pendaftar_export', 'path': '/dashboard/api/pendaftar/export/?scope=pending'},
+        ]
+        if lowongan:
+            scenarios.append({'name': 'lowongan detail', 'route': 'api_lowongan_detail',
+                              'path': f'/dashboard/api/lowongan/{lowongan.id_lowongan}/'})
+        if dept:
+            scenarios.append({'name': 'departemen detail', 'route': 'api_departemen_detail',
+                              'path': f'/dashboard/api/departemen/{dept.id_dept}/'})
+        if transaksi:
+            id_transaksi = transaksi.id_transaksi_pendaftaran
+            scenarios.append({'name': 'applicant detail', 'route': 'api_pendaftar_detail',
+                              'path': f'/dashboard/api/pendaftar/detail/{id_transaksi}/'})
+            # Data seed tidak selalu punya file CV, 404 tetap diukur sebagai respons normal
+            scenarios.append({'name': 'applicant cv', 'route': 'api_pendaftar_cv',
+                              'path': f'/dashboard/api/pendaftar/{id_transaksi}/cv/', 'expected': (200, 404)})
+
+        if not self.writes:
+            return scenarios
+
+        if lowongan:
+            scenarios.append({'name': 'submit pendaftaran', 'route': 'submit_pendaftaran', 'method': 'post',
+                              'path': '/api/submit-pendaftaran/', 'body': lambda: self._submission(lowongan)})
+            lowongan_data = {
+                'posisi': lowongan.posisi,
+                'deskripsi': lowongan.deskripsi,
+                'tanggal_mulai': lowongan.tanggal_mulai.isoformat(),
+                'tanggal_selesai': lowongan.tanggal_selesai.isoformat(),
+                'departemen_id': lowongan.departement_id,
+            }
+            scenarios.append({'name': 'lowongan update', 'route': 'api_lowongan_update', 'method': 'put',
+                              'path': f'/dashboard/api/lowongan/{lowongan.id_lowongan}/update/',
+                              'json': lowongan_data})
+        if dept:
+            scenarios.append({'name': 'departemen update', 'route': 'api_departemen_update', 'method': 'put',
+                              'path': f'/dashboard/api/departemen/{dept.id_dept}/update/',
+                              'json': {'nama_dept': dept.nama_dept}})
+        if decided:
+            self.original_updated_at = {pk: updated_at for pk, _, updated_at in decided}
+            id_transaksi, status, _ = decided[0]
+            scenarios.append({'name': 'update status', 'route': 'api_pendaftar_update_status', 'method': 'post',
+                              'path': f'/dashboard/api/pendaftar/{id_transaksi}/update-status/',
+                              'json': {'status': status}})
+            same_status = [pk for pk, row_status, _ in decided if row_status == status]
+            scenarios.append({'name': 'bulk update status', 'route': 'api_pendaftar_bulk_update_status',
+                              'method': 'post', 'path': '/dashboard/api/pendaftar/bulk-update-status/',
+                              'json': {'status': status, 'ids': same_status}})
+        return scenarios
+
+    def uncovered_routes(self, scenarios):
+        """
+        Route /api/ (publik dan dashboard) yang tidak punya skenario
+        Returns:
+            list: (nama route, alasan)
+        """
+        covered = {scenario['route'] for scenario in scenarios}
+        names = set()
+        for pattern in get_resolver().url_patterns:
+            for sub in getattr(pattern, 'url_patterns', [pattern]):
+                if getattr(sub, 'name', None) and str(sub.pattern).startswith('api/'):
+                    names.add(sub.name)
+        return sorted(
+            (name, self.SKIPPED_ROUTES.get(name, 'tidak ada data contoh' if self.writes else 'tanpa --writes'))
+            for name in names - covered
+        )
+
+    def _submission(self, lowongan):
+        nik = f'{self.nik_prefix}{next(self.nik_counter):010d}'
+        return {
+            'lowongan': lowongan.id_lowongan,
+            'nik': nik,
+            'name': 'Benchmark Pendaftar',
+            'gender': 'L',
+            'dob': '2000-01-01',
+            'address': 'Jl. Benchmark No. 1',
+            'no_telp': '081200000000',
+            'university': 'Universitas Benchmark',
+            'major': 'Teknik Informatika',
+            'ipk': '3.50',
+            'path_cv': SimpleUploadedFile('cv.pdf', BENCHMARK_PDF, content_type='application/pdf'),
+        }
+
+    # === EKSEKUSI ===
+
+    def _request(self, scenario, client):
+        """Menjalankan satu request, mengembalikan (detik, jumlah query, status HTTP)"""
+        method = scenario.get('method', 'get')
+        kwargs = {}
+        if 'json' in scenario:
+            kwargs = {'data': json.dumps(scenario['json']), 'content_type': 'application/json'}
+        elif 'body' in scenario:
+            kwargs = {'data': scenario['body']()}
+
+        with CaptureQueriesContext(connection) as queries:
+            start = time.perf_counter()
+            if self.close_connections:
+                # request_started
+                close_old_connections()
+            response = getattr(client, method)(scenario['path'], **kwargs)
+            if response.streaming:
+                for _ in response.streaming_content:
+                    pass
+            elapsed = time.perf_counter() - start
+            response.close()
+            if self.close_connections:
+                # request_finished: koneksi ditutup atau dikembalikan ke pool sesuai konfigurasi
+                close_old_connections()
+        return elapsed, len(queries), response.status_code
+
+    def _worker(self, scenario, count, client):
+        try:
+            return [self._request(scenario, client) for _ in range(count)]
+        finally:
+            if threading.current_thread() is not threading.main_thread():
+                # Koneksi database thread pool ditutup agar tidak menumpuk
+                connection.close()
+
+    def run_scenario(self, scenario, requests=50, concurrency=4, warmup=2):
+        """
+        Returns:
+            dict: name, requests, errors, error_statuses ({status: jumlah}), p50/p95/p99/mean (ms),
+                  throughput (req/detik), queries (rata-rata), max_queries
+        """
+        concurrency = max(min(concurrency, requests), 1)
+        self._ensure_clients(concurrency)
+        for _ in range(warmup):
+            self._request(scenario, self.clients[0])
+
+        counts = [requests // concurrency + (1 if i < requests % concurrency else 0) for i in range(concurrency)]
+        start = time.perf_counter()
+        if concurrency == 1:
+            samples = self._worker(scenario, requests, self.clients[0])
+        else:
+            with ThreadPoolExecutor(max_workers=concurrency) as executor:
+                samples = [
+                    sample
+                    for result in executor.map(
+                        lambda index: self._worker(scenario, counts[index], self.clients[index]), range(concurrency)
+                    )
+                    for sample in result
+                ]
+        wall = time.perf_counter() - start
+
+        expected = scenario.get('expected', (200,))
+        error_statuses = Counter(str(status) for _, _, status in samples if status not in expected)
+        latencies = sorted(elapsed * 1000 for elapsed, _, _ in samples)
+        query_counts = [queries for _, queries, _ in samples]
+        result = {
+            'name': scenario['name'],
+            'requests': len(samples),
+            'errors': sum(error_statuses.values()),
+            'error_statuses': dict(error_statuses),
+            'mean': round(sum(latencies) / len(latencies), 3) if latencies else 0,
+            'throughput': round(len(samples) / wall, 1) if wall else 0,
+            'queries': round(sum(query_counts) / len(query_counts), 1) if query_counts else 0,
+            'max_queries': max(query_counts, default=0),
+        }
+        for pct in PERCENTILES:
+            result[f'p{pct}'] = round(percentile(latencies, pct), 3)
+        return result
+
+    def cleanup(self):
+        """
+        Menghapus pendaftar buatan skenario submit, session login benchmark dan user sementara,
+        serta mengembalikan updated_at transaksi yang disentuh skenario update status
+        Returns:
+            int: jumlah pendaftar yang dihapus
+        """
+        pendaftar_qs = Pendaftar.objects.filter(nik__startswith=self.nik_prefix)
+        with transaction.atomic():
+            CvStorageService.release_pendaftar(pendaftar_qs)
+            CvProcessingService.discard_pendaftar_jobs(pendaftar_qs)
+            DashboardCounterService.record_deletion(
+                pendaftar_qs=pendaftar_qs,
+                transaksi_qs=TransaksiPendaftaran.objects.filter(pendaftar__in=pendaftar_qs)
+            )
+            deleted = pendaftar_qs.count()
+            pendaftar_qs.delete()
+            # update() tidak menjalankan auto_now, sehingga nilai lama tersimpan apa adanya
+            for id_transaksi, updated_at in self.original_updated_at.items():
+                TransaksiPendaftaran.objects.filter(id_transaksi_pendaftaran=id_transaksi).update(updated_at=updated_at)
+            self.original_updated_at = {}
+            invalidate_dashboard_cache()
+
+        Session.objects.filter(session_key__in=[
+            client.cookies[settings.SESSION_COOKIE_NAME].value for client in self.clients
+        ]).delete()
+        self.clients = []
+        if self.temporary_user is not None:
+            self.temporary_user.delete()
+            self.temporary_user = None
+        return deleted
+
+
+def compare_with_baseline(results, baseline, max_regression, min_delta_ms=1.0):
+    """
+    Membandingkan hasil dengan baseline (hasil run sebelumnya)
+    Args:
+        results (list): hasil run_scenario()
+        baseline (dict): {'results': [...]} dari file --save
+        max_regression (float): batas kenaikan p95 relatif, misal 0.2 untuk 20%
+        min_delta_ms (float): kenaikan p95 di bawah ini diabaikan (noise endpoint yang sangat cepat)
+    Returns:
+        list: pesan regresi, kosong jika tidak ada
+    """
+    previous = {row['name']: row for row in baseline.get('results', [])}
+    failures = []
+    for row in results:
+        before = previous.get(row['name'])
+        if before is None:
+            continue
+        limit = before['p95'] * (1 + max_regression)
+        if row['p95'] > limit and row['p95'] - before['p95'] >= min_delta_ms:
+            failures.append(
+                f"{row['name']}: p95 {row['p95']:.1f} ms > {before['p95']:.1f} ms + {max_regression:.0%}"
+            )
+        if row['max_queries'] > before['max_queries']:
+            failures.append(
+                f"{row['name']}: jumlah query naik {before['max_queries']} -> {row['max_queries']}"
+            )
+    return failures
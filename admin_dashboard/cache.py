@@ -0,0 +1,120 @@
+import threading
+from functools import wraps
+from django.conf import settings
+from django.core.cache import caches
+from .service import DashboardService
+
+
+class DashboardCache:
+    """
+    Cache untuk data dashboard yang sering di-poll.
+    Invalidasi memakai nomor generasi: setiap perubahan data menaikkan
+    generasi sehingga seluruh entry lama tidak terpakai lagi dan
+    kedaluwarsa sendiri sesuai TTL.
+    """
+    ALIAS = 'dashboard'
+    PREFIX = 'dashboard'
+    GENERATION_KEY = 'dashboard:generation'
+
+    _lock = threading.Lock()
+    _stats = {'hits': 0, 'misses': 0, 'invalidations': 0}
+
+    @staticmethod
+    def _cache():
+        return caches[DashboardCache.ALIAS]
+
+    @staticmethod
+    def _count(name):
+        with DashboardCache._lock:
+            DashboardCache._stats[name] += 1
+
+    @staticmethod
+    def _generation():
+        cache = DashboardCache._cache()
+        generation = cache.get(DashboardCache.GENERATION_KEY)
+        if generation is None:
+            # Generasi tidak boleh kedaluwarsa, kalau tidak entry lama bisa terpakai lagi
+            cache.add(DashboardCache.GENERATION_KEY, 1, timeout=None)
+            generation = cache.get(DashboardCache.GENERATION_KEY, 1)
+        return generation
+
+    @staticmethod
+    def make_key(name, args=(), kwargs=None):
+        """Membuat cache key dari nama method, argumen dan generasi saat ini"""
+        parts = [str(arg) for arg in args]
+        parts += [f'{k}={v}' for k, v in sorted((kwargs or {}).items())]
+        return f"{DashboardCache.PREFIX}:{DashboardCache._generation()}:{name}:{','.join(parts)}"
+
+    @staticmethod
+    def get_or_compute(name, func, args=(), kwargs=None):
+        """
+        Mengambil hasil dari cache atau menghitungnya jika belum ada
+        Args:
+            name (str): nama data dashboard
+            func (callable): fungsi yang menghasilkan data
+        Returns:
+            hasil func(*args, **kwargs)
+        """
+        timeout = settings.DASHBOARD_CACHE_TIMEOUT
+        if timeout <= 0:
+            return func(*args, **(kwargs or {}))
+
+        cache = DashboardCache._cache()
+        key = DashboardCache.make_key(name, args, kwargs)
+        result = cache.get(key)
+        if result is not None:
+            DashboardCache._count('hits')
+            return result
+
+        DashboardCache._count('misses')
+        result = func(*args, **(kwargs or {}))
+        cache.set(key, result, timeout)
+        return result
+
+    @staticmethod
+    def invalidate():
+        """Membuang seluruh data dashboard di cache dengan menaikkan generasi"""
+        cache = DashboardCache._cache()
+        try:
+            cache.incr(DashboardCache.GENERATION_KEY)
+        except ValueError:
+            # Key generasi belum ada atau sudah terhapus
+            cache.set(DashboardCache.GENERATION_KEY, 2, timeout=None)
+        DashboardCache._count('invalidations')
+
+    @staticmethod
+    def get_stats():
+        """Mendapatkan statistik hit/miss cache untuk proses ini"""
+        with DashboardCache._lock:
+            stats = dict(DashboardCache._stats)
+        total = stats['hits'] + stats['misses']
+        stats['hit_ratio'] = round(stats['hits'] / total, 4) if total else 0
+        stats['backend'] = settings.DASHBOARD_CACHE_BACKEND
+        stats['timeout'] = settings.DASHBOARD_CACHE_TIMEOUT
+        return stats
+
+    @staticmethod
+    def reset_stats():
+        """Reset statistik hit/miss"""
+        with DashboardCache._lock:
+            for name in DashboardCache._stats:
+                DashboardCache._stats[name] = 0
+
+
+def dashboard_cached(name):
+    """Decorator untuk menyimpan hasil method baca dashboard di cache"""
+    def decorator(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            return DashboardCache.get_or_compute(name, func, args, kwargs)
+        return wrapper
+    return decorator
+
+
+class CachedDashboardService:
+    """Method baca DashboardService yang dibungkus cache, dipakai oleh API dashboard"""
+    get_statistics = staticmethod(dashboard_cached('statistics')(DashboardService.get_statistics))
+    get_trend_data = staticmethod(dashboard_cached('trend')(DashboardService.get_trend_data))
+    get_department_distribution = staticmethod(dashboard_cached('department')(DashboardService.get_department_distribution))
+    get_recent_applicants = staticmethod(dashboard_cached('recent_applicants')(DashboardService.get_recent_applicants))
+    get_dashboard_bootstrap = staticmethod(dashboard_cached('bootstrap')(DashboardService.get_dashboard_bootstrap))
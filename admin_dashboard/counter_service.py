@@ -0,0 +1,220 @@
+from collections import Counter
+from django.db import IntegrityError, transaction
+from django.db.models import BigIntegerField, Case, Count, F, Q, Value, When
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+from magang.models import Pendaftar, TransaksiPendaftaran
+from .models import DashboardCounter
+
+
+class DashboardCounterService:
+    """Service untuk memelihara rollup counter dashboard secara inkremental"""
+
+    @staticmethod
+    def _apply(deltas):
+        """
+        Menerapkan perubahan counter secara atomik.
+        Semua counter yang sudah ada diperbarui dengan satu UPDATE; baris counter
+        baru (misal tanggal harian baru) dibuat terpisah.
+        Args:
+            deltas (Counter): {(scope, key): delta}
+        """
+        deltas = {item: delta for item, delta in deltas.items() if delta}
+        if not deltas:
+            return
+
+        condition = Q()
+        cases = []
+        for (scope, key), delta in deltas.items():
+            condition |= Q(scope=scope, key=key)
+            cases.append(When(scope=scope, key=key, then=Value(delta)))
+        increment = Case(*cases, default=Value(0), output_field=BigIntegerField())
+
+        # Tanpa savepoint: jika gagal, transaksi pemanggil ikut batal
+        with transaction.atomic(savepoint=False):
+            updated = DashboardCounter.objects.filter(condition).update(
+                value=F('value') + increment, updated_at=timezone.now()
+            )
+            if updated == len(deltas):
+                return
+
+            existing = set(DashboardCounter.objects.filter(condition).values_list('scope', 'key'))
+            for (scope, key), delta in deltas.items():
+                if (scope, key) in existing:
+                    continue
+                try:
+                    with transaction.atomic():
+                        DashboardCounter.objects.create(scope=scope, key=key, value=delta)
+                except IntegrityError:
+                    # Baris counter dibuat oleh request lain secara bersamaan
+                    DashboardCounter.objects.filter(
+                        scope=scope, key=key
+                    ).update(value=F('value') + delta, updated_at=timezone.now())
+
+    @staticmethod
+    def _pendaftar_deltas(pendaftar_qs, sign=1):
+        """Menghitung delta counter dari queryset pendaftar (total + harian)"""
+        deltas = Counter()
+        per_hari = pendaftar_qs.annotate(
+            tanggal=TruncDate('created_at')
+        ).values('tanggal').annotate(count=Count('id_pendaftar')).order_by()
+
+        for item in per_hari:
+            deltas[(DashboardCounter.SCOPE_TOTAL, 'pendaftar')] += sign * item['count']
+            deltas[(DashboardCounter.SCOPE_HARIAN, item['tanggal'].isoformat())] += sign * item['count']
+        return deltas
+
+    @staticmethod
+    def _transaksi_deltas(transaksi_qs, sign=1):
+        """Menghitung delta counter dari queryset transaksi (total + status + departemen)"""
+        deltas = Counter()
+        per_group = transaksi_qs.values(
+            'status', 'lowongan__departement_id'
+        ).annotate(count=Count('id_transaksi_pendaftaran')).order_by()
+
+        for item in per_group:
+            count = sign * item['count']
+            deltas[(DashboardCounter.SCOPE_TOTAL, 'transaksi')] += count
+            deltas[(DashboardCounter.SCOPE_STATUS, item['status'])] += count
+            deltas[(DashboardCounter.SCOPE_DEPARTEMEN, str(item['lowongan__departement_id']))] += count
+        return deltas
+
+    @staticmethod
+    def record_pendaftar_created(pendaftar):
+        """Mencatat pendaftar baru"""
+        tanggal = timezone.localdate(pendaftar.created_at)
+        DashboardCounterService._apply(Counter({
+            (DashboardCounter.SCOPE_TOTAL, 'pendaftar'): 1,
+            (DashboardCounter.SCOPE_HARIAN, tanggal.isoformat()): 1,
+        }))
+
+    @staticmethod
+    def record_transaksi_created(transaksi):
+        """Mencatat transaksi pendaftaran baru"""
+        DashboardCounterService._apply(Counter({
+            (DashboardCounter.SCOPE_TOTAL, 'transaksi'): 1,
+            (DashboardCounter.SCOPE_STATUS, transaksi.status): 1,
+            (DashboardCounter.SCOPE_DEPARTEMEN, str(transaksi.lowongan.departement_id)): 1,
+        }))
+
+    @staticmethod
+    def record_submission(pendaftar, transaksi, pendaftar_created):
+        """Mencatat satu pendaftaran (pendaftar baru jika pendaftar_created + transaksi) dalam satu UPDATE"""
+        deltas = Counter({
+            (DashboardCounter.SCOPE_TOTAL, 'transaksi'): 1,
+            (DashboardCounter.SCOPE_STATUS, transaksi.status): 1,
+            (DashboardCounter.SCOPE_DEPARTEMEN, str(transaksi.lowongan.departement_id)): 1,
+        })
+        if pendaftar_created:
+            deltas[(DashboardCounter.SCOPE_TOTAL, 'pendaftar')] += 1
+            deltas[(DashboardCounter.SCOPE_HARIAN, timezone.localdate(pendaftar.created_at).isoformat())] += 1
+        DashboardCounterService._apply(deltas)
+
+    @staticmethod
+    def record_bulk_submission(pendaftar_list, transaksi_list):
+        """
+        Mencatat banyak pendaftaran sekaligus (bulk import) dalam satu UPDATE.
+        transaksi.lowongan harus sudah dimuat agar departement_id tidak memicu query.
+        """
+        deltas = Counter()
+        for pendaftar in pendaftar_list:
+            deltas[(DashboardCounter.SCOPE_TOTAL, 'pendaftar')] += 1
+            deltas[(DashboardCounter.SCOPE_HARIAN, timezone.localdate(pendaftar.created_at).isoformat())] += 1
+        for transaksi in transaksi_list:
+            deltas[(DashboardCounter.SCOPE_TOTAL, 'transaksi')] += 1
+            deltas[(DashboardCounter.SCOPE_STATUS, transaksi.status)] += 1
+            deltas[(DashboardCounter.SCOPE_DEPARTEMEN, str(transaksi.lowongan.departement_id))] += 1
+        DashboardCounterService._apply(deltas)
+
+    @staticmethod
+    def record_status_change(old_status, new_status, count=1):
+        """Mencatat perubahan status transaksi"""
+        if old_status == new_status or not count:
+            return
+        DashboardCounterService._apply(Counter({
+            (DashboardCounter.SCOPE_STATUS, old_status): -count,
+            (DashboardCounter.SCOPE_STATUS, new_status): count,
+        }))
+
+    @staticmethod
+    def record_bulk_status_change(old_status_counts, new_status):
+        """
+        Mencatat perubahan status banyak transaksi dalam satu UPDATE counter
+        Args:
+            old_status_counts (dict): {status lama: jumlah transaksi}
+            new_status (str): status baru
+        """
+        deltas = Counter()
+        for old_status, count in old_status_counts.items():
+            if old_status == new_status:
+                continue
+            deltas[(DashboardCounter.SCOPE_STATUS, old_status)] -= count
+            deltas[(DashboardCounter.SCOPE_STATUS, new_status)] += count
+        DashboardCounterService._apply(deltas)
+
+    @staticmethod
+    def record_departemen_change(id_lowongan, old_dept_id, new_dept_id):
+        """Memindahkan hitungan transaksi saat lowongan pindah departemen"""
+        if old_dept_id == new_dept_id:
+            return
+        count = TransaksiPendaftaran.objects.filter(lowongan_id=id_lowongan).count()
+        if not count:
+            return
+        DashboardCounterService._apply(Counter({
+            (DashboardCounter.SCOPE_DEPARTEMEN, str(old_dept_id)): -count,
+            (DashboardCounter.SCOPE_DEPARTEMEN, str(new_dept_id)): count,
+        }))
+
+    @staticmethod
+    def bump_version(name):
+        """Menaikkan nomor versi data, dipanggil di dalam transaksi yang mengubah data tersebut"""
+        DashboardCounterService._apply(Counter({(DashboardCounter.SCOPE_VERSI, name): 1}))
+
+    @staticmethod
+    def get_version(name):
+        """
+        Membaca nomor versi data
+        Returns:
+            tuple: (versi, waktu perubahan terakhir atau None jika belum pernah berubah)
+        """
+        row = DashboardCounter.objects.filter(
+            scope=DashboardCounter.SCOPE_VERSI, key=name
+        ).values_list('value', 'updated_at').first()
+        return row or (0, None)
+
+    @staticmethod
+    def record_deletion(pendaftar_qs=None, transaksi_qs=None):
+        """
+        Mengurangi counter untuk baris yang akan dihapus.
+        Harus dipanggil sebelum delete() di dalam transaksi yang sama,
+        termasuk baris yang ikut terhapus karena CASCADE.
+        """
+        deltas = Counter()
+        if pendaftar_qs is not None:
+            deltas.update(DashboardCounterService._pendaftar_deltas(pendaftar_qs, sign=-1))
+        if transaksi_qs is not None:
+            deltas.update(DashboardCounterService._transaksi_deltas(transaksi_qs, sign=-1))
+        DashboardCounterService._apply(deltas)
+
+    @staticmethod
+    def rebuild():
+        """
+        Membangun ulang seluruh counter dari tabel sumber
+        Returns:
+            int: jumlah baris counter yang dibuat
+        """
+        with transaction.atomic():
+            deltas = Counter({
+                (DashboardCounter.SCOPE_TOTAL, 'pendaftar'): 0,
+                (DashboardCounter.SCOPE_TOTAL, 'transaksi'): 0,
+            })
+            deltas.update(DashboardCounterService._pendaftar_deltas(Pendaftar.objects.all()))
+            deltas.update(DashboardCounterService._transaksi_deltas(TransaksiPendaftaran.objects.all()))
+
+            # Counter versi tidak bisa dihitung ulang, kalau direset ETag lama bisa cocok lagi
+            DashboardCounter.objects.exclude(scope=DashboardCounter.SCOPE_VERSI).delete()
+            DashboardCounter.objects.bulk_create([
+                DashboardCounter(scope=scope, key=key, value=value)
+                for (scope, key), value in deltas.items()
+            ])
+        return len(deltas)
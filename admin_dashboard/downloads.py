@@ -0,0 +1,127 @@
+import os
+import re
+from django.conf import settings
+from django.http import FileResponse, HttpResponse, StreamingHttpResponse
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import content_disposition_header, http_date, parse_http_date_safe, quote_etag
+
+DOWNLOAD_CHUNK_SIZE = 64 * 1024
+RANGE_RE = re.compile(r'^bytes=(\d*)-(\d*)$')
+
+
+def parse_range(header, size):
+    """
+    Header Range satu rentang byte
+    Returns:
+        tuple: (start, end) inklusif, None jika header tidak ada/tidak didukung
+        (dilayani sebagai file utuh), atau False jika rentang di luar ukuran file (416)
+    """
+    match = RANGE_RE.match((header or '').replace(' ', ''))
+    if not match:
+        # Tidak ada Range, unit selain bytes, atau multi-range: kirim file utuh (RFC 9110 membolehkan)
+        return None
+    first, last = match.groups()
+    if not first and not last:
+        return None
+    if not first:
+        # bytes=-N: N byte terakhir
+        length = int(last)
+        if length == 0:
+            return False
+        return max(size - length, 0), size - 1
+    start = int(first)
+    end = min(int(last), size - 1) if last else size - 1
+    if start >= size or start > end:
+        return False
+    return start, end
+
+
+def _iter_range(path, start, length):
+    with open(path, 'rb') as source:
+        source.seek(start)
+        while length > 0:
+            chunk = source.read(min(DOWNLOAD_CHUNK_SIZE, length))
+            if not chunk:
+                break
+            length -= len(chunk)
+            yield chunk
+
+
+def _if_range_matches(request, etag, last_modified):
+    """If-Range kosong atau masih cocok dengan versi file ini"""
+    if_range = request.headers.get('If-Range')
+    if not if_range:
+        return True
+    if if_range.startswith(('"', 'W/')):
+        return if_range == etag
+    return parse_http_date_safe(if_range) == int(last_modified)
+
+
+def _sendfile_response(path):
+    """Respons kosong yang diteruskan ke web server (X-Sendfile / X-Accel-Redirect)"""
+    response = HttpResponse()
+    if settings.CV_DOWNLOAD_SENDFILE == 'x-accel-redirect':
+        # Lokasi internal nginx yang menunjuk ke MEDIA_ROOT
+        relative = os.path.relpath(path, settings.MEDIA_ROOT).replace(os.sep, '/')
+        response['X-Accel-Redirect'] = settings.CV_DOWNLOAD_ACCEL_PREFIX.rstrip('/') + '/' + relative
+    else:
+        response['X-Sendfile'] = path
+    return response
+
+
+def serve_file(request, path, filename, content_type, etag_value):
+    """
+    Streaming file dari disk tanpa memuat seluruh isi ke memori.
+    Mendukung conditional GET (ETag/Last-Modified -> 304), Range satu rentang (206/416)
+    dan X-Sendfile/X-Accel-Redirect jika CV_DOWNLOAD_SENDFILE diisi.
+    Args:
+        request (HttpRequest): request GET/HEAD
+        path (str): path absolut file
+        filename (str): nama file untuk Content-Disposition
+        content_type (str): MIME type
+        etag_value (str): nilai ETag tanpa tanda kutip (misal sha256 isi file),
+            None untuk ETag dari ukuran dan waktu modifikasi file
+    Returns:
+        HttpResponse
+    """
+    stat = os.stat(path)
+    etag = quote_etag(etag_value or f'{stat.st_size:x}-{int(stat.st_mtime):x}')
+    last_modified = stat.st_mtime
+
+    not_modified = get_conditional_response(request, etag=etag, last_modified=int(last_modified))
+    if not_modified is not None:
+        response = not_modified
+    elif settings.CV_DOWNLOAD_SENDFILE:
+        # Web server yang menangani Range dan pengiriman file
+        response = _sendfile_response(path)
+        # Content-Type default HttpResponse (text/html) akan ikut diteruskan web server
+        response['Content-Type'] = content_type
+    else:
+        byte_range = None
+        if _if_range_matches(request, etag, last_modified):
+            byte_range = parse_range(request.headers.get('Range'), stat.st_size)
+
+        if byte_range is False:
+            response = HttpResponse(status=416)
+            response['Content-Range'] = f'bytes */{stat.st_size}'
+        elif byte_range is not None:
+            start, end = byte_range
+            length = end - start + 1
+            response = StreamingHttpResponse(
+                _iter_range(path, start, length) if request.method != 'HEAD' else [],
+                status=206, content_type=content_type
+            )
+            response['Content-Range'] = f'bytes {start}-{end}/{stat.st_size}'
+            response['Content-Length'] = str(length)
+        else:
+            response = FileResponse(open(path, 'rb'), content_type=content_type)
+            response.block_size = DOWNLOAD_CHUNK_SIZE
+
+    response['ETag'] = etag
+    response['Last-Modified'] = http_date(last_modified)
+    response['Accept-Ranges'] = 'bytes'
+    if response.status_code in (200, 206):
+        response['Content-Disposition'] = content_disposition_header(False, filename)
+    # Data pribadi pendaftar: tidak boleh disimpan cache bersama, browser selalu revalidasi
+    patch_cache_control(response, private=True, no_cache=True)
+    return response
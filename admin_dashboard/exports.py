@@ -0,0 +1,90 @@
+import csv
+import tempfile
+from datetime import date, datetime
+from decimal import Decimal
+from django.http import FileResponse, StreamingHttpResponse
+from django.utils import timezone
+from django.utils.http import content_disposition_header
+
+try:
+    import openpyxl
+except ImportError:  # XLSX opsional, CSV selalu tersedia
+    openpyxl = None
+
+# Jumlah baris CSV yang digabung per chunk respons
+CSV_BATCH_SIZE = 500
+# Awalan yang dieksekusi sebagai formula oleh Excel/LibreOffice (CSV injection)
+FORMULA_PREFIXES = ('=', '+', '-', '@', '\t', '\r')
+
+
+class _Echo:
+    """Pseudo-buffer untuk csv.writer: writerow() langsung mengembalikan baris yang ditulis"""
+
+    def write(self, value):
+        return value
+
+
+def _cell(value, for_excel=False):
+    if value is None:
+        return ''
+    if isinstance(value, datetime):
+        # Excel tidak mendukung datetime dengan timezone, pakai waktu lokal
+        value = timezone.localtime(value).replace(tzinfo=None) if timezone.is_aware(value) else value
+        return value if for_excel else value.strftime('%Y-%m-%d %H:%M:%S')
+    if isinstance(value, date):
+        return value if for_excel else value.isoformat()
+    if isinstance(value, Decimal):
+        return float(value) if for_excel else str(value)
+    if isinstance(value, str) and value.startswith(FORMULA_PREFIXES):
+        return "'" + value
+    return value
+
+
+def _stream_csv(header, rows):
+    writer = csv.writer(_Echo())
+    # BOM agar Excel membaca UTF-8 dengan benar
+    yield '﻿' + writer.writerow(header)
+    batch = []
+    for row in rows:
+        batch.append(writer.writerow([_cell(value) for value in row]))
+        if len(batch) >= CSV_BATCH_SIZE:
+            yield ''.join(batch)
+            batch = []
+    if batch:
+        yield ''.join(batch)
+
+
+def csv_response(filename, header, rows):
+    """StreamingHttpResponse CSV; rows dibaca sambil respons dikirim"""
+    response = StreamingHttpResponse(_stream_csv(header, rows), content_type='text/csv; charset=utf-8')
+    response['Content-Disposition'] = content_disposition_header(True, filename)
+    return response
+
+
+def xlsx_response(filename, header, rows, sheet_title='Data', max_rows=None):
+    """
+    Respons XLSX dari openpyxl mode write-only (baris ditulis langsung ke file sementara,
+    bukan disimpan di memori), lalu file dikirim dengan FileResponse. Berbeda dengan CSV,
+    seluruh workbook selesai ditulis sebelum byte pertama dikirim, karena itu dibatasi max_rows.
+    Raises:
+        ValueError: openpyxl tidak terpasang atau baris lebih dari max_rows
+    """
+    if openpyxl is None:
+        raise ValueError('Export XLSX membutuhkan paket openpyxl (pip install openpyxl), gunakan format csv')
+    workbook = openpyxl.Workbook(write_only=True)
+    sheet = workbook.create_sheet(sheet_title)
+    sheet.append(header)
+    for count, row in enumerate(rows):
+        if max_rows is not None and count >= max_rows:
+            raise ValueError(f'Export XLSX dibatasi {max_rows} baris, gunakan format csv untuk data sebesar ini')
+        sheet.append([_cell(value, for_excel=True) for value in row])
+
+    output = tempfile.TemporaryFile()
+    workbook.save(output)
+    output.seek(0)
+    return FileResponse(
+        output,
+        as_attachment=True,
+        filename=filename,
+        content_type='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
+    )
@@ -0,0 +1,94 @@
+import json
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from admin_dashboard.benchmark import PERCENTILES, EndpointBenchmark, compare_with_baseline
+
+
+class Command(BaseCommand):
+    help = 'Load test in-process endpoint HTTP: latency p50/p95/p99, throughput dan jumlah query per endpoint'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=50, help='Jumlah request per endpoint')
+        parser.add_argument('--concurrency', type=int, default=4, help='Jumlah request bersamaan (thread)')
+        parser.add_argument('--warmup', type=int, default=2, help='Request pemanasan per endpoint (tidak diukur)')
+        parser.add_argument('--only', help='Hanya endpoint yang namanya mengandung teks ini')
+        parser.add_argument('--writes', action='store_true',
+                            help='Jalankan juga skenario POST/PUT (versi feed lowongan ikut naik)')
+        parser.add_argument('--username', help='User staff untuk endpoint dashboard (default user sementara)')
+        parser.add_argument('--save', help='Simpan hasil ke file JSON (dipakai sebagai --baseline berikutnya)')
+        parser.add_argument('--baseline', help='File JSON hasil sebelumnya untuk deteksi regresi')
+        parser.add_argument('--max-regression', type=float, default=0.2,
+                            help='Batas kenaikan p95 terhadap baseline (0.2 = 20%%)')
+        parser.add_argument('--max-p95', type=float, help='Batas absolut p95 (ms) untuk semua endpoint')
+        parser.add_argument('--close-connections', action='store_true',
+                            help='Tutup/pakai ulang koneksi database per request seperti server WSGI '
+                                 '(mengukur efek CONN_MAX_AGE dan pool)')
+
+    def handle(self, *args, **options):
+        benchmark = EndpointBenchmark(username=options['username'], writes=options['writes'],
+                                      close_connections=options['close_connections'])
+        try:
+            benchmark.setup()
+        except Exception as e:
+            raise CommandError(str(e))
+
+        results = []
+        try:
+            scenarios = benchmark.scenarios()
+            for route, reason in benchmark.uncovered_routes(scenarios):
+                self.stdout.write(self.style.WARNING(f'- {route} dilewati: {reason}'))
+            if options['only']:
+                scenarios = [scenario for scenario in scenarios if options['only'] in scenario['name']]
+
+            serial_writes = connection.vendor == 'sqlite' and options['concurrency'] > 1
+            if serial_writes:
+                # SQLite hanya mengizinkan satu penulis, request tulis bersamaan gagal "database is locked"
+                self.stdout.write(self.style.WARNING('SQLite: skenario POST/PUT dijalankan tanpa konkurensi'))
+
+            header = f"{'Endpoint':<24}{'Req':>6}{'Err':>5}" + ''.join(f'{f"p{pct} ms":>10}' for pct in PERCENTILES)
+            self.stdout.write(header + f"{'req/s':>9}{'Query':>7}")
+            for scenario in scenarios:
+                row = benchmark.run_scenario(
+                    scenario,
+                    requests=max(options['requests'], 1),
+                    concurrency=1 if serial_writes and scenario.get('method', 'get') != 'get' else max(options['concurrency'], 1),
+                    warmup=max(options['warmup'], 0)
+                )
+                results.append(row)
+                self.stdout.write(
+                    f"{row['name']:<24}{row['requests']:>6}{row['errors']:>5}"
+                    + ''.join(f"{row[f'p{pct}']:>10.1f}" for pct in PERCENTILES)
+                    + f"{row['throughput']:>9.1f}{row['queries']:>7.1f}"
+                )
+        finally:
+            removed = benchmark.cleanup()
+            if removed:
+                self.stdout.write(f'{removed} pendaftar benchmark dihapus')
+
+        if options['save']:
+            with open(options['save'], 'w', encoding='utf-8') as output:
+                json.dump({'options': {key: options[key] for key in ('requests', 'concurrency', 'close_connections')},
+                           'results': results}, output, indent=2)
+
+        failures = [
+            f"{row['name']}: {row['errors']} request gagal (status {row['error_statuses']})"
+            for row in results if row['errors']
+        ]
+        if options['max_p95'] is not None:
+            failures += [
+                f"{row['name']}: p95 {row['p95']:.1f} ms > {options['max_p95']:.1f} ms"
+                for row in results if row['p95'] > options['max_p95']
+            ]
+        if options['baseline']:
+            try:
+                with open(options['baseline'], encoding='utf-8') as source:
+                    baseline = json.load(source)
+            except (OSError, ValueError) as e:
+                raise CommandError(f'Baseline tidak bisa dibaca: {e}')
+            failures += compare_with_baseline(results, baseline, options['max_regression'])
+
+        if failures:
+            for failure in failures:
+                self.stdout.write(self.style.ERROR(f'✗ {failure}'))
+            raise CommandError(f'{len(failures)} pemeriksaan performa gagal')
+        self.stdout.write(self.style.SUCCESS(f'✓ {len(results)} endpoint diukur tanpa regresi'))
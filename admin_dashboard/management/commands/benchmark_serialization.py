@@ -0,0 +1,126 @@
+import time
+import tracemalloc
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+from admin_dashboard.service import DashboardService
+from magang.models import Lowongan, TransaksiPendaftaran
+from magang.services.lowongan_service import LOWONGAN_API_PROJECTION, LowonganService
+
+
+# Implementasi lama berbasis instance model, hanya dipakai sebagai pembanding
+def _model_lowongan_api():
+    return [
+        {
+            'id_lowongan': lowongan.id_lowongan,
+            'posisi': lowongan.posisi,
+            'nama_dept': lowongan.departement.nama_dept,
+            'deskripsi': lowongan.deskripsi,
+            'tanggal_mulai': lowongan.tanggal_mulai.strftime('%Y-%m-%d'),
+            'tanggal_selesai': lowongan.tanggal_selesai.strftime('%Y-%m-%d'),
+        }
+        for lowongan in LowonganService.get_all_lowongan()
+    ]
+
+
+def _model_all_lowongan():
+    today = timezone.now().date()
+    return [
+        {
+            'id': lowongan.id_lowongan,
+            'posisi': lowongan.posisi,
+            'deskripsi': lowongan.deskripsi,
+            'departemen': lowongan.departement.nama_dept,
+            'departemen_id': lowongan.departement.id_dept,
+            'tanggal_mulai': lowongan.tanggal_mulai.strftime('%Y-%m-%d'),
+            'tanggal_selesai': lowongan.tanggal_selesai.strftime('%Y-%m-%d'),
+            'periode': f"{lowongan.tanggal_mulai.strftime('%d %b %y')} - {lowongan.tanggal_selesai.strftime('%d %b %y')}",
+            'status': 'Aktif' if lowongan.tanggal_selesai >= today else 'Selesai',
+            'status_class': 'active' if lowongan.tanggal_selesai >= today else 'completed'
+        }
+        for lowongan in Lowongan.objects.select_related('departement').order_by('-tanggal_mulai')
+    ]
+
+
+def _model_recent_applicants(limit):
+    recent = TransaksiPendaftaran.objects.select_related(
+        'pendaftar', 'lowongan', 'lowongan__departement'
+    ).order_by('-created_at')[:limit]
+    return [
+        {
+            'id_transaksi': transaksi.id_transaksi_pendaftaran,
+            'name': transaksi.pendaftar.name,
+            'initials': ''.join([part[0].upper() for part in transaksi.pendaftar.name.split()[:2]]),
+            'position': transaksi.lowongan.posisi,
+            'university': transaksi.pendaftar.university,
+            'date': transaksi.created_at.strftime('%d %b %Y'),
+            'status': transaksi.status,
+            'nik': transaksi.pendaftar.nik
+        }
+        for transaksi in recent
+    ]
+
+
+def _model_pending_applicants():
+    transaksi_list = TransaksiPendaftaran.objects.select_related(
+        'pendaftar', 'lowongan', 'lowongan__departement'
+    ).filter(status='pending').order_by('-created_at')
+    return [
+        {
+            'id_transaksi': transaksi.id_transaksi_pendaftaran,
+            'nama': transaksi.pendaftar.name,
+            'nik': transaksi.pendaftar.nik,
+            'posisi': transaksi.lowongan.posisi,
+            'departemen': transaksi.lowongan.departement.nama_dept,
+            'universitas': transaksi.pendaftar.university,
+            'jurusan': transaksi.pendaftar.major,
+            'ipk': transaksi.pendaftar.ipk,
+            'tanggal_daftar': transaksi.created_at.strftime('%d %b %Y')
+        }
+        for transaksi in transaksi_list
+    ]
+
+
+class Command(BaseCommand):
+    help = 'Membandingkan latency dan memori serialisasi values() dengan serialisasi instance model'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--repeat', type=int, default=5, help='Jumlah pengulangan per skenario')
+        parser.add_argument('--limit', type=int, default=100, help='Limit untuk pendaftar terbaru')
+
+    def measure(self, func, repeat):
+        """Mengembalikan (median detik, peak memori byte, jumlah baris)"""
+        durations = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            func()
+            durations.append(time.perf_counter() - start)
+
+        # Memori diukur terpisah karena tracemalloc memperlambat eksekusi
+        tracemalloc.start()
+        rows = len(func())
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        durations.sort()
+        return durations[len(durations) // 2], peak, rows
+
+    def handle(self, *args, **options):
+        repeat = max(options['repeat'], 1)
+        limit = options['limit']
+        scenarios = [
+            ('get_lowongan_api', _model_lowongan_api,
+             lambda: list(LOWONGAN_API_PROJECTION.iterate(LowonganService.get_all_lowongan()))),
+            ('get_all_lowongan', _model_all_lowongan, DashboardService.get_all_lowongan),
+            ('get_recent_applicants', lambda: _model_recent_applicants(limit),
+             lambda: DashboardService.get_recent_applicants(limit)),
+            ('get_pending_applicants', _model_pending_applicants, DashboardService.get_pending_applicants),
+        ]
+
+        self.stdout.write(f"{'Skenario':<24}{'Baris':>8}{'Model ms':>11}{'values ms':>11}{'Model KiB':>12}{'values KiB':>12}")
+        for name, model_func, projection_func in scenarios:
+            model_time, model_peak, rows = self.measure(model_func, repeat)
+            projection_time, projection_peak, _ = self.measure(projection_func, repeat)
+            self.stdout.write(
+                f'{name:<24}{rows:>8}{model_time * 1000:>11.1f}{projection_time * 1000:>11.1f}'
+                f'{model_peak / 1024:>12.0f}{projection_peak / 1024:>12.0f}'
+            )
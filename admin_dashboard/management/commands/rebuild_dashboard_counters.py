@@ -0,0 +1,12 @@
+from django.core.management.base import BaseCommand
+from admin_dashboard.cache import DashboardCache
+from admin_dashboard.counter_service import DashboardCounterService
+
+
+class Command(BaseCommand):
+    help = 'Membangun ulang rollup counter dashboard dari tabel pendaftar dan transaksi'
+
+    def handle(self, *args, **options):
+        total = DashboardCounterService.rebuild()
+        DashboardCache.invalidate()
+        self.stdout.write(self.style.SUCCESS(f'✓ {total} counter dashboard berhasil dibangun ulang'))
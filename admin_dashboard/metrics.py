@@ -0,0 +1,190 @@
+import functools
+import json
+import os
+import threading
+import time
+import uuid
+from django.conf import settings
+
+# Batas atas bucket histogram latensi (detik), +Inf ditambahkan otomatis
+SERVICE_LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+METRIC_PREFIX = 'maganghub_service'
+PROMETHEUS_CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+
+class ServiceMetrics:
+    """
+    Registry metrik method service di memori proses: jumlah panggilan, histogram latensi
+    dan jumlah error per jenis exception atau kode error hasil gagal. Jika SERVICE_METRICS_DIR diisi, setiap worker
+    (gunicorn) menulis snapshot-nya ke direktori tersebut dan endpoint metrik menjumlahkan
+    semua snapshot, sehingga hasilnya sama dari worker manapun yang menjawab.
+    """
+
+    _lock = threading.Lock()
+    _methods = {}
+    _pid = None
+    _snapshot_name = None
+    _last_flush = 0.0
+
+    @staticmethod
+    def _reset_after_fork():
+        """Data yang terbawa dari proses induk (fork) tidak boleh ikut dihitung ulang oleh anaknya"""
+        if ServiceMetrics._pid != os.getpid():
+            ServiceMetrics._pid = os.getpid()
+            ServiceMetrics._snapshot_name = f'{os.getpid()}-{uuid.uuid4().hex[:8]}.json'
+            ServiceMetrics._methods = {}
+            ServiceMetrics._last_flush = time.monotonic()
+
+    @staticmethod
+    def observe(service, method, duration, error=None):
+        """Mencatat satu panggilan method, error diisi nama class exception atau kode error jika gagal"""
+        with ServiceMetrics._lock:
+            ServiceMetrics._reset_after_fork()
+            entry = ServiceMetrics._methods.get((service, method))
+            if entry is None:
+                entry = ServiceMetrics._methods[(service, method)] = {
+                    'count': 0,
+                    'sum': 0.0,
+                    'buckets': [0] * (len(SERVICE_LATENCY_BUCKETS) + 1),
+                    'errors': {},
+                }
+            entry['count'] += 1
+            entry['sum'] += duration
+            index = 0
+            while index < len(SERVICE_LATENCY_BUCKETS) and duration > SERVICE_LATENCY_BUCKETS[index]:
+                index += 1
+            entry['buckets'][index] += 1
+            if error:
+                entry['errors'][error] = entry['errors'].get(error, 0) + 1
+
+            flush = (settings.SERVICE_METRICS_DIR and
+                     time.monotonic() - ServiceMetrics._last_flush >= settings.SERVICE_METRICS_FLUSH_INTERVAL)
+        if flush:
+            ServiceMetrics.flush()
+
+    @staticmethod
+    def snapshot():
+        """Salinan data proses ini: list dict service, method, count, sum, buckets, errors"""
+        with ServiceMetrics._lock:
+            ServiceMetrics._reset_after_fork()
+            return [
+                {'service': service, 'method': method, 'count': entry['count'], 'sum': entry['sum'],
+                 'buckets': list(entry['buckets']), 'errors': dict(entry['errors'])}
+                for (service, method), entry in ServiceMetrics._methods.items()
+            ]
+
+    @staticmethod
+    def flush():
+        """Menulis snapshot proses ini ke SERVICE_METRICS_DIR (atomik lewat rename)"""
+        directory = settings.SERVICE_METRICS_DIR
+        if not directory:
+            return
+        data = ServiceMetrics.snapshot()
+        with ServiceMetrics._lock:
+            ServiceMetrics._last_flush = time.monotonic()
+            name = ServiceMetrics._snapshot_name
+        os.makedirs(directory, exist_ok=True)
+        path = os.path.join(directory, name)
+        with open(f'{path}.tmp', 'w') as f:
+            json.dump(data, f)
+        os.replace(f'{path}.tmp', path)
+
+    @staticmethod
+    def collect():
+        """
+        Data seluruh worker. Tanpa SERVICE_METRICS_DIR hanya data proses ini.
+        Snapshot worker yang sudah berhenti tetap dijumlahkan agar counter tidak turun;
+        kosongkan direktori saat deploy/restart seperti prometheus_client multiprocess.
+        """
+        directory = settings.SERVICE_METRICS_DIR
+        if not directory:
+            return ServiceMetrics.snapshot()
+
+        ServiceMetrics.flush()
+        merged = {}
+        for name in sorted(os.listdir(directory)):
+            if not name.endswith('.json'):
+                continue
+            try:
+                with open(os.path.join(directory, name)) as f:
+                    rows = json.load(f)
+            except (OSError, ValueError):
+                # File worker lain bisa hilang di tengah proses listing
+                continue
+            for row in rows:
+                entry = merged.get((row['service'], row['method']))
+                if entry is None:
+                    merged[(row['service'], row['method'])] = row
+                    continue
+                entry['count'] += row['count']
+                entry['sum'] += row['sum']
+                entry['buckets'] = [a + b for a, b in zip(entry['buckets'], row['buckets'])]
+                for error, count in row['errors'].items():
+                    entry['errors'][error] = entry['errors'].get(error, 0) + count
+        return list(merged.values())
+
+    @staticmethod
+    def render():
+        """Metrik dalam format teks Prometheus (exposition format 0.0.4)"""
+        rows = sorted(ServiceMetrics.collect(), key=lambda row: (row['service'], row['method']))
+        calls = [f'# HELP {METRIC_PREFIX}_calls_total Jumlah pemanggilan method service',
+                 f'# TYPE {METRIC_PREFIX}_calls_total counter']
+        errors = [f'# HELP {METRIC_PREFIX}_errors_total Jumlah pemanggilan yang gagal (exception atau hasil success False)',
+                  f'# TYPE {METRIC_PREFIX}_errors_total counter']
+        latency = [f'# HELP {METRIC_PREFIX}_duration_seconds Latensi method service',
+                   f'# TYPE {METRIC_PREFIX}_duration_seconds histogram']
+
+        for row in rows:
+            labels = f'service="{row["service"]}",method="{row["method"]}"'
+            calls.append(f'{METRIC_PREFIX}_calls_total{{{labels}}} {row["count"]}')
+            for error, count in sorted(row['errors'].items()):
+                errors.append(f'{METRIC_PREFIX}_errors_total{{{labels},exception="{error}"}} {count}')
+            cumulative = 0
+            for bound, count in zip(SERVICE_LATENCY_BUCKETS + ('+Inf',), row['buckets']):
+                cumulative += count
+                latency.append(f'{METRIC_PREFIX}_duration_seconds_bucket{{{labels},le="{bound}"}} {cumulative}')
+            latency.append(f'{METRIC_PREFIX}_duration_seconds_sum{{{labels}}} {row["sum"]:.6f}')
+            latency.append(f'{METRIC_PREFIX}_duration_seconds_count{{{labels}}} {row["count"]}')
+
+        return '\n'.join(calls + errors + latency) + '\n'
+
+    @staticmethod
+    def reset():
+        with ServiceMetrics._lock:
+            ServiceMetrics._methods = {}
+
+
+def instrument_service(cls):
+    """
+    Decorator class service: setiap staticmethod publik (tanpa awalan _) dicatat di
+    ServiceMetrics. Hasil dict {'success': False} dihitung sebagai error dengan label
+    nilai 'error' di hasil tersebut (atau 'failed' jika tidak ada). Method yang mengembalikan queryset/iterator hanya diukur sampai
+    objek tersebut dibuat, bukan saat datanya dibaca.
+    """
+    service = cls.__name__
+    for name, attr in list(vars(cls).items()):
+        if name.startswith('_') or not isinstance(attr, staticmethod):
+            continue
+        setattr(cls, name, staticmethod(_instrumented(service, name, attr.__func__)))
+    return cls
+
+
+def _instrumented(service, method, func):
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        if not settings.SERVICE_METRICS_ENABLED:
+            return func(*args, **kwargs)
+        start = time.perf_counter()
+        try:
+            result = func(*args, **kwargs)
+        except Exception as e:
+            ServiceMetrics.observe(service, method, time.perf_counter() - start, type(e).__name__)
+            raise
+        error = None
+        # Service menangkap exception sendiri dan mengembalikan {'success': False, ...}
+        if isinstance(result, dict) and result.get('success') is False:
+            error = result.get('error') or 'failed'
+        ServiceMetrics.observe(service, method, time.perf_counter() - start, error)
+        return result
+    return wrapper
@@ -0,0 +1,217 @@
+import logging
+import threading
+import time
+from collections import Counter, deque
+from contextlib import ExitStack
+from django.conf import settings
+from django.db import connections
+from .profiling import PROFILE_QUERY_PARAM, ProfileStore
+
+logger = logging.getLogger(__name__)
+
+# Panjang SQL contoh yang disimpan di ringkasan
+SQL_SAMPLE_LENGTH = 300
+
+
+class QueryTracker:
+    """
+    Hook connection.execute_wrapper: mencatat jumlah query, total waktu DB,
+    query identik yang diulang (SQL + parameter sama) dan SQL yang sama dengan
+    parameter berbeda yang dijalankan berkali-kali (pola N+1).
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+        self.templates = Counter()
+        self.exact = Counter()
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.duration += time.perf_counter() - start
+            self.count += 1
+            self.templates[sql] += 1
+            if not many:
+                try:
+                    self.exact[(sql, tuple(params or ()))] += 1
+                except TypeError:
+                    # Parameter yang tidak hashable (misal list untuk ARRAY) tidak dicek duplikatnya
+                    pass
+
+    @property
+    def duplicates(self):
+        """Jumlah query yang seharusnya tidak perlu dijalankan ulang (SQL dan parameter identik)"""
+        return sum(count - 1 for count in self.exact.values() if count > 1)
+
+    def repeated(self, threshold):
+        """(sql, jumlah) untuk SQL yang dijalankan minimal threshold kali, terbanyak dulu"""
+        return [(sql, count) for sql, count in self.templates.most_common() if count >= threshold]
+
+
+class RequestMetrics:
+    """
+    Ringkasan bergulir metrik request per endpoint (method + route URL) di memori proses ini.
+    Setiap endpoint menyimpan REQUEST_METRICS_WINDOW sampel terakhir.
+    """
+
+    _lock = threading.Lock()
+    _endpoints = {}
+
+    @staticmethod
+    def record(endpoint, wall, tracker, threshold):
+        repeated = tracker.repeated(threshold)
+        with RequestMetrics._lock:
+            entry = RequestMetrics._endpoints.get(endpoint)
+            if entry is None:
+                entry = RequestMetrics._endpoints[endpoint] = {
+                    'requests': 0,
+                    'samples': deque(maxlen=settings.REQUEST_METRICS_WINDOW),
+                    'n_plus_one': None,
+                }
+            entry['requests'] += 1
+            entry['samples'].append((wall, tracker.duration, tracker.count, tracker.duplicates, bool(repeated)))
+            if repeated and (entry['n_plus_one'] is None or repeated[0][1] >= entry['n_plus_one']['count']):
+                entry['n_plus_one'] = {'sql': repeated[0][0][:SQL_SAMPLE_LENGTH], 'count': repeated[0][1]}
+
+    @staticmethod
+    def get_summary():
+        """
+        Returns:
+            list: per endpoint, diurutkan dari total waktu terbesar: endpoint, requests, window,
+                  wall_p50_ms, wall_p95_ms, wall_max_ms, db_avg_ms, queries_avg, queries_max,
+                  duplicate_queries, n_plus_one_requests, n_plus_one (contoh SQL terbanyak)
+        """
+        with RequestMetrics._lock:
+            entries = [(endpoint, dict(entry, samples=list(entry['samples'])))
+                       for endpoint, entry in RequestMetrics._endpoints.items()]
+
+        summary = []
+        for endpoint, entry in entries:
+            samples = entry['samples']
+            walls = sorted(sample[0] for sample in samples)
+            size = len(samples)
+            summary.append({
+                'endpoint': endpoint,
+                'requests': entry['requests'],
+                'window': size,
+                'wall_p50_ms': round(walls[(size - 1) // 2] * 1000, 2),
+                'wall_p95_ms': round(walls[min(int(size * 0.95), size - 1)] * 1000, 2),
+                'wall_max_ms': round(walls[-1] * 1000, 2),
+                'db_avg_ms': round(sum(sample[1] for sample in samples) / size * 1000, 2),
+                'queries_avg': round(sum(sample[2] for sample in samples) / size, 1),
+                'queries_max': max(sample[2] for sample in samples),
+                'duplicate_queries': sum(sample[3] for sample in samples),
+                'n_plus_one_requests': sum(1 for sample in samples if sample[4]),
+                'n_plus_one': entry['n_plus_one'],
+                '_total': sum(walls),
+            })
+        summary.sort(key=lambda row: row.pop('_total'), reverse=True)
+        return summary
+
+    @staticmethod
+    def reset():
+        with RequestMetrics._lock:
+            RequestMetrics._endpoints.clear()
+
+
+class QueryTimingMiddleware:
+    """
+    Mengukur setiap request: waktu total, jumlah query, waktu DB dan query duplikat/N+1.
+    Hasil dikirim lewat header Server-Timing (terlihat di tab Network DevTools) dan
+    dikumpulkan di RequestMetrics (/dashboard/api/request-metrics/).
+    Query yang dijalankan saat isi StreamingHttpResponse dikirim tidak ikut terhitung.
+    Dipasang paling atas di MIDDLEWARE agar waktu middleware lain ikut terukur.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if not settings.REQUEST_METRICS_ENABLED:
+            return self.get_response(request)
+
+        tracker = QueryTracker()
+        start = time.perf_counter()
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(tracker))
+            response = self.get_response(request)
+        wall = time.perf_counter() - start
+
+        match = getattr(request, 'resolver_match', None)
+        endpoint = f"{request.method} /{match.route if match else '<unmatched>'}"
+        threshold = settings.REQUEST_METRICS_N_PLUS_ONE_THRESHOLD
+        RequestMetrics.record(endpoint, wall, tracker, threshold)
+
+        repeated = tracker.repeated(threshold)
+        if repeated:
+            sql, count = repeated[0]
+            logger.warning('Kemungkinan N+1 di %s: query yang sama dijalankan %d kali: %s',
+                           endpoint, count, sql[:SQL_SAMPLE_LENGTH])
+
+        if self._show_server_timing(request):
+            response['Server-Timing'] = (
+                f'db;dur={tracker.duration * 1000:.2f};desc="{tracker.count} queries, {tracker.duplicates} duplicate", '
+                f'app;dur={(wall - tracker.duration) * 1000:.2f}, '
+                f'total;dur={wall * 1000:.2f}'
+            )
+        return response
+
+    @staticmethod
+    def _show_server_timing(request):
+        mode = settings.REQUEST_METRICS_SERVER_TIMING
+        if mode == 'all' or (mode == 'staff' and settings.DEBUG):
+            return True
+        if mode != 'staff':
+            return False
+        # Server-Timing membuka detail internal, di produksi hanya untuk staff
+        user = getattr(request, 'user', None)
+        return bool(user is not None and user.is_authenticated and (user.is_staff or user.is_superuser))
+
+
+class ProfilingMiddleware:
+    """
+    Menjalankan request di bawah profiler (PROFILING_MODE) jika PROFILING_ENABLED aktif,
+    atau jika staff menambahkan ?_profile=<token> (token dari /dashboard/profiling/).
+    Profil request yang lebih lambat dari PROFILING_THRESHOLD_MS disimpan ke PROFILING_DIR;
+    request dengan token selalu disimpan. Dipasang setelah AuthenticationMiddleware.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        requested = self._requested(request)
+        if not requested and not settings.PROFILING_ENABLED:
+            return self.get_response(request)
+
+        profiler = ProfileStore.create_profiler()
+        try:
+            profiler.start()
+        except ValueError:
+            # Python 3.12+: cProfile lain sedang aktif di thread lain (sys.monitoring global)
+            logger.warning('Profiler sedang dipakai request lain, %s tidak diprofil', request.path)
+            return self.get_response(request)
+
+        start = time.perf_counter()
+        try:
+            response = self.get_response(request)
+        finally:
+            profiler.stop()
+        duration = time.perf_counter() - start
+
+        if requested or duration * 1000 >= settings.PROFILING_THRESHOLD_MS:
+            name = ProfileStore.save(request, duration, profiler)
+            response['X-Profile'] = name
+        return response
+
+    @staticmethod
+    def _requested(request):
+        token = request.GET.get(PROFILE_QUERY_PARAM)
+        if not token:
+            return False
+        user = request.user
+        return user.is_authenticated and (user.is_staff or user.is_superuser) and ProfileStore.check_token(token, user)
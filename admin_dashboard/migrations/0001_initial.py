@@ -0,0 +1,30 @@
+# Generated by Django 5.2.18 on 2026-10-18 08:39
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DashboardCounter',
+            fields=[
+                ('id_counter', models.AutoField(primary_key=True, serialize=False)),
+                ('scope', models.CharField(choices=[('total', 'Total'), ('status', 'Status'), ('departemen', 'Departemen'), ('harian', 'Harian')], max_length=20)),
+                ('key', models.CharField(max_length=50)),
+                ('value', models.BigIntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'Dashboard Counter',
+                'verbose_name_plural': 'Dashboard Counters',
+                'db_table': 'r_dashboard_counter',
+                'constraints': [models.UniqueConstraint(fields=('scope', 'key'), name='uniq_dashboard_counter_scope_key')],
+            },
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-18 08:52
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('admin_dashboard', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='dashboardcounter',
+            name='scope',
+            field=models.CharField(choices=[('total', 'Total'), ('status', 'Status'), ('departemen', 'Departemen'), ('harian', 'Harian'), ('versi', 'Versi')], max_length=20),
+        ),
+    ]
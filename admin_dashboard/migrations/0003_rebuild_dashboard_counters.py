@@ -0,0 +1,49 @@
+from collections import Counter
+from django.db import migrations
+from django.db.models import Count
+from django.db.models.functions import TruncDate
+
+
+def rebuild_counters(apps, schema_editor):
+    """
+    Mengisi counter dashboard dari data yang sudah ada (sama dengan rebuild_dashboard_counters),
+    agar dashboard deployment lama tidak menampilkan nol setelah migrasi.
+    Memakai model historis supaya tetap berjalan walau model berubah di migrasi berikutnya.
+    """
+    DashboardCounter = apps.get_model('admin_dashboard', 'DashboardCounter')
+    Pendaftar = apps.get_model('magang', 'Pendaftar')
+    TransaksiPendaftaran = apps.get_model('magang', 'TransaksiPendaftaran')
+
+    deltas = Counter({('total', 'pendaftar'): 0, ('total', 'transaksi'): 0})
+    per_hari = Pendaftar.objects.annotate(
+        tanggal=TruncDate('created_at')
+    ).values('tanggal').annotate(count=Count('pk')).order_by()
+    for item in per_hari:
+        deltas[('total', 'pendaftar')] += item['count']
+        deltas[('harian', item['tanggal'].isoformat())] += item['count']
+
+    per_group = TransaksiPendaftaran.objects.values(
+        'status', 'lowongan__departement_id'
+    ).annotate(count=Count('pk')).order_by()
+    for item in per_group:
+        deltas[('total', 'transaksi')] += item['count']
+        deltas[('status', item['status'])] += item['count']
+        deltas[('departemen', str(item['lowongan__departement_id']))] += item['count']
+
+    DashboardCounter.objects.exclude(scope='versi').delete()
+    DashboardCounter.objects.bulk_create([
+        DashboardCounter(scope=scope, key=key, value=value)
+        for (scope, key), value in deltas.items()
+    ])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('admin_dashboard', '0002_counter_scope_versi'),
+        ('magang', '0005_transaksi_unique_pendaftar_lowongan'),
+    ]
+
+    operations = [
+        migrations.RunPython(rebuild_counters, migrations.RunPython.noop),
+    ]
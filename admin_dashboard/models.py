@@ -1,3 +1,39 @@
 from django.db import models
 
 # Create your models here.
+class DashboardCounter(models.Model):
+    """
+    Rollup counter untuk dashboard admin, diperbarui setiap ada perubahan
+    pendaftar/transaksi sehingga dashboard tidak perlu menghitung ulang
+    dari tabel sumber.
+    """
+    SCOPE_TOTAL = 'total'            # key: 'pendaftar' / 'transaksi'
+    SCOPE_STATUS = 'status'          # key: status transaksi
+    SCOPE_DEPARTEMEN = 'departemen'  # key: id_dept, jumlah transaksi per departemen
+    SCOPE_HARIAN = 'harian'          # key: tanggal ISO, jumlah pendaftar masuk per hari
+    SCOPE_VERSI = 'versi'            # key: nama data, naik setiap data sumber berubah (ETag)
+
+    SCOPE_CHOICES = [
+        (SCOPE_TOTAL, 'Total'),
+        (SCOPE_STATUS, 'Status'),
+        (SCOPE_DEPARTEMEN, 'Departemen'),
+        (SCOPE_HARIAN, 'Harian'),
+        (SCOPE_VERSI, 'Versi'),
+    ]
+
+    id_counter = models.AutoField(primary_key=True)
+    scope = models.CharField(max_length=20, choices=SCOPE_CHOICES)
+    key = models.CharField(max_length=50)
+    value = models.BigIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = 'r_dashboard_counter'
+        verbose_name = 'Dashboard Counter'
+        verbose_name_plural = 'Dashboard Counters'
+        constraints = [
+            models.UniqueConstraint(fields=['scope', 'key'], name='uniq_dashboard_counter_scope_key'),
+        ]
+
+    def __str__(self):
+        return f"{self.scope}:{self.key} = {self.value}"
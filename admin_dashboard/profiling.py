@@ -0,0 +1,219 @@
+import cProfile
+import io
+import json
+import os
+import pstats
+import re
+import sys
+import threading
+import time
+from datetime import datetime
+from django.conf import settings
+from django.core import signing
+from django.utils import timezone
+
+# Parameter query untuk memprofil satu request (nilainya token dari ProfileStore.make_token)
+PROFILE_QUERY_PARAM = '_profile'
+PROFILE_TOKEN_SALT = 'admin_dashboard.profiling'
+
+# <waktu>_<durasi>ms_<METHOD>_<path dengan / diganti +>.<format>
+PROFILE_NAME_RE = re.compile(
+    r'^(?P<stamp>\d{8}-\d{6}-\d{6})_(?P<ms>\d+)ms_(?P<method>[A-Z]+)_(?P<slug>[\w.+-]*)'
+    r'\.(?P<ext>prof|speedscope\.json)$'
+)
+PROFILE_FORMATS = {'prof': 'pstats', 'speedscope.json': 'speedscope'}
+
+
+class CProfileProfiler:
+    """cProfile: semua pemanggilan fungsi dicatat, hasil disimpan sebagai file pstats"""
+
+    extension = 'prof'
+
+    def __init__(self):
+        self.profile = cProfile.Profile()
+
+    def start(self):
+        self.profile.enable()
+
+    def stop(self):
+        self.profile.disable()
+
+    def write(self, path):
+        self.profile.dump_stats(path)
+
+
+class SamplingProfiler:
+    """
+    Sampling profiler: thread terpisah mengambil stack thread request setiap interval
+    lewat sys._current_frames(). Overhead kecil dan tidak bergantung pada jumlah
+    pemanggilan fungsi, hasil disimpan dalam format speedscope (https://www.speedscope.app).
+    """
+
+    extension = 'speedscope.json'
+
+    def __init__(self, interval):
+        self.interval = interval
+        self.samples = []
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        target = threading.get_ident()
+        self._started = time.perf_counter()
+        self._thread = threading.Thread(target=self._run, args=(target,), daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+        self._duration = time.perf_counter() - self._started
+
+    def _run(self, target):
+        last = time.perf_counter()
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(target)
+            now = time.perf_counter()
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append((code.co_name, code.co_filename, frame.f_lineno))
+                frame = frame.f_back
+            if stack:
+                # Bobot = waktu sejak sampel sebelumnya, bukan interval, agar jeda GIL ikut terhitung
+                self.samples.append((stack[::-1], now - last))
+            last = now
+
+    def speedscope(self, name):
+        frames = []
+        index = {}
+        samples = []
+        for stack, _ in self.samples:
+            ids = []
+            for frame in stack:
+                if frame not in index:
+                    index[frame] = len(frames)
+                    frames.append({'name': frame[0], 'file': frame[1], 'line': frame[2]})
+                ids.append(index[frame])
+            samples.append(ids)
+        weights = [weight for _, weight in self.samples]
+        return {
+            '$schema': 'https://www.speedscope.app/file-format-schema.json',
+            'name': name,
+            'exporter': 'maganghub',
+            'shared': {'frames': frames},
+            'profiles': [{
+                'type': 'sampled',
+                'name': name,
+                'unit': 'seconds',
+                'startValue': 0,
+                'endValue': self._duration,
+                'samples': samples,
+                'weights': weights,
+            }],
+        }
+
+    def write(self, path):
+        with open(path, 'w') as f:
+            json.dump(self.speedscope(os.path.basename(path)), f)
+
+
+class ProfileStore:
+    """Penyimpanan profil request lambat di PROFILING_DIR"""
+
+    @staticmethod
+    def create_profiler():
+        """Profiler sesuai PROFILING_MODE ('sampling' atau 'cprofile')"""
+        if settings.PROFILING_MODE == 'cprofile':
+            return CProfileProfiler()
+        return SamplingProfiler(settings.PROFILING_SAMPLE_INTERVAL_MS / 1000)
+
+    @staticmethod
+    def make_token(user):
+        """Token bertanda tangan untuk ?_profile=, hanya berlaku untuk user ini selama PROFILING_TOKEN_MAX_AGE"""
+        return signing.TimestampSigner(salt=PROFILE_TOKEN_SALT).sign(str(user.pk))
+
+    @staticmethod
+    def check_token(token, user):
+        try:
+            value = signing.TimestampSigner(salt=PROFILE_TOKEN_SALT).unsign(
+                token, max_age=settings.PROFILING_TOKEN_MAX_AGE
+            )
+        except signing.BadSignature:
+            return False
+        return value == str(user.pk)
+
+    @staticmethod
+    def save(request, duration, profiler):
+        """
+        Menyimpan profil dan menghapus profil terlama di atas PROFILING_MAX_FILES
+        Returns:
+            str: nama file profil
+        """
+        # '/' jadi '+' agar path bisa dibaca kembali dari nama file
+        slug = '+'.join(re.sub(r'[^\w.-]+', '-', part) for part in request.path.strip('/').split('/'))[:120]
+        stamp = timezone.localtime().strftime('%Y%m%d-%H%M%S-%f')
+        name = f'{stamp}_{int(duration * 1000)}ms_{request.method}_{slug}.{profiler.extension}'
+
+        directory = settings.PROFILING_DIR
+        os.makedirs(directory, exist_ok=True)
+        profiler.write(os.path.join(directory, name))
+
+        names = sorted(entry for entry in os.listdir(directory) if PROFILE_NAME_RE.match(entry))
+        for old in names[:max(len(names) - settings.PROFILING_MAX_FILES, 0)]:
+            try:
+                os.remove(os.path.join(directory, old))
+            except FileNotFoundError:
+                pass
+        return name
+
+    @staticmethod
+    def list_profiles():
+        """
+        Returns:
+            list: dict name, created_at, duration_ms, method, path, format, size (terbaru dulu)
+        """
+        directory = settings.PROFILING_DIR
+        if not os.path.isdir(directory):
+            return []
+
+        profiles = []
+        for name in sorted(os.listdir(directory), reverse=True):
+            match = PROFILE_NAME_RE.match(name)
+            if not match:
+                continue
+            try:
+                size = os.path.getsize(os.path.join(directory, name))
+            except FileNotFoundError:
+                continue
+            profiles.append({
+                'name': name,
+                'created_at': datetime.strptime(match['stamp'], '%Y%m%d-%H%M%S-%f'),
+                'duration_ms': int(match['ms']),
+                'method': match['method'],
+                'path': f"/{match['slug'].replace('+', '/')}/" if match['slug'] else '/',
+                'format': PROFILE_FORMATS[match['ext']],
+                'size': size,
+            })
+        return profiles
+
+    @staticmethod
+    def get_path(name):
+        """
+        Path file profil, nama divalidasi agar tidak bisa keluar dari PROFILING_DIR
+        Raises:
+            ValueError: nama tidak valid atau file tidak ada
+        """
+        path = os.path.join(settings.PROFILING_DIR, name)
+        if not PROFILE_NAME_RE.match(name) or not os.path.isfile(path):
+            raise ValueError('Profil tidak ditemukan')
+        return path
+
+    @staticmethod
+    def summary(name, limit=40):
+        """Ringkasan teks file pstats: fungsi dengan waktu kumulatif terbesar"""
+        path = ProfileStore.get_path(name)
+        if not name.endswith('.prof'):
+            raise ValueError('Ringkasan hanya tersedia untuk profil cProfile')
+        stream = io.StringIO()
+        pstats.Stats(path, stream=stream).sort_stats('cumulative').print_stats(limit)
+        return stream.getvalue()
@@ -1,37 +1,200 @@
-from django.db.models import Count, Q
+import os
+from collections import Counter
+from django.db import transaction
+from django.db.models import Count, DecimalField, F, OuterRef, Q, Subquery, Value
+from django.db.models.functions import Coalesce
+from django.urls import reverse
 from django.utils import timezone
-from datetime import timedelta, datetime
+from datetime import timedelta, datetime, date
+from decimal import Decimal
 from magang.models import Pendaftar, Lowongan, TransaksiPendaftaran, Departement
+from magang.services.pagination import KeysetPaginator
+from magang.services.cv_processing_service import CvProcessingService
+from magang.services.cv_storage_service import CvStorageService
+from magang.services.projection import Projection
+from magang.services.search_service import SearchService
+from magang.storage import cv_storage, digest_from_name
+from .counter_service import DashboardCounterService
+from .metrics import instrument_service
+from .models import DashboardCounter
 
+# Konfigurasi chart tren pendaftaran
+TREND_DEFAULT_BUCKET = 4
+TREND_MAX_DAYS = 730
+TREND_NAMED_BUCKETS = {
+    'day': 1,
+    'week': 7,
+}
 
+# Pagination daftar pendaftar: sort key -> arah default
+APPLICANT_PAGE_SIZE = 25
+APPLICANT_MAX_PAGE_SIZE = 100
+APPLICANT_SORT_FIELDS = {
+    'date': 'desc',
+    'ipk': 'desc',
+    'university': 'asc',
+}
+
+
+def _initials(name):
+    """Inisial dari dua kata pertama nama"""
+    return ''.join([part[0].upper() for part in name.split()[:2]])
+
+
+# Proyeksi values() untuk API JSON dashboard: hanya kolom yang ditampilkan yang diambil
+RECENT_APPLICANT_PROJECTION = Projection(
+    ['id_transaksi_pendaftaran', 'pendaftar__name', 'lowongan__posisi', 'pendaftar__university',
+     'created_at', 'status', 'pendaftar__nik'],
+    lambda row, fmt: {
+        'id_transaksi': row['id_transaksi_pendaftaran'],
+        'name': row['pendaftar__name'],
+        'initials': _initials(row['pendaftar__name']),
+        'position': row['lowongan__posisi'],
+        'university': row['pendaftar__university'],
+        'date': fmt(row['created_at'], '%d %b %Y'),
+        'status': row['status'],
+        'nik': row['pendaftar__nik']
+    }
+)
+
+PENDING_APPLICANT_PROJECTION = Projection(
+    ['id_transaksi_pendaftaran', 'pendaftar__name', 'pendaftar__nik', 'lowongan__posisi',
+     'lowongan__departement__nama_dept', 'pendaftar__university', 'pendaftar__major',
+     'pendaftar__ipk', 'created_at'],
+    lambda row, fmt: {
+        'id_transaksi': row['id_transaksi_pendaftaran'],
+        'nama': row['pendaftar__name'],
+        'nik': row['pendaftar__nik'],
+        'posisi': row['lowongan__posisi'],
+        'departemen': row['lowongan__departement__nama_dept'],
+        'universitas': row['pendaftar__university'],
+        'jurusan': row['pendaftar__major'],
+        'ipk': row['pendaftar__ipk'],
+        'tanggal_daftar': fmt(row['created_at'], '%d %b %Y')
+    }
+)
+
+HISTORY_APPLICANT_PROJECTION = Projection(
+    ['id_transaksi_pendaftaran', 'pendaftar__name', 'lowongan__posisi', 'created_at', 'status'],
+    lambda row, fmt: {
+        'id_transaksi': row['id_transaksi_pendaftaran'],
+        'nama': row['pendaftar__name'],
+        'posisi': row['lowongan__posisi'],
+        'tanggal_daftar': fmt(row['created_at'], '%d %b %Y'),
+        'status': row['status']
+    }
+)
+
+
+# Kolom export pendaftar: (judul kolom, path ORM)
+APPLICANT_EXPORT_COLUMNS = [
+    ('ID Transaksi', 'id_transaksi_pendaftaran'),
+    ('NIK', 'pendaftar__nik'),
+    ('Nama', 'pendaftar__name'),
+    ('Jenis Kelamin', 'pendaftar__gender'),
+    ('Tanggal Lahir', 'pendaftar__dob'),
+    ('No. Telp', 'pendaftar__no_telp'),
+    ('Alamat', 'pendaftar__address'),
+    ('Universitas', 'pendaftar__university'),
+    ('Jurusan', 'pendaftar__major'),
+    ('IPK', 'pendaftar__ipk'),
+    ('Posisi', 'lowongan__posisi'),
+    ('Departemen', 'lowongan__departement__nama_dept'),
+    ('Status', 'status'),
+    ('Tanggal Daftar', 'created_at'),
+    ('Tanggal Diproses', 'updated_at'),
+]
+APPLICANT_EXPORT_SCOPES = ('pending', 'history', 'all')
+APPLICANT_EXPORT_CHUNK_SIZE = 2000
+
+# Update status massal: batas jumlah transaksi per permintaan
+BULK_STATUS_MAX_ROWS = 2000
+BULK_STATUS_FILTERS = ('id_lowongan', 'status', 'ipk_lt', 'ipk_gte')
+
+
+def _cv_filename(name, metadata):
+    # Nama file content-addressed berupa hash, nama asli disimpan di metadata oleh worker CV
+    return (metadata or {}).get('original_name') or name.split('/')[-1]
+
+
+def _build_lowongan_row(row, fmt, today):
+    # Tentukan status
+    if row['tanggal_selesai'] >= today:
+        status = 'Aktif'
+        status_class = 'active'
+    else:
+        status = 'Selesai'
+        status_class = 'completed'
+    
+    return {
+        'id': row['id_lowongan'],
+        'posisi': row['posisi'],
+        'deskripsi': row['deskripsi'],
+        'departemen': row['departement__nama_dept'],
+        'departemen_id': row['departement_id'],
+        'tanggal_mulai': fmt(row['tanggal_mulai'], '%Y-%m-%d'),
+        'tanggal_selesai': fmt(row['tanggal_selesai'], '%Y-%m-%d'),
+        'periode': f"{fmt(row['tanggal_mulai'], '%d %b %y')} - {fmt(row['tanggal_selesai'], '%d %b %y')}",
+        'status': status,
+        'status_class': status_class
+    }
+
+
+LOWONGAN_COLUMNS = ['id_lowongan', 'posisi', 'deskripsi', 'departement__nama_dept', 'departement_id',
+                    'tanggal_mulai', 'tanggal_selesai']
+
+
+@instrument_service
 class DashboardService:
     """Service untuk menyediakan data dashboard admin"""
     
     @staticmethod
-    def get_statistics():
-        """Mendapatkan statistik keseluruhan untuk cards"""
-        total_pendaftar = Pendaftar.objects.count()
-        
-        # Lowongan aktif (tanggal selesai >= hari ini)
-        today = timezone.now().date()
-        lowongan_aktif = Lowongan.objects.filter(tanggal_selesai__gte=today).count()
-        
-        # Departemen yang sedang membuka lowongan
-        dept_aktif = Lowongan.objects.filter(
-            tanggal_selesai__gte=today
-        ).values('departement').distinct().count()
+    def _load_counters(scopes, harian_since=None):
+        """
+        Membaca rollup counter beberapa scope dalam satu query
+        Args:
+            scopes (list): scope counter yang dibaca penuh
+            harian_since (date): jika diisi, ikut membaca counter harian sejak tanggal ini
+        Returns:
+            dict: {scope: {key: value}}
+        """
+        filters = Q(scope__in=scopes)
+        if harian_since is not None:
+            filters |= Q(scope=DashboardCounter.SCOPE_HARIAN, key__gte=harian_since.isoformat())
+        
+        counters = {scope: {} for scope in scopes}
+        counters.setdefault(DashboardCounter.SCOPE_HARIAN, {})
+        for scope, key, value in DashboardCounter.objects.filter(filters).values_list('scope', 'key', 'value'):
+            counters[scope][key] = value
+        return counters
+    
+    @staticmethod
+    def _build_statistics(counters, today):
+        """Menyusun statistik cards dari counter yang sudah dibaca"""
+        last_month = (today - timedelta(days=30)).isoformat()
+        totals = counters[DashboardCounter.SCOPE_TOTAL]
+        status = counters[DashboardCounter.SCOPE_STATUS]
+        
+        # Lowongan aktif (tanggal selesai >= hari ini) dan departemen yang sedang membuka lowongan
+        lowongan_stats = Lowongan.objects.filter(tanggal_selesai__gte=today).aggregate(
+            lowongan_aktif=Count('id_lowongan'),
+            dept_aktif=Count('departement', distinct=True)
+        )
         
-        # Menunggu review (status pending)
-        menunggu_review = TransaksiPendaftaran.objects.filter(status='pending').count()
+        total_pendaftar = totals.get('pendaftar', 0)
+        lowongan_aktif = lowongan_stats['lowongan_aktif']
+        dept_aktif = lowongan_stats['dept_aktif']
+        menunggu_review = status.get('pending', 0)
         
-        # Total diterima dan tingkat penerimaan
-        total_approved = TransaksiPendaftaran.objects.filter(status='approved').count()
-        total_transaksi = TransaksiPendaftaran.objects.count()
+        # Tingkat penerimaan
+        total_approved = status.get('approved', 0)
+        total_transaksi = totals.get('transaksi', 0)
         tingkat_penerimaan = round((total_approved / total_transaksi * 100), 0) if total_transaksi > 0 else 0
         
         # Hitung perubahan dari bulan lalu
-        last_month = today - timedelta(days=30)
-        pendaftar_bulan_ini = Pendaftar.objects.filter(created_at__gte=last_month).count()
+        pendaftar_bulan_ini = sum(
+            value for key, value in counters[DashboardCounter.SCOPE_HARIAN].items() if key >= last_month
+        )
         pendaftar_bulan_lalu = total_pendaftar - pendaftar_bulan_ini
         persentase_perubahan = round((pendaftar_bulan_ini / pendaftar_bulan_lalu * 100) - 100, 0) if pendaftar_bulan_lalu > 0 else 0
         
@@ -46,45 +209,70 @@ class DashboardService:
         }
     
     @staticmethod
-    def get_trend_data(days=30):
-        """Mendapatkan data tren pendaftaran untuk line chart"""
-        now = timezone.now()
-        today = now.date()
-        
-        # Ambil data 30 hari terakhir, kelompokkan per 4 hari (8 titik data)
-        intervals = []
-        data_points = []
+    def get_statistics():
+        """Mendapatkan statistik keseluruhan untuk cards"""
+        today = timezone.localdate()
         
-        for i in range(7, -1, -1):  # 8 titik data, dari yang terlama ke terbaru
-            # Hitung rentang waktu untuk setiap interval
-            days_back_end = i * 4
-            days_back_start = (i + 1) * 4
-            
-            end_date = today - timedelta(days=days_back_end)
-            start_date = today - timedelta(days=days_back_start)
-            
-            # Query dengan datetime agar mencakup hari ini juga
-            if i == 0:  # Interval terakhir sampai sekarang
-                count = Pendaftar.objects.filter(
-                    created_at__gte=timezone.make_aware(
-                        timezone.datetime.combine(start_date, timezone.datetime.min.time())
-                    ),
-                    created_at__lte=now
-                ).count()
-            else:
-                count = Pendaftar.objects.filter(
-                    created_at__gte=timezone.make_aware(
-                        timezone.datetime.combine(start_date, timezone.datetime.min.time())
-                    ),
-                    created_at__lt=timezone.make_aware(
-                        timezone.datetime.combine(end_date, timezone.datetime.min.time())
-                    )
-                ).count()
-            
-            # Format label tanggal
-            label = end_date.strftime('%d %b')
-            intervals.append(label)
-            data_points.append(count)
+        # Total, status dan pendaftar 30 hari terakhir dibaca dari rollup counter
+        counters = DashboardService._load_counters(
+            [DashboardCounter.SCOPE_TOTAL, DashboardCounter.SCOPE_STATUS],
+            harian_since=today - timedelta(days=30)
+        )
+        return DashboardService._build_statistics(counters, today)
+    
+    @staticmethod
+    def _parse_bucket(bucket):
+        """
+        Mengubah parameter bucket menjadi ukuran interval dalam hari
+        Args:
+            bucket: 'day', 'week', jumlah hari (int) atau string seperti '4' / '4d'
+        Returns:
+            int: ukuran bucket dalam hari
+        """
+        if bucket is None or bucket == '':
+            return TREND_DEFAULT_BUCKET
+        if isinstance(bucket, str):
+            bucket = bucket.strip().lower()
+            if bucket in TREND_NAMED_BUCKETS:
+                return TREND_NAMED_BUCKETS[bucket]
+            bucket = bucket[:-1] if bucket.endswith('d') else bucket
+            if not bucket.isdigit():
+                raise ValueError('Bucket harus day, week atau jumlah hari (contoh: 4d)')
+        size = int(bucket)
+        if size < 1:
+            raise ValueError('Ukuran bucket minimal 1 hari')
+        return size
+    
+    @staticmethod
+    def _trend_range(days, bucket, today):
+        """
+        Menghitung rentang chart tren
+        Returns:
+            tuple: (ukuran bucket, jumlah bucket, tanggal awal)
+        """
+        days = int(days)
+        if days < 1 or days > TREND_MAX_DAYS:
+            raise ValueError(f'Rentang hari harus antara 1 dan {TREND_MAX_DAYS}')
+        size = DashboardService._parse_bucket(bucket)
+        jumlah_bucket = -(-days // size)  # pembulatan ke atas
+        start_date = today - timedelta(days=jumlah_bucket * size - 1)
+        return size, jumlah_bucket, start_date
+    
+    @staticmethod
+    def _build_trend(per_hari, size, jumlah_bucket, start_date):
+        """Mengelompokkan counter harian {tanggal ISO: jumlah} ke dalam bucket"""
+        # Bucket kosong tetap bernilai 0
+        data_points = [0] * jumlah_bucket
+        for key, value in per_hari.items():
+            index = (date.fromisoformat(key) - start_date).days // size
+            if 0 <= index < jumlah_bucket:
+                data_points[index] += value
+        
+        # Label memakai tanggal terakhir dari setiap bucket
+        intervals = [
+            (start_date + timedelta(days=(i + 1) * size - 1)).strftime('%d %b')
+            for i in range(jumlah_bucket)
+        ]
         
         return {
             'labels': intervals,
@@ -92,97 +280,103 @@ class DashboardService:
         }
     
     @staticmethod
-    def get_department_distribution():
-        """Mendapatkan distribusi pendaftar per departemen untuk doughnut chart"""
-        # Hitung jumlah pendaftar per departemen
-        dept_data = TransaksiPendaftaran.objects.values(
-            'lowongan__departement__nama_dept'
-        ).annotate(
-            count=Count('id_transaksi_pendaftaran')
-        ).order_by('-count')[:5]  # Top 5 departemen
+    def get_trend_data(days=30, bucket=None):
+        """
+        Mendapatkan data tren pendaftaran untuk line chart
+        Args:
+            days (int): rentang hari ke belakang yang ditampilkan
+            bucket: ukuran interval ('day', 'week' atau N hari, default 4 hari)
+        Returns:
+            dict: {'labels': [...], 'data': [...]} dari yang terlama ke terbaru
+        """
+        size, jumlah_bucket, start_date = DashboardService._trend_range(days, bucket, timezone.localdate())
+        
+        # Jumlah pendaftar per hari dibaca dari rollup counter, lalu dikelompokkan ke bucket
+        counters = DashboardService._load_counters([], harian_since=start_date)
+        return DashboardService._build_trend(
+            counters[DashboardCounter.SCOPE_HARIAN], size, jumlah_bucket, start_date
+        )
+    
+    @staticmethod
+    def _build_department_distribution(per_dept):
+        """Menyusun top 5 departemen dari counter {id_dept: jumlah}"""
+        dept_data = sorted(
+            ((key, value) for key, value in per_dept.items() if value > 0),
+            key=lambda item: (-item[1], item[0])
+        )[:5]  # Top 5 departemen
+        
+        nama_dept = dict(Departement.objects.filter(
+            id_dept__in=[int(key) for key, _ in dept_data]
+        ).values_list('id_dept', 'nama_dept')) if dept_data else {}
         
         labels = []
         data = []
         
-        for item in dept_data:
-            dept_name = item['lowongan__departement__nama_dept']
-            # Singkat nama departemen jika terlalu panjang
+        for key, count in dept_data:
+            dept_name = nama_dept.get(int(key))
             if dept_name:
                 labels.append(dept_name)
-                data.append(item['count'])
+                data.append(count)
         
         return {
             'labels': labels,
             'data': data
         }
     
+    @staticmethod
+    def get_department_distribution():
+        """Mendapatkan distribusi pendaftar per departemen untuk doughnut chart"""
+        # Jumlah pendaftar per departemen dibaca dari rollup counter
+        counters = DashboardService._load_counters([DashboardCounter.SCOPE_DEPARTEMEN])
+        return DashboardService._build_department_distribution(counters[DashboardCounter.SCOPE_DEPARTEMEN])
+    
+    @staticmethod
+    def get_dashboard_bootstrap(days=30, bucket=None, limit=10):
+        """
+        Mendapatkan seluruh data halaman dashboard sekaligus
+        (statistik, tren, distribusi departemen dan pendaftar terbaru).
+        Semua counter dibaca dengan satu query lalu dipakai bersama.
+        Returns:
+            dict: {'stats', 'trend', 'department', 'recent_applicants'}
+        """
+        today = timezone.localdate()
+        size, jumlah_bucket, start_date = DashboardService._trend_range(days, bucket, today)
+        
+        counters = DashboardService._load_counters(
+            [DashboardCounter.SCOPE_TOTAL, DashboardCounter.SCOPE_STATUS, DashboardCounter.SCOPE_DEPARTEMEN],
+            harian_since=min(start_date, today - timedelta(days=30))
+        )
+        
+        return {
+            'stats': DashboardService._build_statistics(counters, today),
+            'trend': DashboardService._build_trend(
+                counters[DashboardCounter.SCOPE_HARIAN], size, jumlah_bucket, start_date
+            ),
+            'department': DashboardService._build_department_distribution(
+                counters[DashboardCounter.SCOPE_DEPARTEMEN]
+            ),
+            'recent_applicants': DashboardService.get_recent_applicants(limit)
+        }
+    
     @staticmethod
     def get_recent_applicants(limit=10):
         """Mendapatkan daftar pendaftar terbaru dengan berbagai status"""
-        recent = TransaksiPendaftaran.objects.select_related(
-            'pendaftar', 
-            'lowongan',
-            'lowongan__departement'
-        ).order_by('-created_at')[:limit]
-        
-        applicants = []
-        for transaksi in recent:
-            # Buat inisial dari nama
-            name_parts = transaksi.pendaftar.name.split()
-            initials = ''.join([part[0].upper() for part in name_parts[:2]])
-            
-            applicants.append({
-                'id_transaksi': transaksi.id_transaksi_pendaftaran,
-                'name': transaksi.pendaftar.name,
-                'initials': initials,
-                'position': transaksi.lowongan.posisi,
-                'university': transaksi.pendaftar.university,
-                'date': transaksi.created_at.strftime('%d %b %Y'),
-                'status': transaksi.status,
-                'nik': transaksi.pendaftar.nik
-            })
-        
-        return applicants
+        recent = TransaksiPendaftaran.objects.order_by('-created_at')[:limit]
+        return list(RECENT_APPLICANT_PROJECTION.iterate(recent))
     
     @staticmethod
     def get_all_lowongan(search=''):
         """Mendapatkan semua lowongan dengan filter search"""
-        lowongan_list = Lowongan.objects.select_related('departement').all()
+        lowongan_list = Lowongan.objects.all()
         
         if search:
-            lowongan_list = lowongan_list.filter(
-                Q(posisi__icontains=search) | 
-                Q(departement__nama_dept__icontains=search)
-            )
+            lowongan_list = SearchService.search_lowongan(lowongan_list, search).order_by('-search_rank', '-tanggal_mulai')
+        else:
+            lowongan_list = lowongan_list.order_by('-tanggal_mulai')
         
-        lowongan_list = lowongan_list.order_by('-tanggal_mulai')
-        
-        result = []
         today = timezone.now().date()
-        
-        for lowongan in lowongan_list:
-            # Tentukan status
-            if lowongan.tanggal_selesai >= today:
-                status = 'Aktif'
-                status_class = 'active'
-            else:
-                status = 'Selesai'
-                status_class = 'completed'
-            
-            result.append({
-                'id': lowongan.id_lowongan,
-                'posisi': lowongan.posisi,
-                'deskripsi': lowongan.deskripsi,
-                'departemen': lowongan.departement.nama_dept,
-                'departemen_id': lowongan.departement.id_dept,
-                'tanggal_mulai': lowongan.tanggal_mulai.strftime('%Y-%m-%d'),
-                'tanggal_selesai': lowongan.tanggal_selesai.strftime('%Y-%m-%d'),
-                'periode': f"{lowongan.tanggal_mulai.strftime('%d %b %y')} - {lowongan.tanggal_selesai.strftime('%d %b %y')}",
-                'status': status,
-                'status_class': status_class
-            })
-        
-        return result
+        projection = Projection(LOWONGAN_COLUMNS, lambda row, fmt: _build_lowongan_row(row, fmt, today))
+        return list(projection.iterate(lowongan_list))
     
     @staticmethod
     def create_lowongan(data):
@@ -199,20 +393,35 @@ class DashboardService:
     @staticmethod
     def update_lowongan(id_lowongan, data):
         """Update lowongan yang ada"""
-        lowongan = Lowongan.objects.get(id_lowongan=id_lowongan)
-        lowongan.posisi = data['posisi']
-        lowongan.deskripsi = data.get('deskripsi', '')
-        lowongan.tanggal_mulai = data['tanggal_mulai']
-        lowongan.tanggal_selesai = data['tanggal_selesai']
-        lowongan.departement_id = data['departemen_id']
-        lowongan.save()
+        with transaction.atomic():
+            lowongan = Lowongan.objects.select_for_update().get(id_lowongan=id_lowongan)
+            old_dept_id = lowongan.departement_id
+            lowongan.posisi = data['posisi']
+            lowongan.deskripsi = data.get('deskripsi', '')
+            lowongan.tanggal_mulai = data['tanggal_mulai']
+            lowongan.tanggal_selesai = data['tanggal_selesai']
+            lowongan.departement_id = int(data['departemen_id'])
+            lowongan.save()
+            DashboardCounterService.record_departemen_change(
+                lowongan.id_lowongan, old_dept_id, lowongan.departement_id
+            )
         return lowongan
     
     @staticmethod
     def delete_lowongan(id_lowongan):
         """Hapus lowongan"""
-        lowongan = Lowongan.objects.get(id_lowongan=id_lowongan)
-        lowongan.delete()
+        with transaction.atomic():
+            lowongan = Lowongan.objects.get(id_lowongan=id_lowongan)
+            # Pendaftar dan transaksi ikut terhapus (CASCADE)
+            CvStorageService.release_pendaftar(Pendaftar.objects.filter(lowongan=lowongan))
+            CvProcessingService.discard_pendaftar_jobs(Pendaftar.objects.filter(lowongan=lowongan))
+            DashboardCounterService.record_deletion(
+                pendaftar_qs=Pendaftar.objects.filter(lowongan=lowongan),
+                transaksi_qs=TransaksiPendaftaran.objects.filter(
+                    Q(lowongan=lowongan) | Q(pendaftar__lowongan=lowongan)
+                )
+            )
+            lowongan.delete()
         return True
     
     @staticmethod
@@ -230,21 +439,37 @@ class DashboardService:
     
     @staticmethod
     def get_all_departemen(search=''):
-        """Mendapatkan semua departemen dengan jumlah lowongan"""
-        dept_list = Departement.objects.all()
+        """Mendapatkan semua departemen dengan jumlah lowongan, lowongan aktif dan pendaftar"""
+        today = timezone.localdate()
+        
+        # Jumlah pendaftar dihitung lewat subquery agar join lowongan tidak ikut terduplikasi
+        jumlah_pendaftar = TransaksiPendaftaran.objects.filter(
+            lowongan__departement=OuterRef('pk')
+        ).order_by().values('lowongan__departement').annotate(
+            count=Count('id_transaksi_pendaftaran')
+        ).values('count')
+        
+        dept_list = Departement.objects.annotate(
+            jumlah_lowongan=Count('lowongan'),
+            jumlah_lowongan_aktif=Count('lowongan', filter=Q(lowongan__tanggal_selesai__gte=today)),
+            jumlah_pendaftar=Coalesce(Subquery(jumlah_pendaftar), 0)
+        )
         
         if search:
             dept_list = dept_list.filter(nama_dept__icontains=search)
         
-        dept_list = dept_list.order_by('nama_dept')
+        dept_list = dept_list.order_by('nama_dept').values(
+            'id_dept', 'nama_dept', 'jumlah_lowongan', 'jumlah_lowongan_aktif', 'jumlah_pendaftar'
+        )
         
         result = []
         for dept in dept_list:
-            jumlah_lowongan = Lowongan.objects.filter(departement=dept).count()
             result.append({
-                'id': dept.id_dept,
-                'nama_dept': dept.nama_dept,
-                'jumlah_lowongan': jumlah_lowongan
+                'id': dept['id_dept'],
+                'nama_dept': dept['nama_dept'],
+                'jumlah_lowongan': dept['jumlah_lowongan'],
+                'jumlah_lowongan_aktif': dept['jumlah_lowongan_aktif'],
+                'jumlah_pendaftar': dept['jumlah_pendaftar']
             })
         
         return result
@@ -268,8 +493,18 @@ class DashboardService:
     @staticmethod
     def delete_departemen(id_dept):
         """Hapus departemen"""
-        dept = Departement.objects.get(id_dept=id_dept)
-        dept.delete()
+        with transaction.atomic():
+            dept = Departement.objects.get(id_dept=id_dept)
+            # Lowongan, pendaftar dan transaksi ikut terhapus (CASCADE)
+            CvStorageService.release_pendaftar(Pendaftar.objects.filter(lowongan__departement=dept))
+            CvProcessingService.discard_pendaftar_jobs(Pendaftar.objects.filter(lowongan__departement=dept))
+            DashboardCounterService.record_deletion(
+                pendaftar_qs=Pendaftar.objects.filter(lowongan__departement=dept),
+                transaksi_qs=TransaksiPendaftaran.objects.filter(
+                    Q(lowongan__departement=dept) | Q(pendaftar__lowongan__departement=dept)
+                )
+            )
+            dept.delete()
         return True
     
     @staticmethod
@@ -282,66 +517,166 @@ class DashboardService:
         }
     
     @staticmethod
-    def get_pending_applicants(search=''):
-        """Mendapatkan daftar pendaftar dengan status pending"""
-        transaksi_list = TransaksiPendaftaran.objects.select_related(
-            'pendaftar', 'lowongan', 'lowongan__departement'
-        ).filter(status='pending')
+    def _pending_queryset(search=''):
+        """Queryset transaksi pending dengan filter search"""
+        transaksi_list = TransaksiPendaftaran.objects.filter(status='pending')
         
         if search:
-            transaksi_list = transaksi_list.filter(
-                Q(pendaftar__name__icontains=search) |
-                Q(lowongan__posisi__icontains=search) |
-                Q(pendaftar__university__icontains=search)
-            )
-        
-        transaksi_list = transaksi_list.order_by('-created_at')
+            transaksi_list = SearchService.search_applicants(transaksi_list, search)
         
-        result = []
-        for transaksi in transaksi_list:
-            result.append({
-                'id_transaksi': transaksi.id_transaksi_pendaftaran,
-                'nama': transaksi.pendaftar.name,
-                'nik': transaksi.pendaftar.nik,
-                'posisi': transaksi.lowongan.posisi,
-                'departemen': transaksi.lowongan.departement.nama_dept,
-                'universitas': transaksi.pendaftar.university,
-                'jurusan': transaksi.pendaftar.major,
-                'ipk': transaksi.pendaftar.ipk,
-                'tanggal_daftar': transaksi.created_at.strftime('%d %b %Y')
-            })
-        
-        return result
+        return transaksi_list
     
     @staticmethod
-    def get_applicants_history(search='', status_filter=''):
-        """Mendapatkan riwayat pendaftar (approved/rejected)"""
-        transaksi_list = TransaksiPendaftaran.objects.select_related(
-            'pendaftar', 'lowongan'
-        ).exclude(status='pending')
+    def _history_queryset(search='', status_filter=''):
+        """Queryset riwayat transaksi (approved/rejected) dengan filter status dan search"""
+        transaksi_list = TransaksiPendaftaran.objects.exclude(status='pending')
         
         if status_filter:
             transaksi_list = transaksi_list.filter(status=status_filter)
         
         if search:
-            transaksi_list = transaksi_list.filter(
-                Q(pendaftar__name__icontains=search) |
-                Q(lowongan__posisi__icontains=search)
-            )
+            transaksi_list = SearchService.search_applicants(transaksi_list, search)
         
-        transaksi_list = transaksi_list.order_by('-updated_at')
+        return transaksi_list
+    
+    @staticmethod
+    def get_pending_applicants(search=''):
+        """Mendapatkan daftar pendaftar dengan status pending"""
+        transaksi_list = DashboardService._pending_queryset(search).order_by('-created_at')
+        return list(PENDING_APPLICANT_PROJECTION.iterate(transaksi_list))
+    
+    @staticmethod
+    def get_applicants_history(search='', status_filter=''):
+        """Mendapatkan riwayat pendaftar (approved/rejected)"""
+        transaksi_list = DashboardService._history_queryset(search, status_filter).order_by('-updated_at')
+        return list(HISTORY_APPLICANT_PROJECTION.iterate(transaksi_list))
+    
+    @staticmethod
+    def _applicant_paginator(date_field, sort='', order=''):
+        """
+        Memilih paginator sesuai kolom urutan
+        Args:
+            date_field (str): kolom tanggal untuk sort 'date' (created_at / updated_at)
+            sort (str): 'date', 'ipk' atau 'university'
+            order (str): 'asc' atau 'desc'
+        """
+        sort = sort or 'date'
+        if sort not in APPLICANT_SORT_FIELDS:
+            raise ValueError(f'Sort tidak valid. Pilih dari: {", ".join(APPLICANT_SORT_FIELDS)}')
+        order = order or APPLICANT_SORT_FIELDS[sort]
+        if order not in ('asc', 'desc'):
+            raise ValueError('Order harus asc atau desc')
+        
+        field = date_field if sort == 'date' else f'{sort}_sort'
+        prefix = '-' if order == 'desc' else ''
+        return KeysetPaginator(
+            [f'{prefix}{field}', f'{prefix}id_transaksi_pendaftaran'],
+            default_limit=APPLICANT_PAGE_SIZE,
+            max_limit=APPLICANT_MAX_PAGE_SIZE
+        )
+    
+    @staticmethod
+    def _with_sort_fields(transaksi_list):
+        """Menambahkan kolom urutan dari tabel pendaftar (IPK kosong dianggap 0)"""
+        return transaksi_list.annotate(
+            ipk_sort=Coalesce('pendaftar__ipk', Value(Decimal('0')), output_field=DecimalField(max_digits=4, decimal_places=2)),
+            university_sort=F('pendaftar__university')
+        )
+    
+    @staticmethod
+    def iter_applicant_export(scope='all', search='', status_filter='', sort='', order=''):
+        """
+        Baris export pendaftar sebagai tuple sesuai APPLICANT_EXPORT_COLUMNS.
+        Diambil per chunk dengan iterator() (server-side cursor di PostgreSQL) sehingga
+        memori tetap konstan berapapun jumlah barisnya.
+        Args:
+            scope (str): 'pending', 'history' atau 'all'
+            search (str): kata kunci pencarian (sama dengan daftar pendaftar)
+            status_filter (str): filter status untuk 'history' dan 'all'
+            sort (str): 'date', 'ipk' atau 'university'
+            order (str): 'asc' atau 'desc'
+        Returns:
+            tuple: (list judul kolom, iterator baris)
+        Raises:
+            ValueError: scope, status, sort atau order tidak valid
+        """
+        if scope not in APPLICANT_EXPORT_SCOPES:
+            raise ValueError(f'Scope tidak valid. Pilih dari: {", ".join(APPLICANT_EXPORT_SCOPES)}')
+        allowed_status = ('approved', 'rejected') if scope == 'history' else ('pending', 'approved', 'rejected')
+        if status_filter and (scope == 'pending' or status_filter not in allowed_status):
+            raise ValueError('Status tidak valid')
+        
+        if scope == 'pending':
+            transaksi_list = DashboardService._pending_queryset(search)
+        elif scope == 'history':
+            transaksi_list = DashboardService._history_queryset(search, status_filter)
+        else:
+            transaksi_list = TransaksiPendaftaran.objects.all()
+            if status_filter:
+                transaksi_list = transaksi_list.filter(status=status_filter)
+            if search:
+                transaksi_list = SearchService.search_applicants(transaksi_list, search)
+        
+        # Urutan sama dengan tampilan daftar (keyset paginator), tanpa batas halaman
+        paginator = DashboardService._applicant_paginator(
+            'updated_at' if scope == 'history' else 'created_at', sort, order
+        )
+        rows = DashboardService._with_sort_fields(transaksi_list).order_by(*paginator.ordering).values_list(
+            *[path for _, path in APPLICANT_EXPORT_COLUMNS]
+        )
+        return [title for title, _ in APPLICANT_EXPORT_COLUMNS], rows.iterator(chunk_size=APPLICANT_EXPORT_CHUNK_SIZE)
+    
+    @staticmethod
+    def get_pending_applicants_page(search='', sort='', order='', cursor=None, limit=None):
+        """
+        Mendapatkan satu halaman pendaftar pending (keyset pagination)
+        Args:
+            search (str): kata kunci pencarian
+            sort (str): 'date' (default), 'ipk' atau 'university'
+            order (str): 'asc' atau 'desc'
+            cursor (str): next_cursor dari halaman sebelumnya
+            limit (int): jumlah baris per halaman
+        Returns:
+            dict: {'data': [...], 'next_cursor': str atau None, 'has_more': bool,
+                   'total_pending': jumlah seluruh pendaftar pending dari rollup counter}
+        """
+        paginator = DashboardService._applicant_paginator('created_at', sort, order)
+        transaksi_list = DashboardService._with_sort_fields(DashboardService._pending_queryset(search))
+        page = PENDING_APPLICANT_PROJECTION.paginate(paginator, transaksi_list, cursor, limit)
+        status = DashboardService._load_counters([DashboardCounter.SCOPE_STATUS])[DashboardCounter.SCOPE_STATUS]
         
-        result = []
-        for transaksi in transaksi_list:
-            result.append({
-                'id_transaksi': transaksi.id_transaksi_pendaftaran,
-                'nama': transaksi.pendaftar.name,
-                'posisi': transaksi.lowongan.posisi,
-                'tanggal_daftar': transaksi.created_at.strftime('%d %b %Y'),
-                'status': transaksi.status
-            })
+        return {
+            'data': page['items'],
+            'next_cursor': page['next_cursor'],
+            'has_more': page['has_more'],
+            'total_pending': status.get('pending', 0)
+        }
+    
+    @staticmethod
+    def get_applicants_history_page(search='', status_filter='', sort='', order='', cursor=None, limit=None):
+        """
+        Mendapatkan satu halaman riwayat pendaftar (keyset pagination)
+        Args:
+            search (str): kata kunci pencarian
+            status_filter (str): 'approved' / 'rejected' / kosong
+            sort (str): 'date' (default, berdasarkan updated_at), 'ipk' atau 'university'
+            order (str): 'asc' atau 'desc'
+            cursor (str): next_cursor dari halaman sebelumnya
+            limit (int): jumlah baris per halaman
+        Returns:
+            dict: {'data': [...], 'next_cursor': str atau None, 'has_more': bool}
+        """
+        paginator = DashboardService._applicant_paginator('updated_at', sort, order)
+        transaksi_list = DashboardService._with_sort_fields(
+            DashboardService._history_queryset(search, status_filter)
+        )
+        page = HISTORY_APPLICANT_PROJECTION.paginate(paginator, transaksi_list, cursor, limit)
         
-        return result
+        return {
+            'data': page['items'],
+            'next_cursor': page['next_cursor'],
+            'has_more': page['has_more']
+        }
     
     @staticmethod
     def get_applicant_detail(id_transaksi):
@@ -365,13 +700,14 @@ class DashboardService:
         # CV info
         cv_url = None
         cv_filename = None
-        if pendaftar.path_cv and pendaftar.path_cv.name:
-            try:
-                cv_url = pendaftar.path_cv.url
-                cv_filename = pendaftar.path_cv.name.split('/')[-1]
-            except:
-                cv_url = None
-                cv_filename = 'CV tidak tersedia'
+        if pendaftar.cv_status == 'processing':
+            cv_filename = 'CV sedang diproses'
+        elif pendaftar.cv_status == 'invalid':
+            cv_filename = 'CV tidak valid'
+        elif pendaftar.path_cv and pendaftar.path_cv.name:
+            # Media hanya disajikan saat DEBUG, CV selalu lewat endpoint download yang terautentikasi
+            cv_url = reverse('api_pendaftar_cv', args=[transaksi.id_transaksi_pendaftaran])
+            cv_filename = _cv_filename(pendaftar.path_cv.name, pendaftar.cv_metadata)
         
         return {
             'id_transaksi': transaksi.id_transaksi_pendaftaran,
@@ -388,7 +724,34 @@ class DashboardService:
             'departemen': transaksi.lowongan.departement.nama_dept,
             'status': transaksi.status,
             'cv_url': cv_url,
-            'cv_filename': cv_filename
+            'cv_filename': cv_filename,
+            'cv_status': pendaftar.cv_status
+        }
+    
+    @staticmethod
+    def get_applicant_cv(id_transaksi):
+        """
+        File CV pendaftar untuk download reviewer
+        Returns:
+            dict: {'path': path absolut, 'filename': str, 'etag': str atau None},
+            atau None jika CV belum siap atau file tidak ada
+        Raises:
+            TransaksiPendaftaran.DoesNotExist
+        """
+        row = TransaksiPendaftaran.objects.values(
+            'pendaftar__path_cv', 'pendaftar__cv_status', 'pendaftar__cv_metadata'
+        ).get(id_transaksi_pendaftaran=id_transaksi)
+        name = row['pendaftar__path_cv']
+        if not name or row['pendaftar__cv_status'] != 'ready':
+            return None
+        path = cv_storage.path(name)
+        if not os.path.isfile(path):
+            return None
+        return {
+            'path': path,
+            'filename': _cv_filename(name, row['pendaftar__cv_metadata']),
+            # File content-addressed: hash isi sudah menjadi ETag yang kuat
+            'etag': digest_from_name(name),
         }
     
     @staticmethod
@@ -397,9 +760,109 @@ class DashboardService:
         if status not in ['approved', 'rejected']:
             raise ValueError('Status harus approved atau rejected')
         
-        transaksi = TransaksiPendaftaran.objects.get(id_transaksi_pendaftaran=id_transaksi)
-        transaksi.status = status
-        transaksi.updated_at = timezone.now()
-        transaksi.save()
+        with transaction.atomic():
+            transaksi = TransaksiPendaftaran.objects.select_for_update().get(id_transaksi_pendaftaran=id_transaksi)
+            old_status = transaksi.status
+            transaksi.status = status
+            transaksi.updated_at = timezone.now()
+            transaksi.save()
+            DashboardCounterService.record_status_change(old_status, status)
         
         return transaksi
+    
+    @staticmethod
+    def _bulk_status_queryset(ids=None, filters=None):
+        """Queryset transaksi untuk update status massal dari list id atau filter"""
+        if ids is not None:
+            if not isinstance(ids, list) or not ids:
+                raise ValueError('ids harus berupa list id_transaksi yang tidak kosong')
+            try:
+                ids = list(dict.fromkeys(int(id_transaksi) for id_transaksi in ids))
+            except (TypeError, ValueError):
+                raise ValueError('ids harus berisi angka')
+            if len(ids) > BULK_STATUS_MAX_ROWS:
+                raise ValueError(f'Maksimal {BULK_STATUS_MAX_ROWS} transaksi per permintaan')
+            return ids, TransaksiPendaftaran.objects.filter(id_transaksi_pendaftaran__in=ids)
+        
+        if not isinstance(filters, dict):
+            raise ValueError('ids atau filter wajib diisi')
+        unknown = set(filters) - set(BULK_STATUS_FILTERS)
+        if unknown:
+            raise ValueError(f"Filter tidak dikenal: {', '.join(sorted(unknown))}")
+        
+        current_status = filters.get('status') or 'pending'
+        if current_status not in ('pending', 'approved', 'rejected'):
+            raise ValueError('Filter status tidak valid')
+        queryset = TransaksiPendaftaran.objects.filter(status=current_status)
+        try:
+            if filters.get('id_lowongan') not in (None, ''):
+                queryset = queryset.filter(lowongan_id=int(filters['id_lowongan']))
+            if filters.get('ipk_lt') not in (None, ''):
+                queryset = queryset.filter(pendaftar__ipk__lt=Decimal(str(filters['ipk_lt'])))
+            if filters.get('ipk_gte') not in (None, ''):
+                queryset = queryset.filter(pendaftar__ipk__gte=Decimal(str(filters['ipk_gte'])))
+        except (TypeError, ValueError, ArithmeticError):
+            raise ValueError('Nilai filter tidak valid')
+        return None, queryset
+    
+    @staticmethod
+    def bulk_update_applicant_status(status, ids=None, filters=None):
+        """
+        Update status banyak pendaftar sekaligus (approve/reject massal).
+        Baris dikunci dan dibaca sekali, lalu diubah dengan satu UPDATE ... WHERE;
+        counter dashboard diperbarui sekali untuk semua transaksi.
+        Args:
+            status (str): 'approved' atau 'rejected'
+            ids (list): id_transaksi yang diubah
+            filters (dict): pengganti ids, misal {'id_lowongan': 3, 'ipk_lt': '3.00'};
+                status (status saat ini, default 'pending'), id_lowongan, ipk_lt, ipk_gte
+        Returns:
+            dict: {'updated': int, 'unchanged': int, 'not_found': int,
+                   'results': [{'id_transaksi', 'result', 'old_status'}]}
+                   result bernilai 'updated', 'unchanged' (status sudah sama) atau 'not_found'
+        Raises:
+            ValueError: status, ids atau filter tidak valid, atau terlalu banyak transaksi
+        """
+        # Import lokal: signals -> cache -> service
+        from .signals import invalidate_dashboard_cache
+        
+        if status not in ['approved', 'rejected']:
+            raise ValueError('Status harus approved atau rejected')
+        ids, queryset = DashboardService._bulk_status_queryset(ids, filters)
+        
+        with transaction.atomic():
+            current = dict(
+                queryset.select_for_update(of=('self',)).order_by('id_transaksi_pendaftaran')
+                .values_list('id_transaksi_pendaftaran', 'status')[:BULK_STATUS_MAX_ROWS + 1]
+            )
+            if len(current) > BULK_STATUS_MAX_ROWS:
+                raise ValueError(
+                    f'Filter mencakup lebih dari {BULK_STATUS_MAX_ROWS} transaksi, persempit filter'
+                )
+            
+            changed = [id_transaksi for id_transaksi, old_status in current.items() if old_status != status]
+            if changed:
+                TransaksiPendaftaran.objects.filter(id_transaksi_pendaftaran__in=changed).update(
+                    status=status, updated_at=timezone.now()
+                )
+                DashboardCounterService.record_bulk_status_change(Counter(current.values()), status)
+                # update() tidak memicu signal post_save
+                invalidate_dashboard_cache()
+        
+        results = []
+        for id_transaksi in (ids if ids is not None else current):
+            old_status = current.get(id_transaksi)
+            if old_status is None:
+                result = 'not_found'
+            elif old_status == status:
+                result = 'unchanged'
+            else:
+                result = 'updated'
+            results.append({'id_transaksi': id_transaksi, 'result': result, 'old_status': old_status})
+        
+        return {
+            'updated': len(changed),
+            'unchanged': len(current) - len(changed),
+            'not_found': sum(1 for item in results if item['result'] == 'not_found'),
+            'results': results,
+        }
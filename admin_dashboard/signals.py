@@ -0,0 +1,19 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from magang.models import Departement, Lowongan, Pendaftar, TransaksiPendaftaran
+from .cache import DashboardCache
+
+
+# post_delete sengaja tidak dipasang pada Pendaftar dan TransaksiPendaftaran:
+# listener delete membuat Django memuat setiap baris yang ikut terhapus CASCADE.
+# Penghapusan langsung pada tabel tersebut memanggil invalidate_dashboard_cache sendiri.
+@receiver(post_save, sender=Departement)
+@receiver(post_save, sender=Lowongan)
+@receiver(post_save, sender=Pendaftar)
+@receiver(post_save, sender=TransaksiPendaftaran)
+@receiver(post_delete, sender=Departement)
+@receiver(post_delete, sender=Lowongan)
+def invalidate_dashboard_cache(sender=None, **kwargs):
+    """Invalidasi cache dashboard setelah data sumber berubah dan transaksi di-commit"""
+    transaction.on_commit(DashboardCache.invalidate)
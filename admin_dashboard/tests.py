@@ -1,3 +1,978 @@
-from django.test import TestCase
+import csv
+import importlib.util
+import io
+import json
+import os
+import shutil
+import tempfile
+from datetime import timedelta
+from decimal import Decimal
+from unittest import mock
 
-# Create your tests here.
+from django.apps import apps as django_apps
+from django.contrib.auth import get_user_model
+from django.core.cache import caches
+from django.core.exceptions import ImproperlyConfigured
+from django.core.files.base import ContentFile
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from config.settings.database import postgres_database
+from magang.models import Departement, Lowongan, Pendaftar, TransaksiPendaftaran
+from magang.services.lowongan_service import LowonganService
+from magang.services.pendaftaran_service import PendaftaranService
+from magang.services.transaksi_pendaftaran_service import TransaksiPendaftaranService
+from magang.storage import cv_storage
+from .benchmark import EndpointBenchmark, compare_with_baseline, percentile
+from .cache import CachedDashboardService, DashboardCache
+from .counter_service import DashboardCounterService
+from .metrics import ServiceMetrics
+from .middleware import QueryTracker, RequestMetrics
+from .profiling import PROFILE_QUERY_PARAM, ProfileStore
+from .models import DashboardCounter
+from .service import DashboardService
+
+
+class DashboardDataMixin:
+    """Helper untuk membuat data dummy dashboard"""
+
+    def create_departement(self, nama='Engineering'):
+        return Departement.objects.create(nama_dept=nama)
+
+    def create_lowongan(self, departement, posisi='Software Engineering Intern', aktif=True):
+        today = timezone.now().date()
+        selesai = today + timedelta(days=30) if aktif else today - timedelta(days=1)
+        return Lowongan.objects.create(
+            posisi=posisi,
+            deskripsi='Deskripsi lowongan',
+            tanggal_mulai=today - timedelta(days=60),
+            tanggal_selesai=selesai,
+            departement=departement
+        )
+
+    def create_pendaftar(self, lowongan, nik, status='pending', name='Budi Santoso',
+                         university='Universitas Indonesia', ipk='3.50'):
+        pendaftar = Pendaftar.objects.create(
+            lowongan=lowongan,
+            nik=nik,
+            name=name,
+            gender='L',
+            dob='2000-01-01',
+            address='Jl. Sudirman No. 1',
+            no_telp='081234567890',
+            university=university,
+            major='Teknik Informatika',
+            path_cv='cv/dummy.pdf',
+            ipk=ipk
+        )
+        transaksi = TransaksiPendaftaran.objects.create(
+            pendaftar=pendaftar,
+            lowongan=lowongan,
+            status=status
+        )
+        return pendaftar, transaksi
+
+
+class GetStatisticsTest(DashboardDataMixin, TestCase):
+    """Test untuk DashboardService.get_statistics"""
+
+    def setUp(self):
+        engineering = self.create_departement('Engineering')
+        marketing = self.create_departement('Marketing')
+        legal = self.create_departement('Legal')
+
+        lowongan_eng = self.create_lowongan(engineering)
+        self.create_lowongan(engineering, posisi='DevOps Intern')
+        lowongan_mkt = self.create_lowongan(marketing, posisi='Digital Marketing Intern')
+        self.create_lowongan(legal, posisi='Legal Research Intern', aktif=False)
+
+        self.create_pendaftar(lowongan_eng, '3273010101950001', 'pending')
+        self.create_pendaftar(lowongan_eng, '3273010101950002', 'approved')
+        self.create_pendaftar(lowongan_mkt, '3273010101950003', 'approved')
+        old, _ = self.create_pendaftar(lowongan_mkt, '3273010101950004', 'rejected')
+        Pendaftar.objects.filter(pk=old.pk).update(created_at=timezone.now() - timedelta(days=60))
+        DashboardCounterService.rebuild()
+
+    def test_statistics_values(self):
+        stats = DashboardService.get_statistics()
+
+        self.assertEqual(stats['total_pendaftar'], 4)
+        self.assertEqual(stats['lowongan_aktif'], 3)
+        self.assertEqual(stats['dept_aktif'], 2)
+        self.assertEqual(stats['menunggu_review'], 1)
+        self.assertEqual(stats['total_approved'], 2)
+        self.assertEqual(stats['tingkat_penerimaan'], 50)
+        self.assertEqual(stats['persentase_perubahan'], 200)
+
+    def test_statistics_query_count(self):
+        # Satu query ke rollup counter dan satu query agregasi lowongan
+        with self.assertNumQueries(2):
+            DashboardService.get_statistics()
+
+    def test_statistics_empty(self):
+        TransaksiPendaftaran.objects.all().delete()
+        Pendaftar.objects.all().delete()
+        DashboardCounterService.rebuild()
+
+        stats = DashboardService.get_statistics()
+
+        self.assertEqual(stats['total_pendaftar'], 0)
+        self.assertEqual(stats['tingkat_penerimaan'], 0)
+        self.assertEqual(stats['persentase_perubahan'], 0)
+
+
+class GetTrendDataTest(DashboardDataMixin, TestCase):
+    """Test untuk DashboardService.get_trend_data"""
+
+    def setUp(self):
+        lowongan = self.create_lowongan(self.create_departement())
+        now = timezone.now()
+        for i, days_ago in enumerate([0, 0, 1, 5, 13, 40]):
+            pendaftar, _ = self.create_pendaftar(lowongan, f'32730101019500{i:02d}')
+            Pendaftar.objects.filter(pk=pendaftar.pk).update(created_at=now - timedelta(days=days_ago))
+        DashboardCounterService.rebuild()
+
+    def test_default_bucket(self):
+        trend = DashboardService.get_trend_data()
+
+        self.assertEqual(len(trend['labels']), 8)
+        self.assertEqual(trend['labels'][-1], timezone.localdate().strftime('%d %b'))
+        self.assertEqual(trend['data'][-1], 3)
+        self.assertEqual(sum(trend['data']), 5)
+
+    def test_daily_bucket_fills_empty_days(self):
+        trend = DashboardService.get_trend_data(days=7, bucket='day')
+
+        self.assertEqual(trend['data'], [0, 1, 0, 0, 0, 1, 2])
+
+    def test_weekly_and_n_day_bucket(self):
+        self.assertEqual(DashboardService.get_trend_data(days=14, bucket='week')['data'], [1, 4])
+        self.assertEqual(DashboardService.get_trend_data(days=6, bucket='3d')['data'], [1, 3])
+
+    def test_long_range_single_query(self):
+        with self.assertNumQueries(1):
+            trend = DashboardService.get_trend_data(days=365, bucket='day')
+
+        self.assertEqual(len(trend['data']), 365)
+        self.assertEqual(sum(trend['data']), 6)
+
+    def test_invalid_bucket(self):
+        with self.assertRaises(ValueError):
+            DashboardService.get_trend_data(days=30, bucket='month')
+        with self.assertRaises(ValueError):
+            DashboardService.get_trend_data(days=0)
+
+
+class DashboardCounterTest(DashboardDataMixin, TestCase):
+    """Test rollup counter dashboard tetap konsisten dengan tabel sumber"""
+
+    def setUp(self):
+        self.engineering = self.create_departement('Engineering')
+        self.marketing = self.create_departement('Marketing')
+        self.lowongan_eng = self.create_lowongan(self.engineering)
+        self.lowongan_mkt = self.create_lowongan(self.marketing, posisi='Digital Marketing Intern')
+
+    def snapshot(self):
+        return sorted(
+            (scope, key, value)
+            for scope, key, value in DashboardCounter.objects.values_list('scope', 'key', 'value')
+            if value
+        )
+
+    def assertCountersConsistent(self):
+        incremental = self.snapshot()
+        DashboardCounterService.rebuild()
+        self.assertEqual(incremental, self.snapshot())
+
+    def daftar(self, nik, lowongan):
+        result = PendaftaranService.create_pendaftaran({
+            'id_lowongan': lowongan.id_lowongan,
+            'nik': nik,
+            'name': 'Siti Nurhaliza',
+            'gender': 'P',
+            'dob': '2000-02-02',
+            'address': 'Jl. Gatot Subroto No. 45',
+            'no_telp': '081234567891',
+            'university': 'Institut Teknologi Bandung',
+            'major': 'Teknik Informatika',
+            'ipk': '3.78',
+            'path_cv': 'cv/dummy.pdf',
+        })
+        self.assertTrue(result['success'], result['message'])
+        return result['transaksi']
+
+    def test_counters_follow_writes(self):
+        transaksi = self.daftar('3174020202960001', self.lowongan_eng)
+        self.daftar('3174020202960002', self.lowongan_eng)
+        self.daftar('3174020202960001', self.lowongan_mkt)
+        self.assertCountersConsistent()
+
+        DashboardService.update_applicant_status(transaksi.id_transaksi_pendaftaran, 'approved')
+        TransaksiPendaftaranService.update_status_transaksi(transaksi.id_transaksi_pendaftaran, 'rejected')
+        self.assertCountersConsistent()
+
+        stats = DashboardService.get_statistics()
+        self.assertEqual(stats['total_pendaftar'], 2)
+        self.assertEqual(stats['menunggu_review'], 2)
+
+        distribution = DashboardService.get_department_distribution()
+        self.assertEqual(distribution['labels'], ['Engineering', 'Marketing'])
+        self.assertEqual(distribution['data'], [2, 1])
+
+    def test_counters_follow_lowongan_update_and_deletes(self):
+        transaksi = self.daftar('3174020202960001', self.lowongan_eng)
+        self.daftar('3174020202960002', self.lowongan_mkt)
+        self.daftar('3174020202960002', self.lowongan_eng)
+
+        DashboardService.update_lowongan(self.lowongan_eng.id_lowongan, {
+            'posisi': self.lowongan_eng.posisi,
+            'tanggal_mulai': self.lowongan_eng.tanggal_mulai,
+            'tanggal_selesai': self.lowongan_eng.tanggal_selesai,
+            'departemen_id': self.marketing.id_dept,
+        })
+        self.assertCountersConsistent()
+
+        TransaksiPendaftaranService.delete_transaksi(transaksi.id_transaksi_pendaftaran)
+        self.assertCountersConsistent()
+
+        DashboardService.delete_lowongan(self.lowongan_mkt.id_lowongan)
+        self.assertCountersConsistent()
+
+        DashboardService.delete_departemen(self.marketing.id_dept)
+        self.assertCountersConsistent()
+        self.assertEqual(DashboardService.get_statistics()['total_pendaftar'], 0)
+
+    def test_migration_fills_counters_of_existing_data(self):
+        self.create_pendaftar(self.lowongan_eng, '3174020202960001', 'approved')
+        self.create_pendaftar(self.lowongan_mkt, '3174020202960002')
+        DashboardCounterService.rebuild()
+        expected = self.snapshot()
+
+        # Deployment lama: tabel counter kosong sebelum migrasi data dijalankan
+        DashboardCounter.objects.exclude(scope=DashboardCounter.SCOPE_VERSI).delete()
+        rebuild_migration = importlib.import_module('admin_dashboard.migrations.0003_rebuild_dashboard_counters')
+        rebuild_migration.rebuild_counters(django_apps, None)
+        self.assertEqual(self.snapshot(), expected)
+        self.assertEqual(DashboardService.get_statistics()['total_pendaftar'], 2)
+
+
+class DashboardCacheTest(DashboardDataMixin, TestCase):
+    """Test cache dashboard dan invalidasi berbasis signal"""
+
+    def setUp(self):
+        caches[DashboardCache.ALIAS].clear()
+        DashboardCache.reset_stats()
+        self.departement = self.create_departement('Engineering')
+        self.create_lowongan(self.departement)
+        DashboardCounterService.rebuild()
+
+    def test_second_read_served_from_cache(self):
+        first = CachedDashboardService.get_statistics()
+        with self.assertNumQueries(0):
+            second = CachedDashboardService.get_statistics()
+
+        self.assertEqual(first, second)
+        stats = DashboardCache.get_stats()
+        self.assertEqual((stats['hits'], stats['misses']), (1, 1))
+
+    def test_arguments_are_part_of_key(self):
+        CachedDashboardService.get_trend_data(30, 'day')
+        with self.assertNumQueries(1):
+            CachedDashboardService.get_trend_data(60, 'day')
+
+    def test_model_save_invalidates_cache(self):
+        self.assertEqual(CachedDashboardService.get_statistics()['lowongan_aktif'], 1)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.create_lowongan(self.departement, posisi='DevOps Intern')
+
+        self.assertEqual(CachedDashboardService.get_statistics()['lowongan_aktif'], 2)
+        self.assertEqual(DashboardCache.get_stats()['invalidations'], 1)
+
+
+class DashboardBootstrapTest(DashboardDataMixin, TestCase):
+    """Test endpoint gabungan data dashboard"""
+
+    def setUp(self):
+        caches[DashboardCache.ALIAS].clear()
+        lowongan = self.create_lowongan(self.create_departement('Engineering'))
+        self.create_pendaftar(lowongan, '3273010101950001', 'pending')
+        self.create_pendaftar(lowongan, '3273010101950002', 'approved')
+        DashboardCounterService.rebuild()
+
+        User = get_user_model()
+        self.admin = User.objects.create_user('admin', password='password', is_staff=True)
+
+    def test_bootstrap_matches_individual_methods(self):
+        with self.assertNumQueries(4):
+            data = DashboardService.get_dashboard_bootstrap(days=30, limit=10)
+
+        self.assertEqual(data['stats'], DashboardService.get_statistics())
+        self.assertEqual(data['trend'], DashboardService.get_trend_data(30))
+        self.assertEqual(data['department'], DashboardService.get_department_distribution())
+        self.assertEqual(data['recent_applicants'], DashboardService.get_recent_applicants(10))
+
+    def test_bootstrap_endpoint(self):
+        self.client.force_login(self.admin)
+        response = self.client.get('/dashboard/api/bootstrap/?days=14&bucket=week&limit=1')
+
+        self.assertEqual(response.status_code, 200)
+        data = response.json()['data']
+        self.assertEqual(data['stats']['total_pendaftar'], 2)
+        self.assertEqual(len(data['trend']['data']), 2)
+        self.assertEqual(data['department']['labels'], ['Engineering'])
+        self.assertEqual(len(data['recent_applicants']), 1)
+
+    def test_bootstrap_requires_staff(self):
+        response = self.client.get('/dashboard/api/bootstrap/')
+
+        self.assertEqual(response.status_code, 302)
+
+
+class ApplicantPaginationTest(DashboardDataMixin, TestCase):
+    """Test keyset pagination dan sorting daftar pendaftar"""
+
+    def setUp(self):
+        lowongan = self.create_lowongan(self.create_departement('Engineering'))
+        universities = ['UGM', 'ITB', 'UI']
+        ipks = ['3.90', '3.20', None, '3.20']
+        for i in range(12):
+            self.create_pendaftar(
+                lowongan, f'32730101019500{i:02d}', 'pending', name=f'Pendaftar {i}',
+                university=universities[i % 3], ipk=ipks[i % 4]
+            )
+        for i in range(12, 19):
+            self.create_pendaftar(
+                lowongan, f'32730101019500{i:02d}', 'approved' if i % 2 else 'rejected',
+                name=f'Pendaftar {i}', university=universities[i % 3]
+            )
+        # Banyak baris dengan created_at sama untuk menguji pemecah seri
+        TransaksiPendaftaran.objects.filter(pk__lte=6).update(created_at=timezone.now() - timedelta(days=3))
+        DashboardCounterService.rebuild()
+
+        User = get_user_model()
+        self.admin = User.objects.create_user('admin', password='password', is_staff=True)
+        self.client.force_login(self.admin)
+
+    def fetch_all(self, url):
+        ids = []
+        cursor = None
+        while True:
+            page_url = f'{url}&cursor={cursor}' if cursor else url
+            result = self.client.get(page_url).json()
+            self.assertTrue(result['success'])
+            ids += [item['id_transaksi'] for item in result['data']]
+            cursor = result['next_cursor']
+            if not result['has_more']:
+                return ids
+
+    def test_pending_pages_follow_sort(self):
+        expected = {
+            'sort=date&order=desc': ['-created_at', '-id_transaksi_pendaftaran'],
+            'sort=date&order=asc': ['created_at', 'id_transaksi_pendaftaran'],
+            'sort=university&order=asc': ['pendaftar__university', 'id_transaksi_pendaftaran'],
+        }
+        for params, ordering in expected.items():
+            ids = self.fetch_all(f'/dashboard/api/pendaftar/pending/?limit=5&{params}')
+            self.assertEqual(ids, list(
+                TransaksiPendaftaran.objects.filter(status='pending')
+                .order_by(*ordering).values_list('id_transaksi_pendaftaran', flat=True)
+            ))
+
+    def test_ipk_sort_puts_empty_ipk_last(self):
+        ids = self.fetch_all('/dashboard/api/pendaftar/pending/?limit=4&sort=ipk')
+
+        self.assertEqual(len(ids), 12)
+        ipks = [Pendaftar.objects.get(transaksi_pendaftaran=pk).ipk for pk in ids]
+        self.assertEqual([str(ipk) for ipk in ipks[:3]], ['3.90'] * 3)
+        self.assertEqual(ipks[-3:], [None] * 3)
+
+    def test_history_with_status_filter(self):
+        ids = self.fetch_all('/dashboard/api/pendaftar/history/?limit=2&status=approved')
+
+        self.assertEqual(ids, list(
+            TransaksiPendaftaran.objects.filter(status='approved')
+            .order_by('-updated_at', '-id_transaksi_pendaftaran').values_list('id_transaksi_pendaftaran', flat=True)
+        ))
+
+    def test_total_pending_from_counter(self):
+        result = self.client.get('/dashboard/api/pendaftar/pending/?limit=5').json()
+
+        self.assertEqual(len(result['data']), 5)
+        self.assertEqual(result['total_pending'], 12)
+
+    def test_invalid_parameters(self):
+        for params in ['sort=nama', 'order=up', 'cursor=rusak', 'limit=0']:
+            response = self.client.get(f'/dashboard/api/pendaftar/pending/?{params}')
+            self.assertEqual(response.status_code, 400, params)
+
+        # Cursor dari urutan lain tidak boleh dipakai
+        cursor = self.client.get('/dashboard/api/pendaftar/pending/?limit=1').json()['next_cursor']
+        response = self.client.get(f'/dashboard/api/pendaftar/pending/?sort=ipk&cursor={cursor}')
+        self.assertEqual(response.status_code, 400)
+
+
+class ProjectionSerializationTest(DashboardDataMixin, TestCase):
+    """Test serialisasi values() untuk API dashboard"""
+
+    def setUp(self):
+        self.lowongan = self.create_lowongan(self.create_departement('Engineering'))
+        self.pendaftar, self.transaksi = self.create_pendaftar(self.lowongan, '3273010101950001', name='Siti Nur Aisyah')
+
+    def test_pending_applicants_single_query(self):
+        with self.assertNumQueries(1):
+            data = DashboardService.get_pending_applicants()
+
+        self.assertEqual(data, [{
+            'id_transaksi': self.transaksi.id_transaksi_pendaftaran,
+            'nama': 'Siti Nur Aisyah',
+            'nik': '3273010101950001',
+            'posisi': self.lowongan.posisi,
+            'departemen': 'Engineering',
+            'universitas': 'Universitas Indonesia',
+            'jurusan': 'Teknik Informatika',
+            'ipk': Decimal('3.50'),
+            'tanggal_daftar': self.transaksi.created_at.strftime('%d %b %Y')
+        }])
+
+    def test_recent_applicants_and_lowongan(self):
+        recent = DashboardService.get_recent_applicants(5)
+        self.assertEqual(recent[0]['initials'], 'SN')
+        self.assertEqual(recent[0]['date'], self.transaksi.created_at.strftime('%d %b %Y'))
+
+        with self.assertNumQueries(1):
+            lowongan = DashboardService.get_all_lowongan()
+        self.assertEqual(lowongan[0]['departemen_id'], self.lowongan.departement_id)
+        self.assertEqual(lowongan[0]['status'], 'Aktif')
+        self.assertEqual(lowongan[0]['tanggal_mulai'], self.lowongan.tanggal_mulai.strftime('%Y-%m-%d'))
+
+
+class GetAllDepartemenTest(DashboardDataMixin, TestCase):
+    """Test untuk DashboardService.get_all_departemen"""
+
+    def test_counts(self):
+        engineering = self.create_departement('Engineering')
+        self.create_departement('Legal')
+        lowongan = self.create_lowongan(engineering)
+        self.create_lowongan(engineering, posisi='DevOps Intern', aktif=False)
+        self.create_pendaftar(lowongan, '3273010101950001')
+        self.create_pendaftar(lowongan, '3273010101950002')
+
+        result = DashboardService.get_all_departemen()
+
+        self.assertEqual(result, [
+            {'id': engineering.id_dept, 'nama_dept': 'Engineering', 'jumlah_lowongan': 2,
+             'jumlah_lowongan_aktif': 1, 'jumlah_pendaftar': 2},
+            {'id': result[1]['id'], 'nama_dept': 'Legal', 'jumlah_lowongan': 0,
+             'jumlah_lowongan_aktif': 0, 'jumlah_pendaftar': 0},
+        ])
+        self.assertEqual(DashboardService.get_all_departemen('eng')[0]['nama_dept'], 'Engineering')
+
+    def test_constant_query_count(self):
+        Departement.objects.bulk_create([Departement(nama_dept=f'Dept {i:04d}') for i in range(2000)])
+        lowongan = self.create_lowongan(Departement.objects.first())
+        self.create_pendaftar(lowongan, '3273010101950001')
+
+        with self.assertNumQueries(1):
+            result = DashboardService.get_all_departemen()
+
+        self.assertEqual(len(result), 2000)
+        self.assertEqual(sum(dept['jumlah_pendaftar'] for dept in result), 1)
+
+
+class CvDownloadTest(DashboardDataMixin, TestCase):
+    """Test endpoint download CV untuk reviewer"""
+
+    CONTENT = b'%PDF-1.4\n' + bytes(range(256)) * 40 + b'\n%%EOF\n'
+
+    def setUp(self):
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root, ignore_errors=True)
+        override = override_settings(MEDIA_ROOT=media_root)
+        override.enable()
+        self.addCleanup(override.disable)
+
+        lowongan = self.create_lowongan(self.create_departement())
+        self.pendaftar, self.transaksi = self.create_pendaftar(lowongan, '3273010101950001')
+        name = cv_storage.save('cv/upload.pdf', ContentFile(self.CONTENT))
+        Pendaftar.objects.filter(pk=self.pendaftar.pk).update(
+            path_cv=name, cv_metadata={'original_name': 'CV Budi.pdf'}
+        )
+        self.url = f'/dashboard/api/pendaftar/{self.transaksi.id_transaksi_pendaftaran}/cv/'
+
+        User = get_user_model()
+        self.client.force_login(User.objects.create_user('admin', password='password', is_staff=True))
+
+    def test_requires_staff(self):
+        self.client.logout()
+        self.assertEqual(self.client.get(self.url).status_code, 302)
+
+    def test_full_download_and_detail_link(self):
+        response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(b''.join(response.streaming_content), self.CONTENT)
+        self.assertEqual(response['Content-Type'], 'application/pdf')
+        self.assertEqual(response['Accept-Ranges'], 'bytes')
+        self.assertIn('CV Budi.pdf', response['Content-Disposition'])
+        self.assertIn('private', response['Cache-Control'])
+
+        detail = DashboardService.get_applicant_detail(self.transaksi.id_transaksi_pendaftaran)
+        self.assertEqual(detail['cv_url'], self.url)
+        self.assertEqual(detail['cv_filename'], 'CV Budi.pdf')
+
+    def test_range_requests(self):
+        size = len(self.CONTENT)
+        response = self.client.get(self.url, HTTP_RANGE='bytes=5-14')
+        self.assertEqual(response.status_code, 206)
+        self.assertEqual(response['Content-Range'], f'bytes 5-14/{size}')
+        self.assertEqual(b''.join(response.streaming_content), self.CONTENT[5:15])
+
+        response = self.client.get(self.url, HTTP_RANGE='bytes=-7')
+        self.assertEqual(b''.join(response.streaming_content), self.CONTENT[-7:])
+
+        response = self.client.get(self.url, HTTP_RANGE=f'bytes={size}-')
+        self.assertEqual(response.status_code, 416)
+        self.assertEqual(response['Content-Range'], f'bytes */{size}')
+
+    def test_conditional_requests(self):
+        etag = self.client.get(self.url)['ETag']
+
+        self.assertEqual(self.client.get(self.url, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+        # If-Range dengan versi lama: kirim file utuh, bukan potongan
+        response = self.client.get(self.url, HTTP_RANGE='bytes=0-9', HTTP_IF_RANGE='"versi-lama"')
+        self.assertEqual(response.status_code, 200)
+        response = self.client.get(self.url, HTTP_RANGE='bytes=0-9', HTTP_IF_RANGE=etag)
+        self.assertEqual(response.status_code, 206)
+
+    @override_settings(CV_DOWNLOAD_SENDFILE='x-accel-redirect', CV_DOWNLOAD_ACCEL_PREFIX='/protected-media/')
+    def test_accel_redirect(self):
+        response = self.client.get(self.url)
+
+        path = Pendaftar.objects.get(pk=self.pendaftar.pk).path_cv.name
+        self.assertEqual(response['X-Accel-Redirect'], f'/protected-media/{path}')
+        self.assertEqual(response['Content-Type'], 'application/pdf')
+        self.assertEqual(response.content, b'')
+
+    def test_cv_not_ready(self):
+        Pendaftar.objects.filter(pk=self.pendaftar.pk).update(cv_status='processing')
+        self.assertEqual(self.client.get(self.url).status_code, 404)
+        self.assertEqual(self.client.get('/dashboard/api/pendaftar/999/cv/').status_code, 404)
+
+
+class ApplicantExportTest(DashboardDataMixin, TestCase):
+    """Test export pendaftar CSV/XLSX"""
+
+    def setUp(self):
+        lowongan = self.create_lowongan(self.create_departement())
+        self.create_pendaftar(lowongan, '3273010101950001', 'pending', name='Budi Santoso', ipk='3.10')
+        self.create_pendaftar(lowongan, '3273010101950002', 'pending', name='Siti Aminah', ipk='3.90')
+        self.create_pendaftar(lowongan, '3273010101950003', 'approved', name='Andi Wijaya')
+        self.create_pendaftar(lowongan, '3273010101950004', 'rejected', name='=HYPERLINK("x")')
+
+        User = get_user_model()
+        self.client.force_login(User.objects.create_user('admin', password='password', is_staff=True))
+
+    def export(self, **params):
+        response = self.client.get('/dashboard/api/pendaftar/export/', params)
+        self.assertEqual(response.status_code, 200)
+        content = b''.join(response.streaming_content).decode('utf-8-sig')
+        return list(csv.reader(io.StringIO(content)))
+
+    def test_csv_follows_list_filters(self):
+        rows = self.export(scope='pending', sort='ipk', order='desc')
+        self.assertEqual(rows[0][:3], ['ID Transaksi', 'NIK', 'Nama'])
+        self.assertEqual([row[2] for row in rows[1:]], ['Siti Aminah', 'Budi Santoso'])
+        self.assertEqual(rows[1][9], '3.90')
+
+        rows = self.export(scope='history', status='approved')
+        self.assertEqual([row[2] for row in rows[1:]], ['Andi Wijaya'])
+
+        rows = self.export(search='budi')
+        self.assertEqual([row[2] for row in rows[1:]], ['Budi Santoso'])
+
+    def test_csv_escapes_formulas(self):
+        rows = self.export(scope='history', status='rejected')
+        self.assertEqual(rows[1][2], '\'=HYPERLINK("x")')
+
+    def test_export_streamed_from_single_query(self):
+        header, rows = DashboardService.iter_applicant_export(scope='all')
+        with self.assertNumQueries(1):
+            self.assertEqual(len(list(rows)), 4)
+        self.assertEqual(len(header), 15)
+
+        response = self.client.get('/dashboard/api/pendaftar/export/')
+        self.assertTrue(response.streaming)
+        self.assertIn('attachment', response['Content-Disposition'])
+
+    def test_invalid_parameters(self):
+        for params in ({'scope': 'semua'}, {'format': 'pdf'}, {'scope': 'pending', 'status': 'approved'}):
+            response = self.client.get('/dashboard/api/pendaftar/export/', params)
+            self.assertEqual(response.status_code, 400)
+
+    def test_xlsx_requires_openpyxl(self):
+        from . import exports
+        response = self.client.get('/dashboard/api/pendaftar/export/', {'format': 'xlsx'})
+        if exports.openpyxl is None:
+            self.assertEqual(response.status_code, 400)
+            self.assertIn('openpyxl', response.json()['message'])
+        else:
+            self.assertEqual(response.status_code, 200)
+
+    def test_xlsx_row_limit(self):
+        from . import exports
+        with mock.patch.object(exports, 'openpyxl', mock.MagicMock()):
+            with override_settings(EXPORT_XLSX_MAX_ROWS=3):
+                response = self.client.get('/dashboard/api/pendaftar/export/', {'format': 'xlsx'})
+                self.assertEqual(response.status_code, 400)
+                self.assertIn('csv', response.json()['message'])
+            with override_settings(EXPORT_XLSX_MAX_ROWS=4):
+                response = self.client.get('/dashboard/api/pendaftar/export/', {'format': 'xlsx'})
+                self.assertEqual(response.status_code, 200)
+
+
+class BulkStatusUpdateTest(DashboardDataMixin, TestCase):
+    """Test approve/reject massal"""
+
+    def setUp(self):
+        departement = self.create_departement()
+        self.lowongan = self.create_lowongan(departement)
+        other = self.create_lowongan(departement, posisi='Data Analyst Intern')
+        _, self.low_ipk = self.create_pendaftar(self.lowongan, '3273010101950001', ipk='2.80')
+        _, self.high_ipk = self.create_pendaftar(self.lowongan, '3273010101950002', ipk='3.60')
+        _, self.approved = self.create_pendaftar(self.lowongan, '3273010101950003', 'approved', ipk='2.50')
+        _, self.other = self.create_pendaftar(other, '3273010101950004', ipk='2.90')
+        DashboardCounterService.rebuild()
+
+        User = get_user_model()
+        self.client.force_login(User.objects.create_user('admin', password='password', is_staff=True))
+
+    def post(self, body):
+        return self.client.post(
+            '/dashboard/api/pendaftar/bulk-update-status/', body, content_type='application/json'
+        )
+
+    def assertCountersConsistent(self):
+        incremental = sorted(DashboardCounter.objects.filter(value__gt=0).values_list('scope', 'key', 'value'))
+        DashboardCounterService.rebuild()
+        self.assertEqual(incremental, sorted(DashboardCounter.objects.filter(value__gt=0).values_list('scope', 'key', 'value')))
+
+    def test_ids_with_per_id_results(self):
+        ids = [self.low_ipk.pk, self.approved.pk, 999999]
+        response = self.post({'status': 'approved', 'ids': ids})
+        self.assertEqual(response.status_code, 200)
+        data = response.json()['data']
+        self.assertEqual((data['updated'], data['unchanged'], data['not_found']), (1, 1, 1))
+        self.assertEqual(
+            [(item['id_transaksi'], item['result']) for item in data['results']],
+            [(self.low_ipk.pk, 'updated'), (self.approved.pk, 'unchanged'), (999999, 'not_found')]
+        )
+        self.low_ipk.refresh_from_db()
+        self.assertEqual(self.low_ipk.status, 'approved')
+        self.assertCountersConsistent()
+
+    def test_filter_by_lowongan_and_ipk(self):
+        result = DashboardService.bulk_update_applicant_status(
+            'rejected', filters={'id_lowongan': self.lowongan.pk, 'ipk_lt': '3.00'}
+        )
+        self.assertEqual([item['id_transaksi'] for item in result['results']], [self.low_ipk.pk])
+        self.assertEqual(
+            dict(TransaksiPendaftaran.objects.values_list('id_transaksi_pendaftaran', 'status')),
+            {self.low_ipk.pk: 'rejected', self.high_ipk.pk: 'pending',
+             self.approved.pk: 'approved', self.other.pk: 'pending'}
+        )
+        self.assertCountersConsistent()
+
+    def test_query_count_independent_of_size(self):
+        ids = [self.create_pendaftar(self.lowongan, f'32730101019600{i:02d}')[1].pk for i in range(30)]
+        # Savepoint, kunci + baca, satu UPDATE transaksi, satu UPDATE counter, release
+        with self.assertNumQueries(5):
+            DashboardService.bulk_update_applicant_status('approved', ids=ids[:2])
+        with self.assertNumQueries(5):
+            DashboardService.bulk_update_applicant_status('approved', ids=ids[2:])
+
+    def test_invalid_requests(self):
+        for body in ({'status': 'pending', 'ids': [1]}, {'status': 'approved'},
+                     {'status': 'approved', 'ids': ['x']},
+                     {'status': 'approved', 'filter': {'ipk_lt': 'tiga'}},
+                     {'status': 'approved', 'filter': {'nama': 'budi'}}):
+            self.assertEqual(self.post(body).status_code, 400, body)
+        self.assertFalse(TransaksiPendaftaran.objects.exclude(status='pending').exclude(pk=self.approved.pk).exists())
+
+
+class EndpointBenchmarkTest(DashboardDataMixin, TestCase):
+    """Test benchmark endpoint HTTP"""
+
+    def setUp(self):
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root, ignore_errors=True)
+        override = override_settings(MEDIA_ROOT=media_root, CV_STAGING_DIR=os.path.join(media_root, 'staging'))
+        override.enable()
+        self.addCleanup(override.disable)
+
+        lowongan = self.create_lowongan(self.create_departement())
+        self.create_pendaftar(lowongan, '3273010101950001')
+        self.create_pendaftar(lowongan, '3273010101950002', 'approved')
+        DashboardCounterService.rebuild()
+
+    def test_all_scenarios_succeed_and_cleanup(self):
+        original_updated_at = dict(TransaksiPendaftaran.objects.values_list('id_transaksi_pendaftaran', 'updated_at'))
+        benchmark = EndpointBenchmark(writes=True)
+        benchmark.setup()
+        scenarios = benchmark.scenarios()
+        results = [benchmark.run_scenario(scenario, requests=2, concurrency=1, warmup=0) for scenario in scenarios]
+        self.assertEqual({row['name']: row['errors'] for row in results if row['errors']}, {})
+        for row in results:
+            self.assertLessEqual(row['p50'], row['p95'])
+            self.assertGreater(row['max_queries'], 0)
+
+        # Semua route API tercakup kecuali yang membuat/menghapus data
+        uncovered = {route for route, _ in benchmark.uncovered_routes(scenarios)}
+        self.assertEqual(uncovered, set(EndpointBenchmark.SKIPPED_ROUTES))
+
+        self.assertEqual(benchmark.cleanup(), 2)
+        self.assertEqual(Pendaftar.objects.count(), 2)
+        # updated_at yang ditulis ulang skenario update status dikembalikan
+        self.assertEqual(
+            dict(TransaksiPendaftaran.objects.values_list('id_transaksi_pendaftaran', 'updated_at')),
+            original_updated_at
+        )
+        self.assertFalse(get_user_model().objects.filter(username__startswith='benchmark-').exists())
+        incremental = sorted(DashboardCounter.objects.filter(value__gt=0).values_list('scope', 'key', 'value'))
+        DashboardCounterService.rebuild()
+        self.assertEqual(incremental, sorted(DashboardCounter.objects.filter(value__gt=0).values_list('scope', 'key', 'value')))
+
+    def test_writes_are_opt_in(self):
+        benchmark = EndpointBenchmark()
+        scenarios = benchmark.scenarios()
+        self.assertTrue(all(scenario.get('method', 'get') == 'get' for scenario in scenarios))
+        reasons = dict(benchmark.uncovered_routes(scenarios))
+        self.assertEqual(reasons['api_pendaftar_update_status'], 'tanpa --writes')
+
+    def test_percentile_and_regression_check(self):
+        values = list(range(1, 101))
+        self.assertEqual([percentile(values, pct) for pct in (50, 95, 99)], [50, 95, 99])
+        self.assertEqual(percentile([], 95), 0.0)
+
+        baseline = {'results': [{'name': 'stats', 'p95': 10.0, 'max_queries': 2}]}
+        self.assertEqual(compare_with_baseline([{'name': 'stats', 'p95': 11.5, 'max_queries': 2}], baseline, 0.2), [])
+        failures = compare_with_baseline([{'name': 'stats', 'p95': 13.0, 'max_queries': 3}], baseline, 0.2)
+        self.assertEqual(len(failures), 2)
+
+
+@override_settings(REQUEST_METRICS_ENABLED=True, REQUEST_METRICS_SERVER_TIMING='staff',
+                   REQUEST_METRICS_N_PLUS_ONE_THRESHOLD=3)
+class RequestMetricsTest(DashboardDataMixin, TestCase):
+    """Test middleware instrumentasi query dan waktu per request"""
+
+    def setUp(self):
+        RequestMetrics.reset()
+        self.addCleanup(RequestMetrics.reset)
+        self.departement = self.create_departement()
+        self.create_lowongan(self.departement)
+        DashboardCounterService.rebuild()
+        self.admin = get_user_model().objects.create_user('admin', password='secret', is_staff=True)
+
+    def test_tracker_detects_duplicates_and_n_plus_one(self):
+        tracker = QueryTracker()
+        with connection.execute_wrapper(tracker):
+            for _ in range(2):
+                Departement.objects.filter(pk=self.departement.pk).exists()
+            Departement.objects.filter(pk=self.departement.pk + 1).exists()
+            Lowongan.objects.count()
+
+        self.assertEqual(tracker.count, 4)
+        self.assertEqual(tracker.duplicates, 1)
+        self.assertGreater(tracker.duration, 0)
+        repeated = tracker.repeated(3)
+        self.assertEqual(len(repeated), 1)
+        self.assertIn('m_dept', repeated[0][0])
+        self.assertEqual(repeated[0][1], 3)
+
+    def test_server_timing_only_for_staff(self):
+        response = self.client.get('/api/lowongan/')
+        self.assertNotIn('Server-Timing', response)
+
+        self.client.force_login(self.admin)
+        response = self.client.get('/dashboard/api/stats/')
+        self.assertEqual(response.status_code, 200)
+        self.assertRegex(response['Server-Timing'], r'^db;dur=[\d.]+;desc="\d+ queries, \d+ duplicate", app;dur=')
+
+    def test_summary_grouped_by_route(self):
+        self.client.force_login(self.admin)
+        lowongan = Lowongan.objects.get()
+        for _ in range(3):
+            self.client.get(f'/dashboard/api/lowongan/{lowongan.id_lowongan}/')
+        self.client.get('/dashboard/api/stats/')
+
+        response = self.client.get('/dashboard/api/request-metrics/')
+        rows = {row['endpoint']: row for row in response.json()['data']}
+        detail = rows['GET /dashboard/api/lowongan/<int:id_lowongan>/']
+        self.assertEqual((detail['requests'], detail['window']), (3, 3))
+        self.assertLessEqual(detail['wall_p50_ms'], detail['wall_p95_ms'])
+        self.assertGreater(detail['queries_max'], 0)
+        self.assertIn('GET /dashboard/api/stats/', rows)
+
+        self.assertEqual(self.client.delete('/dashboard/api/request-metrics/').status_code, 200)
+        # Request reset itu sendiri tercatat setelah ringkasan dikosongkan
+        self.assertEqual([row['endpoint'] for row in RequestMetrics.get_summary()],
+                         ['DELETE /dashboard/api/request-metrics/'])
+
+    def test_metrics_endpoint_requires_staff(self):
+        response = self.client.get('/dashboard/api/request-metrics/')
+        self.assertEqual(response.status_code, 302)
+
+
+@override_settings(SERVICE_METRICS_ENABLED=True, SERVICE_METRICS_DIR='', SERVICE_METRICS_TOKEN='rahasia')
+class ServiceMetricsTest(DashboardDataMixin, TestCase):
+    """Test metrik service layer format Prometheus"""
+
+    def setUp(self):
+        ServiceMetrics.reset()
+        self.addCleanup(ServiceMetrics.reset)
+        self.departement = self.create_departement()
+        self.lowongan = self.create_lowongan(self.departement)
+
+    def test_calls_errors_and_histogram(self):
+        DashboardService.get_lowongan_by_id(self.lowongan.id_lowongan)
+        DashboardService.get_lowongan_by_id(self.lowongan.id_lowongan)
+        with self.assertRaises(ValueError):
+            DashboardService.update_applicant_status(1, 'unknown')
+
+        text = ServiceMetrics.render()
+        labels = 'service="DashboardService",method="get_lowongan_by_id"'
+        self.assertIn(f'maganghub_service_calls_total{{{labels}}} 2', text)
+        self.assertIn(f'maganghub_service_duration_seconds_bucket{{{labels},le="+Inf"}} 2', text)
+        self.assertIn(f'maganghub_service_duration_seconds_count{{{labels}}} 2', text)
+        self.assertIn('maganghub_service_errors_total{service="DashboardService",'
+                      'method="update_applicant_status",exception="ValueError"} 1', text)
+        # Helper privat tidak diinstrumentasi
+        self.assertNotIn('method="_', text)
+
+    def test_failed_result_counted_as_error(self):
+        TransaksiPendaftaranService.update_status_transaksi(999, 'approved')
+        PendaftaranService.create_pendaftaran({'id_lowongan': 999})
+
+        text = ServiceMetrics.render()
+        self.assertIn('maganghub_service_errors_total{service="TransaksiPendaftaranService",'
+                      'method="update_status_transaksi",exception="failed"} 1', text)
+        self.assertIn('maganghub_service_errors_total{service="PendaftaranService",'
+                      'method="create_pendaftaran",exception="lowongan_not_found"} 1', text)
+
+    def test_workers_aggregated_through_directory(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory, ignore_errors=True)
+        with override_settings(SERVICE_METRICS_DIR=directory):
+            # Snapshot worker lain yang sudah ditulis ke direktori bersama
+            other = [{'service': 'LowonganService', 'method': 'get_lowongan_page', 'count': 3, 'sum': 0.3,
+                      'buckets': [0, 0, 0, 0, 3, 0, 0, 0, 0, 0, 0, 0], 'errors': {}}]
+            with open(os.path.join(directory, '1-other.json'), 'w') as f:
+                json.dump(other, f)
+
+            LowonganService.get_lowongan_page()
+            text = ServiceMetrics.render()
+
+        self.assertIn('maganghub_service_calls_total{service="LowonganService",method="get_lowongan_page"} 4', text)
+        self.assertEqual(len(os.listdir(directory)), 2)
+
+    def test_endpoint_access(self):
+        LowonganService.get_lowongan_page()
+        self.assertEqual(self.client.get('/dashboard/metrics/').status_code, 403)
+        self.assertEqual(self.client.get('/dashboard/metrics/', HTTP_AUTHORIZATION='Bearer salah').status_code, 403)
+
+        response = self.client.get('/dashboard/metrics/', HTTP_AUTHORIZATION='Bearer rahasia')
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response['Content-Type'].startswith('text/plain; version=0.0.4'))
+        self.assertIn('# TYPE maganghub_service_duration_seconds histogram', response.content.decode())
+
+        self.client.force_login(get_user_model().objects.create_user('admin', password='secret', is_staff=True))
+        self.assertEqual(self.client.get('/dashboard/metrics/').status_code, 200)
+
+
+class ProfilingTest(DashboardDataMixin, TestCase):
+    """Test profiling request lambat"""
+
+    def setUp(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory, ignore_errors=True)
+        override = override_settings(PROFILING_DIR=directory, PROFILING_ENABLED=False, PROFILING_THRESHOLD_MS=0,
+                                     PROFILING_MODE='sampling', PROFILING_SAMPLE_INTERVAL_MS=1)
+        override.enable()
+        self.addCleanup(override.disable)
+        self.lowongan = self.create_lowongan(self.create_departement())
+        self.admin = get_user_model().objects.create_user('admin', password='secret', is_staff=True)
+        self.client.force_login(self.admin)
+
+    def test_not_profiled_without_flag_or_token(self):
+        response = self.client.get('/dashboard/api/stats/', {PROFILE_QUERY_PARAM: 'bukan-token'})
+        self.assertNotIn('X-Profile', response)
+        self.assertEqual(ProfileStore.list_profiles(), [])
+
+    def test_signed_token_profiles_request_as_speedscope(self):
+        token = ProfileStore.make_token(self.admin)
+        response = self.client.get(f'/dashboard/api/lowongan/{self.lowongan.id_lowongan}/', {PROFILE_QUERY_PARAM: token})
+        self.assertEqual(response.status_code, 200)
+
+        profile = ProfileStore.list_profiles()[0]
+        self.assertEqual(profile['name'], response['X-Profile'])
+        self.assertEqual((profile['method'], profile['path'], profile['format']),
+                         ('GET', f'/dashboard/api/lowongan/{self.lowongan.id_lowongan}/', 'speedscope'))
+
+        download = self.client.get(f'/dashboard/profiling/{profile["name"]}/')
+        data = json.loads(b''.join(download.streaming_content))
+        self.assertEqual(data['profiles'][0]['type'], 'sampled')
+        self.assertEqual(len(data['profiles'][0]['samples']), len(data['profiles'][0]['weights']))
+
+        # Token milik user lain tidak berlaku
+        other = get_user_model().objects.create_user('lain', password='secret', is_staff=True)
+        self.client.force_login(other)
+        response = self.client.get('/dashboard/api/stats/', {PROFILE_QUERY_PARAM: token})
+        self.assertNotIn('X-Profile', response)
+
+    @override_settings(PROFILING_ENABLED=True, PROFILING_MODE='cprofile', PROFILING_MAX_FILES=2)
+    def test_slow_requests_saved_as_pstats_and_pruned(self):
+        for _ in range(3):
+            self.client.get('/dashboard/api/stats/')
+
+        profiles = ProfileStore.list_profiles()
+        self.assertEqual(len(profiles), 2)
+        self.assertEqual(profiles[0]['format'], 'pstats')
+        summary = self.client.get(f'/dashboard/profiling/{profiles[0]["name"]}/summary/')
+        self.assertIn('get_dashboard_stats', summary.content.decode())
+
+        page = self.client.get('/dashboard/profiling/')
+        self.assertContains(page, profiles[0]['name'])
+        self.assertEqual(self.client.get('/dashboard/profiling/..%2Fsecret.prof/').status_code, 404)
+
+    @override_settings(PROFILING_ENABLED=True, PROFILING_THRESHOLD_MS=60000)
+    def test_fast_requests_not_saved(self):
+        self.client.get('/dashboard/api/stats/')
+        self.assertEqual(ProfileStore.list_profiles(), [])
+
+
+class DatabaseSettingsTest(TestCase):
+    """Test konfigurasi koneksi PostgreSQL dari environment"""
+
+    def test_defaults_and_overrides(self):
+        database = postgres_database(conn_max_age=60, health_checks=True, environ={})
+        self.assertEqual((database['CONN_MAX_AGE'], database['CONN_HEALTH_CHECKS']), (60, True))
+        self.assertNotIn('pool', database['OPTIONS'])
+
+        database = postgres_database(conn_max_age=60, health_checks=True, environ={
+            'DB_CONN_MAX_AGE': 'none', 'DB_CONN_HEALTH_CHECKS': '0', 'DB_HOST': 'db', 'DB_CONNECT_TIMEOUT': '2',
+        })
+        self.assertEqual((database['CONN_MAX_AGE'], database['CONN_HEALTH_CHECKS']), (None, False))
+        self.assertEqual((database['HOST'], database['OPTIONS']['connect_timeout']), ('db', 2))
+
+    def test_pool_requires_psycopg_pool(self):
+        if importlib.util.find_spec('psycopg_pool') is None:
+            with self.assertRaises(ImproperlyConfigured):
+                postgres_database(environ={'DB_POOL': '1'})
+            return
+
+        database = postgres_database(conn_max_age=60, health_checks=True,
+                                     environ={'DB_POOL': '1', 'DB_POOL_MAX_SIZE': '20'})
+        self.assertEqual((database['CONN_MAX_AGE'], database['CONN_HEALTH_CHECKS']), (0, False))
+        self.assertEqual(database['OPTIONS']['pool']['max_size'], 20)
+        self.assertIn('check', database['OPTIONS']['pool'])
@@ -5,10 +5,17 @@ urlpatterns = [
     path('', views.dashboard, name='admin_dashboard'),
     path('manajemen-lowongan/', views.manajemen_lowongan, name='manajemen_lowongan'),
     path('manajemen-pendaftar/', views.manajemen_pendaftar, name='manajemen_pendaftar'),
+    path('profiling/', views.profiling, name='profiling'),
+    path('profiling/<str:name>/', views.profiling_download, name='profiling_download'),
+    path('profiling/<str:name>/summary/', views.profiling_summary, name='profiling_summary'),
     path('api/stats/', views.get_dashboard_stats, name='dashboard_stats'),
     path('api/trend/', views.get_trend_chart_data, name='trend_data'),
     path('api/department/', views.get_department_chart_data, name='department_data'),
     path('api/recent-applicants/', views.get_recent_applicants, name='recent_applicants'),
+    path('api/bootstrap/', views.get_dashboard_bootstrap, name='dashboard_bootstrap'),
+    path('api/cache-stats/', views.get_cache_stats, name='cache_stats'),
+    path('api/request-metrics/', views.get_request_metrics, name='request_metrics'),
+    path('metrics/', views.service_metrics, name='service_metrics'),
     
     # CRUD Lowongan
     path('api/lowongan/', views.api_lowongan_list, name='api_lowongan_list'),
@@ -27,6 +34,10 @@ urlpatterns = [
     # Pendaftar Management
     path('api/pendaftar/pending/', views.api_pendaftar_pending, name='api_pendaftar_pending'),
     path('api/pendaftar/history/', views.api_pendaftar_history, name='api_pendaftar_history'),
+    path('api/pendaftar/export/', views.api_pendaftar_export, name='api_pendaftar_export'),
+    path('api/pendaftar/import/', views.api_pendaftar_import, name='api_pendaftar_import'),
+    path('api/pendaftar/bulk-update-status/', views.api_pendaftar_bulk_update_status, name='api_pendaftar_bulk_update_status'),
     path('api/pendaftar/detail/<int:id_transaksi>/', views.api_pendaftar_detail, name='api_pendaftar_detail'),
+    path('api/pendaftar/<int:id_transaksi>/cv/', views.api_pendaftar_cv, name='api_pendaftar_cv'),
     path('api/pendaftar/<int:id_transaksi>/update-status/', views.api_pendaftar_update_status, name='api_pendaftar_update_status'),
 ]
@@ -1,7 +1,21 @@
+import hmac
+import io
 from django.shortcuts import render, redirect
-from django.http import JsonResponse
+from django.conf import settings
+from django.http import FileResponse, HttpResponse, JsonResponse
 from django.views.decorators.csrf import csrf_exempt
 from django.contrib.auth.decorators import login_required, user_passes_test
+from django.utils import timezone
+from django.views.decorators.http import require_safe
+from magang.models import TransaksiPendaftaran
+from magang.services.import_service import IMPORT_FORMATS, ImportService, detect_format, read_rows
+from magang.services.lowongan_service import LOWONGAN_SEARCH_CACHE
+from .cache import CachedDashboardService, DashboardCache
+from .downloads import serve_file
+from .exports import csv_response, xlsx_response
+from .metrics import PROMETHEUS_CONTENT_TYPE, ServiceMetrics
+from .middleware import RequestMetrics
+from .profiling import PROFILE_QUERY_PARAM, ProfileStore
 from .service import DashboardService
 
 # Create your views here.
@@ -29,6 +43,51 @@ def manajemen_pendaftar(request):
     return render(request, 'manajemen_pendaftar.html')
 
 
+@login_required(login_url='/admin/login/')
+@user_passes_test(is_admin, login_url='/admin/login/')
+def profiling(request):
+    """Render daftar profil request lambat dan token ?_profile= untuk user ini"""
+    return render(request, 'profiling.html', {
+        'profiles': ProfileStore.list_profiles(),
+        'profile_param': PROFILE_QUERY_PARAM,
+        'profile_token': ProfileStore.make_token(request.user),
+        'token_max_age_minutes': settings.PROFILING_TOKEN_MAX_AGE // 60,
+        'profiling_mode': settings.PROFILING_MODE,
+        'profiling_enabled': settings.PROFILING_ENABLED,
+        'threshold_ms': settings.PROFILING_THRESHOLD_MS,
+    })
+
+
+@login_required(login_url='/admin/login/')
+@user_passes_test(is_admin, login_url='/admin/login/')
+@require_safe
+def profiling_download(request, name):
+    """Download file profil (pstats atau speedscope JSON)"""
+    try:
+        path = ProfileStore.get_path(name)
+    except ValueError as e:
+        return JsonResponse({
+            'success': False,
+            'message': str(e)
+        }, status=404)
+    content_type = 'application/json' if name.endswith('.json') else 'application/octet-stream'
+    return FileResponse(open(path, 'rb'), as_attachment=True, filename=name, content_type=content_type)
+
+
+@login_required(login_url='/admin/login/')
+@user_passes_test(is_admin, login_url='/admin/login/')
+@require_safe
+def profiling_summary(request, name):
+    """Ringkasan teks profil cProfile (fungsi dengan waktu kumulatif terbesar)"""
+    try:
+        return HttpResponse(ProfileStore.summary(name), content_type='text/plain; charset=utf-8')
+    except ValueError as e:
+        return JsonResponse({
+            'success': False,
+            'message': str(e)
+        }, status=404)
+
+
 @login_required(login_url='/admin/login/')
 @user_passes_test(is_admin, login_url='/admin/login/')
 @csrf_exempt
@@ -36,7 +95,7 @@ def get_dashboard_stats(request):
     """API endpoint untuk mendapatkan statistik dashboard"""
     if request.method == 'GET':
         try:
-            stats = DashboardService.get_statistics()
+            stats = CachedDashboardService.get_statistics()
             return JsonResponse({
                 'success': True,
                 'data': stats
@@ -56,11 +115,17 @@ def get_trend_chart_data(request):
     if request.method == 'GET':
         try:
             days = request.GET.get('days', 30)
-            trend_data = DashboardService.get_trend_data(int(days))
+            bucket = request.GET.get('bucket')
+            trend_data = CachedDashboardService.get_trend_data(int(days), bucket)
             return JsonResponse({
                 'success': True,
                 'data': trend_data
             })
+        except ValueError as e:
+            return JsonResponse({
+                'success': False,
+                'message': str(e)
+            }, status=400)
         except Exception as e:
             return JsonResponse({
                 'success': False,
@@ -75,7 +140,7 @@ def get_department_chart_data(request):
     """API endpoint untuk data chart distribusi departemen"""
     if request.method == 'GET':
         try:
-            dept_data = DashboardService.get_department_distribution()
+            dept_data = CachedDashboardService.get_department_distribution()
             return JsonResponse({
                 'success': True,
                 'data': dept_data
@@ -95,7 +160,7 @@ def get_recent_applicants(request):
     if request.method == 'GET':
         try:
             limit = request.GET.get('limit', 10)
-            applicants = DashboardService.get_recent_applicants(int(limit))
+            applicants = CachedDashboardService.get_recent_applicants(int(limit))
             return JsonResponse({
                 'success': True,
                 'data': applicants
@@ -107,6 +172,94 @@ def get_recent_applicants(request):
             }, status=500)
 
 
+@login_required(login_url='/admin/login/')
+@user_passes_test(is_admin, login_url='/admin/login/')
+@csrf_exempt
+def get_dashboard_bootstrap(request):
+    """API endpoint untuk seluruh data dashboard (stats, tren, departemen, pendaftar terbaru) sekaligus"""
+    if request.method == 'GET':
+        try:
+            days = request.GET.get('days', 30)
+            bucket = request.GET.get('bucket')
+            limit = request.GET.get('limit', 10)
+            data = CachedDashboardService.get_dashboard_bootstrap(int(days), bucket, int(limit))
+            return JsonResponse({
+                'success': True,
+                'data': data
+            })
+        except ValueError as e:
+            return JsonResponse({
+                'success': False,
+                'message': str(e)
+            }, status=400)
+        except Exception as e:
+            return JsonResponse({
+                'success': False,
+                'message': str(e)
+            }, status=500)
+
+
+@login_required(login_url='/admin/login/')
+@user_passes_test(is_admin, login_url='/admin/login/')
+@csrf_exempt
+def get_cache_stats(request):
+    """API endpoint untuk statistik hit/miss cache dashboard dan cache pencarian lowongan"""
+    if request.method == 'GET':
+        try:
+            return JsonResponse({
+                'success': True,
+                'data': {
+                    **DashboardCache.get_stats(),
+                    'lowongan_search': LOWONGAN_SEARCH_CACHE.get_stats()
+                }
+            })
+        except Exception as e:
+            return JsonResponse({
+                'success': False,
+                'message': str(e)
+            }, status=500)
+
+
+@login_required(login_url='/admin/login/')
+@user_passes_test(is_admin, login_url='/admin/login/')
+@csrf_exempt
+def get_request_metrics(request):
+    """API endpoint untuk ringkasan waktu dan jumlah query per endpoint (DELETE untuk reset)"""
+    if request.method == 'GET':
+        try:
+            return JsonResponse({
+                'success': True,
+                'data': RequestMetrics.get_summary()
+            })
+        except Exception as e:
+            return JsonResponse({
+                'success': False,
+                'message': str(e)
+            }, status=500)
+
+    elif request.method == 'DELETE':
+        RequestMetrics.reset()
+        return JsonResponse({
+            'success': True,
+            'message': 'Metrik request berhasil direset'
+        })
+
+
+@require_safe
+def service_metrics(request):
+    """
+    Metrik service layer dalam format teks Prometheus.
+    Boleh diakses staff yang login, atau scraper dengan header
+    'Authorization: Bearer <SERVICE_METRICS_TOKEN>'.
+    """
+    token = settings.SERVICE_METRICS_TOKEN
+    authorization = request.headers.get('Authorization', '')
+    scraper = bool(token) and hmac.compare_digest(authorization.encode(), f'Bearer {token}'.encode())
+    if not scraper and not (request.user.is_authenticated and is_admin(request.user)):
+        return HttpResponse('Forbidden', status=403, content_type='text/plain')
+    return HttpResponse(ServiceMetrics.render(), content_type=PROMETHEUS_CONTENT_TYPE)
+
+
 # === CRUD LOWONGAN ===
 @login_required(login_url='/admin/login/')
 @user_passes_test(is_admin, login_url='/admin/login/')
@@ -319,12 +472,22 @@ def api_pendaftar_pending(request):
     """API untuk mendapatkan daftar pendaftar pending"""
     if request.method == 'GET':
         try:
-            search = request.GET.get('search', '')
-            data = DashboardService.get_pending_applicants(search)
+            page = DashboardService.get_pending_applicants_page(
+                search=request.GET.get('search', ''),
+                sort=request.GET.get('sort', ''),
+                order=request.GET.get('order', ''),
+                cursor=request.GET.get('cursor'),
+                limit=request.GET.get('limit')
+            )
             return JsonResponse({
                 'success': True,
-                'data': data
+                **page
             })
+        except ValueError as e:
+            return JsonResponse({
+                'success': False,
+                'message': str(e)
+            }, status=400)
         except Exception as e:
             return JsonResponse({
                 'success': False,
@@ -339,13 +502,23 @@ def api_pendaftar_history(request):
     """API untuk mendapatkan riwayat pendaftar"""
     if request.method == 'GET':
         try:
-            search = request.GET.get('search', '')
-            status_filter = request.GET.get('status', '')
-            data = DashboardService.get_applicants_history(search, status_filter)
+            page = DashboardService.get_applicants_history_page(
+                search=request.GET.get('search', ''),
+                status_filter=request.GET.get('status', ''),
+                sort=request.GET.get('sort', ''),
+                order=request.GET.get('order', ''),
+                cursor=request.GET.get('cursor'),
+                limit=request.GET.get('limit')
+            )
             return JsonResponse({
                 'success': True,
-                'data': data
+                **page
             })
+        except ValueError as e:
+            return JsonResponse({
+                'success': False,
+                'message': str(e)
+            }, status=400)
         except Exception as e:
             return JsonResponse({
                 'success': False,
@@ -353,6 +526,84 @@ def api_pendaftar_history(request):
             }, status=500)
 
 
+@login_required(login_url='/admin/login/')
+@user_passes_test(is_admin, login_url='/admin/login/')
+@require_safe
+def api_pendaftar_export(request):
+    """
+    Export pendaftar dengan filter yang sama seperti daftar pendaftar. CSV di-stream per baris
+    tanpa batas; XLSX dibuat utuh sebelum dikirim sehingga dibatasi EXPORT_XLSX_MAX_ROWS
+    (lebih dari itu 400, gunakan CSV)
+    """
+    export_format = request.GET.get('format', 'csv')
+    scope = request.GET.get('scope', 'all')
+    try:
+        if export_format not in ('csv', 'xlsx'):
+            raise ValueError('Format harus csv atau xlsx')
+        header, rows = DashboardService.iter_applicant_export(
+            scope=scope,
+            search=request.GET.get('search', ''),
+            status_filter=request.GET.get('status', ''),
+            sort=request.GET.get('sort', ''),
+            order=request.GET.get('order', '')
+        )
+        filename = f'pendaftar_{scope}_{timezone.localdate():%Y%m%d}.{export_format}'
+        if export_format == 'xlsx':
+            return xlsx_response(filename, header, rows, sheet_title='Pendaftar',
+                                 max_rows=settings.EXPORT_XLSX_MAX_ROWS)
+        return csv_response(filename, header, rows)
+    except ValueError as e:
+        return JsonResponse({
+            'success': False,
+            'message': str(e)
+        }, status=400)
+
+
+@login_required(login_url='/admin/login/')
+@user_passes_test(is_admin, login_url='/admin/login/')
+@csrf_exempt
+def api_pendaftar_import(request):
+    """Import pendaftar dari file CSV/JSONL (field 'file'), hasil berupa ringkasan dan error per baris"""
+    if request.method != 'POST':
+        return JsonResponse({
+            'success': False,
+            'message': 'Method not allowed'
+        }, status=405)
+    
+    upload = request.FILES.get('file')
+    if not upload:
+        return JsonResponse({
+            'success': False,
+            'message': 'File import wajib diisi'
+        }, status=400)
+    
+    file_format = request.POST.get('format') or detect_format(upload.name)
+    if file_format not in IMPORT_FORMATS:
+        return JsonResponse({
+            'success': False,
+            'message': 'Format harus csv atau jsonl'
+        }, status=400)
+    
+    try:
+        stream = io.TextIOWrapper(upload.file, encoding='utf-8-sig', newline='')
+        summary = ImportService.import_rows(read_rows(stream, file_format))
+        return JsonResponse({
+            'success': True,
+            'message': f"{summary['created_transaksi']} pendaftaran berhasil diimport, {summary['failed']} baris gagal",
+            'data': summary
+        })
+    except UnicodeDecodeError:
+        return JsonResponse({
+            'success': False,
+            'message': 'File harus berupa teks UTF-8'
+        }, status=400)
+    except Exception as e:
+        return JsonResponse({
+            'success': False,
+            'message': str(e)
+        }, status=500)
+
+
 @login_required(login_url='/admin/login/')
 @user_passes_test(is_admin, login_url='/admin/login/')
 @csrf_exempt
@@ -372,6 +623,28 @@ def api_pendaftar_detail(request, id_transaksi):
             }, status=500)
 
 
+@login_required(login_url='/admin/login/')
+@user_passes_test(is_admin, login_url='/admin/login/')
+@require_safe
+def api_pendaftar_cv(request, id_transaksi):
+    """Streaming file CV pendaftar (Range, ETag/304, X-Sendfile jika dikonfigurasi)"""
+    try:
+        cv = DashboardService.get_applicant_cv(id_transaksi)
+    except TransaksiPendaftaran.DoesNotExist:
+        return JsonResponse({
+            'success': False,
+            'message': 'Pendaftar tidak ditemukan'
+        }, status=404)
+    
+    if cv is None:
+        return JsonResponse({
+            'success': False,
+            'message': 'CV tidak tersedia'
+        }, status=404)
+    
+    return serve_file(request, cv['path'], cv['filename'], 'application/pdf', cv['etag'])
+
+
 @login_required(login_url='/admin/login/')
 @user_passes_test(is_admin, login_url='/admin/login/')
 @csrf_exempt
@@ -402,3 +675,45 @@ def api_pendaftar_update_status(request, id_transaksi):
                 'success': False,
                 'message': str(e)
             }, status=500)
+
+
+@login_required(login_url='/admin/login/')
+@user_passes_test(is_admin, login_url='/admin/login/')
+@csrf_exempt
+def api_pendaftar_bulk_update_status(request):
+    """
+    API untuk approve/reject banyak pendaftar sekaligus.
+    Body: {"status": "approved", "ids": [1, 2, 3]} atau
+    {"status": "rejected", "filter": {"id_lowongan": 3, "ipk_lt": "3.00"}}
+    """
+    if request.method == 'POST':
+        try:
+            import json
+            data = json.loads(request.body)
+            if not isinstance(data, dict):
+                raise ValueError('Body harus berupa object JSON')
+            result = DashboardService.bulk_update_applicant_status(
+                data.get('status'), ids=data.get('ids'), filters=data.get('filter')
+            )
+            
+            action = 'diterima' if data['status'] == 'approved' else 'ditolak'
+            return JsonResponse({
+                'success': True,
+                'message': f"{result['updated']} kandidat berhasil {action}",
+                'data': result
+            })
+        except ValueError as e:
+            return JsonResponse({
+                'success': False,
+                'message': str(e)
+            }, status=400)
+        except Exception as e:
+            return JsonResponse({
+                'success': False,
+                'message': str(e)
+            }, status=500)
+    
+    return JsonResponse({
+        'success': False,
+        'message': 'Method not allowed'
+    }, status=405)
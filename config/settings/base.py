@@ -10,6 +10,7 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/6.0/ref/settings/
 """
 
+import os
 from pathlib import Path
 
 BASE_DIR = Path(__file__).resolve().parent.parent
@@ -28,11 +29,13 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'admin_dashboard.middleware.QueryTimingMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'admin_dashboard.middleware.ProfilingMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
@@ -69,3 +72,85 @@ MEDIA_URL = '/media/'
 MEDIA_ROOT = BASE_DIR.parent / 'storage'
 
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
+
+# Cache dashboard admin
+# DASHBOARD_CACHE_BACKEND: 'locmem' (per proses) atau 'file' (dibagi antar worker)
+DASHBOARD_CACHE_BACKEND = os.environ.get('DASHBOARD_CACHE_BACKEND', 'locmem')
+DASHBOARD_CACHE_TIMEOUT = int(os.environ.get('DASHBOARD_CACHE_TIMEOUT', 60))
+DASHBOARD_CACHE_BACKENDS = {
+    'locmem': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'dashboard',
+    },
+    'file': {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': os.environ.get('DASHBOARD_CACHE_DIR', str(BASE_DIR.parent / 'storage' / 'cache' / 'dashboard')),
+    },
+}
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+    'dashboard': {
+        **DASHBOARD_CACHE_BACKENDS[DASHBOARD_CACHE_BACKEND],
+        'TIMEOUT': DASHBOARD_CACHE_TIMEOUT,
+    },
+}
+
+# HTTP cache /api/lowongan/: browser selalu revalidasi lewat ETag (304),
+# reverse proxy lokal boleh menyimpan respons selama sekian detik
+LOWONGAN_FEED_PROXY_MAX_AGE = int(os.environ.get('LOWONGAN_FEED_PROXY_MAX_AGE', 30))
+
+# Cache hasil pencarian lowongan per term di memori proses (SIZE 0 = nonaktif).
+# Hasil lebih dari MAX_ROWS tidak disimpan dan langsung memakai query database.
+LOWONGAN_SEARCH_CACHE_SIZE = int(os.environ.get('LOWONGAN_SEARCH_CACHE_SIZE', 256))
+LOWONGAN_SEARCH_CACHE_TTL = int(os.environ.get('LOWONGAN_SEARCH_CACHE_TTL', 60))
+LOWONGAN_SEARCH_CACHE_MAX_ROWS = int(os.environ.get('LOWONGAN_SEARCH_CACHE_MAX_ROWS', 2000))
+
+# Antrian pemrosesan CV (manage.py process_cv_jobs). Upload disimpan dulu di
+# direktori staging (di luar MEDIA_ROOT agar tidak ikut tersaji) sampai divalidasi worker.
+CV_STAGING_DIR = os.environ.get('CV_STAGING_DIR', str(BASE_DIR.parent / 'staging' / 'cv'))
+CV_JOB_MAX_ATTEMPTS = int(os.environ.get('CV_JOB_MAX_ATTEMPTS', 3))
+CV_JOB_RETRY_DELAY = int(os.environ.get('CV_JOB_RETRY_DELAY', 30))
+CV_JOB_STALE_AFTER = int(os.environ.get('CV_JOB_STALE_AFTER', 600))
+
+# Download CV reviewer (/dashboard/api/pendaftar/<id>/cv/). Default di-stream oleh Django;
+# isi 'x-accel-redirect' (nginx, location internal CV_DOWNLOAD_ACCEL_PREFIX -> MEDIA_ROOT)
+# atau 'x-sendfile' (Apache mod_xsendfile) agar file dikirim langsung oleh web server.
+CV_DOWNLOAD_SENDFILE = os.environ.get('CV_DOWNLOAD_SENDFILE', '')
+CV_DOWNLOAD_ACCEL_PREFIX = os.environ.get('CV_DOWNLOAD_ACCEL_PREFIX', '/protected-media/')
+
+# Export XLSX dibuat utuh sebelum byte pertama dikirim (format zip tidak bisa di-stream per baris),
+# jadi dibatasi jumlah barisnya; data lebih besar memakai CSV yang di-stream
+EXPORT_XLSX_MAX_ROWS = int(os.environ.get('EXPORT_XLSX_MAX_ROWS', 50000))
+
+# Instrumentasi per request (admin_dashboard.middleware): jumlah query, waktu DB, query duplikat.
+# Ringkasan WINDOW request terakhir per endpoint ada di /dashboard/api/request-metrics/.
+# SQL yang sama dijalankan >= N_PLUS_ONE_THRESHOLD kali dalam satu request dicatat sebagai N+1.
+# Header Server-Timing: 'staff' (staff login, atau semua request saat DEBUG), 'all' atau 'off'.
+REQUEST_METRICS_ENABLED = os.environ.get('REQUEST_METRICS_ENABLED', '1') == '1'
+REQUEST_METRICS_WINDOW = int(os.environ.get('REQUEST_METRICS_WINDOW', 500))
+REQUEST_METRICS_N_PLUS_ONE_THRESHOLD = int(os.environ.get('REQUEST_METRICS_N_PLUS_ONE_THRESHOLD', 10))
+REQUEST_METRICS_SERVER_TIMING = os.environ.get('REQUEST_METRICS_SERVER_TIMING', 'staff')
+
+# Metrik service layer (admin_dashboard.metrics) di /dashboard/metrics/ dalam format Prometheus.
+# Akses: staff login atau header 'Authorization: Bearer <SERVICE_METRICS_TOKEN>'.
+# Dengan beberapa worker gunicorn isi SERVICE_METRICS_DIR (direktori bersama, dikosongkan saat
+# deploy) agar metrik semua worker dijumlahkan; snapshot ditulis tiap FLUSH_INTERVAL detik.
+SERVICE_METRICS_ENABLED = os.environ.get('SERVICE_METRICS_ENABLED', '1') == '1'
+SERVICE_METRICS_TOKEN = os.environ.get('SERVICE_METRICS_TOKEN', '')
+SERVICE_METRICS_DIR = os.environ.get('SERVICE_METRICS_DIR', '')
+SERVICE_METRICS_FLUSH_INTERVAL = int(os.environ.get('SERVICE_METRICS_FLUSH_INTERVAL', 5))
+
+# Profiling request (admin_dashboard.middleware.ProfilingMiddleware). ENABLED=1 memprofil semua
+# request dan menyimpan yang lebih lambat dari THRESHOLD_MS ke PROFILING_DIR; tanpa itu staff
+# tetap bisa memprofil satu request dengan ?_profile=<token> dari /dashboard/profiling/.
+# MODE 'sampling' (overhead kecil, speedscope JSON) atau 'cprofile' (pstats, lebih lambat).
+PROFILING_ENABLED = os.environ.get('PROFILING_ENABLED', '0') == '1'
+PROFILING_MODE = os.environ.get('PROFILING_MODE', 'sampling')
+PROFILING_THRESHOLD_MS = int(os.environ.get('PROFILING_THRESHOLD_MS', 500))
+PROFILING_SAMPLE_INTERVAL_MS = int(os.environ.get('PROFILING_SAMPLE_INTERVAL_MS', 5))
+PROFILING_DIR = os.environ.get('PROFILING_DIR', str(BASE_DIR.parent / 'profiles'))
+PROFILING_MAX_FILES = int(os.environ.get('PROFILING_MAX_FILES', 200))
+PROFILING_TOKEN_MAX_AGE = int(os.environ.get('PROFILING_TOKEN_MAX_AGE', 3600))
@@ -0,0 +1,64 @@
+import os
+from django.core.exceptions import ImproperlyConfigured
+
+
+def _conn_max_age(value, default):
+    """DB_CONN_MAX_AGE: detik, 'none' = koneksi dipakai ulang tanpa batas waktu"""
+    if value is None or value == '':
+        return default
+    if value.lower() == 'none':
+        return None
+    return int(value)
+
+
+def postgres_database(conn_max_age=0, health_checks=False, environ=os.environ):
+    """
+    Konfigurasi DATABASES['default'] PostgreSQL dari environment variable.
+    Koneksi persisten (DB_CONN_MAX_AGE) menghindari connect + autentikasi baru di setiap request;
+    DB_CONN_HEALTH_CHECKS memastikan koneksi lama masih hidup sebelum dipakai (misal setelah
+    PostgreSQL restart) tanpa membuat request pertama setelahnya gagal.
+    DB_POOL=1 memakai pool psycopg 3 (Django >= 5.1, requirements-pool.txt) sebagai pengganti
+    koneksi persisten: koneksi dibagi antar thread dalam satu proses.
+    Args:
+        conn_max_age (int): default DB_CONN_MAX_AGE
+        health_checks (bool): default DB_CONN_HEALTH_CHECKS
+        environ (dict): sumber environment variable
+    Returns:
+        dict: konfigurasi database
+    Raises:
+        ImproperlyConfigured: DB_POOL=1 tetapi psycopg_pool tidak terpasang
+    """
+    health_checks = environ.get('DB_CONN_HEALTH_CHECKS', '1' if health_checks else '0') == '1'
+    database = {
+        'ENGINE': 'django.db.backends.postgresql',
+        'NAME': environ.get('DB_NAME', 'sistem_magang_django'),
+        'USER': environ.get('DB_USER', 'postgres'),
+        'PASSWORD': environ.get('DB_PASSWORD', 'password'),
+        'HOST': environ.get('DB_HOST', 'localhost'),
+        'PORT': environ.get('DB_PORT', '5432'),
+        'CONN_MAX_AGE': _conn_max_age(environ.get('DB_CONN_MAX_AGE'), conn_max_age),
+        'CONN_HEALTH_CHECKS': health_checks,
+        'OPTIONS': {
+            'connect_timeout': int(environ.get('DB_CONNECT_TIMEOUT', 5)),
+        },
+    }
+
+    if environ.get('DB_POOL', '0') == '1':
+        try:
+            from psycopg_pool import ConnectionPool
+        except ImportError:
+            raise ImproperlyConfigured('DB_POOL=1 membutuhkan psycopg 3 dengan pool: pip install -r requirements-pool.txt')
+
+        # Pool tidak bisa digabung dengan koneksi persisten, koneksi kembali ke pool di akhir request
+        database['CONN_MAX_AGE'] = 0
+        database['CONN_HEALTH_CHECKS'] = False
+        database['OPTIONS']['pool'] = {
+            'min_size': int(environ.get('DB_POOL_MIN_SIZE', 2)),
+            'max_size': int(environ.get('DB_POOL_MAX_SIZE', 10)),
+            'timeout': int(environ.get('DB_POOL_TIMEOUT', 10)),
+            'max_idle': int(environ.get('DB_POOL_MAX_IDLE', 600)),
+        }
+        if health_checks:
+            # Koneksi diperiksa saat diambil dari pool
+            database['OPTIONS']['pool']['check'] = ConnectionPool.check_connection
+    return database
@@ -1,20 +1,16 @@
 import os
 from .base import *
+from .database import postgres_database
 
 DEBUG = True  
 ALLOWED_HOSTS = ["yourdomain.com", "localhost", "127.0.0.1", "[::1]"]
 
-# Database PostgreSQL
+# Database PostgreSQL (DB_NAME, DB_USER, DB_PASSWORD, DB_HOST, DB_PORT, lihat database.py).
+# runserver membuat thread baru per request sehingga koneksi persisten tidak bisa dipakai ulang,
+# default lokal tetap satu koneksi per request.
 
 DATABASES = {
-    'default': {
-        'ENGINE': 'django.db.backends.postgresql',
-        'NAME': 'sistem_magang_django',
-        'USER': 'postgres',
-        'PASSWORD': 'password',
-        'HOST': 'localhost',  
-        'PORT': '5432'
-    }
+    'default': postgres_database(conn_max_age=0, health_checks=False)
 }
 
 # Security settings
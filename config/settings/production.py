@@ -1,20 +1,16 @@
 import os
 from .base import *
+from .database import postgres_database
 
 DEBUG = False 
 ALLOWED_HOSTS = ["yourdomain.com", "localhost", "127.0.0.1", "[::1]"]
 
-# Database PostgreSQL
+# Database PostgreSQL (DB_NAME, DB_USER, DB_PASSWORD, DB_HOST, DB_PORT, lihat database.py).
+# Koneksi dipakai ulang per worker selama 60 detik dan dicek sebelum dipakai;
+# DB_POOL=1 untuk pool psycopg 3.
 
 DATABASES = {
-    'default': {
-        'ENGINE': 'django.db.backends.postgresql',
-        'NAME': 'sistem_magang_django',
-        'USER': 'postgres',
-        'PASSWORD': 'password',
-        'HOST': 'localhost',  
-        'PORT': '5432'
-    }
+    'default': postgres_database(conn_max_age=60, health_checks=True)
 }
 
 # Security settings
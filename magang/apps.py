@@ -3,3 +3,6 @@ from django.apps import AppConfig
 
 class MagangConfig(AppConfig):
     name = 'magang'
+
+    def ready(self):
+        from . import signals  # noqa: F401
@@ -0,0 +1,19 @@
+from django.core.management.base import BaseCommand
+from magang.services.cv_storage_service import CvStorageService
+
+
+class Command(BaseCommand):
+    help = 'Menyamakan ref_count CV dengan data pendaftar dan menghapus file CV yang tidak dipakai'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--grace', type=int, default=3600,
+                            help='Umur minimal (detik) file tanpa CvBlob sebelum dihapus')
+        parser.add_argument('--dry-run', action='store_true', help='Hanya tampilkan, tanpa menghapus')
+
+    def handle(self, *args, **options):
+        result = CvStorageService.collect_garbage(grace_seconds=options['grace'], dry_run=options['dry_run'])
+        prefix = '[dry-run] ' if options['dry_run'] else ''
+        self.stdout.write(self.style.SUCCESS(
+            f"{prefix}✓ {result['recounted']} ref_count diperbaiki, {result['deleted_blobs']} blob dan "
+            f"{result['deleted_files']} file tanpa referensi dihapus ({result['freed_bytes'] / 1024:.0f} KiB)"
+        ))
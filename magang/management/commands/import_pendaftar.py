@@ -0,0 +1,53 @@
+import json
+from django.core.management.base import BaseCommand, CommandError
+from magang.services.import_service import (
+    IMPORT_CHUNK_SIZE, IMPORT_FORMATS, ImportService, detect_format, read_rows
+)
+
+
+class Command(BaseCommand):
+    help = 'Import pendaftar dari file CSV/JSONL kiriman kampus mitra'
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help='Path file .csv atau .jsonl')
+        parser.add_argument('--format', choices=IMPORT_FORMATS, help='Format file (default dari ekstensi)')
+        parser.add_argument('--chunk-size', type=int, default=IMPORT_CHUNK_SIZE, help='Jumlah baris per bulk insert')
+        parser.add_argument('--errors', help='Tulis error per baris ke file JSONL ini')
+
+    def progress(self, summary):
+        self.stdout.write(
+            f"\r{summary['processed']} baris diproses, {summary['created_transaksi']} pendaftaran dibuat, "
+            f"{summary['failed']} gagal",
+            ending=''
+        )
+        self.stdout.flush()
+
+    def handle(self, *args, **options):
+        file_format = options['format'] or detect_format(options['path'])
+        try:
+            stream = open(options['path'], encoding='utf-8-sig', newline='')
+        except OSError as e:
+            raise CommandError(f'File tidak bisa dibuka: {e}')
+
+        with stream:
+            summary = ImportService.import_rows(
+                read_rows(stream, file_format),
+                chunk_size=max(options['chunk_size'], 1),
+                progress=self.progress
+            )
+        self.stdout.write('')
+
+        if options['errors'] and summary['errors']:
+            with open(options['errors'], 'w', encoding='utf-8') as output:
+                for error in summary['errors']:
+                    output.write(json.dumps(error, ensure_ascii=False) + '\n')
+        for error in summary['errors'][:10]:
+            self.stdout.write(self.style.WARNING(f"Baris {error['row']}: {'; '.join(error['errors'])}"))
+        if summary['errors_truncated'] or len(summary['errors']) > 10:
+            self.stdout.write(self.style.WARNING('... error lain tidak ditampilkan, gunakan --errors'))
+
+        self.stdout.write(self.style.SUCCESS(
+            f"✓ {summary['processed']} baris dalam {summary['elapsed']} detik ({summary['rows_per_second']} baris/detik): "
+            f"{summary['created_pendaftar']} pendaftar baru, {summary['reused_pendaftar']} memakai NIK terdaftar, "
+            f"{summary['created_transaksi']} pendaftaran dibuat, {summary['duplicates']} duplikat, {summary['failed']} gagal"
+        ))
@@ -0,0 +1,31 @@
+import time
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+from magang.services.cv_processing_service import CvProcessingService
+
+
+class Command(BaseCommand):
+    help = 'Worker antrian pemrosesan CV: validasi PDF, ambil metadata, pindahkan file ke storage'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--once', action='store_true', help='Proses job yang siap lalu berhenti')
+        parser.add_argument('--batch', type=int, default=20, help='Jumlah job per claim')
+        parser.add_argument('--sleep', type=float, default=2.0, help='Jeda (detik) saat antrian kosong')
+
+    def handle(self, *args, **options):
+        batch = max(options['batch'], 1)
+        while True:
+            close_old_connections()
+            summary = CvProcessingService.run_pending(batch)
+            processed = sum(summary.values())
+            if processed:
+                self.stdout.write(
+                    f"{summary['done']} selesai, {summary['pending']} dijadwalkan ulang, {summary['failed']} gagal"
+                )
+            if options['once']:
+                # Satu batch penuh berarti mungkin masih ada job lain yang siap
+                if processed < batch:
+                    break
+                continue
+            if not processed:
+                time.sleep(options['sleep'])
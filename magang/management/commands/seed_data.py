@@ -0,0 +1,29 @@
+from datetime import date
+from django.core.management.base import BaseCommand, CommandError
+from seeder.seed_data import DEFAULT_SCALE, DEFAULT_SEED, SEED_BATCH_SIZE, run_seeder
+
+
+class Command(BaseCommand):
+    help = 'Menghapus data lalu membuat dataset sintetis deterministik (departemen, lowongan, pendaftar)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--departemen', type=int, default=DEFAULT_SCALE['departemen'], help='Jumlah departemen')
+        parser.add_argument('--lowongan', type=int, default=DEFAULT_SCALE['lowongan'], help='Jumlah lowongan')
+        parser.add_argument('--pendaftar', type=int, default=DEFAULT_SCALE['pendaftar'], help='Jumlah pendaftar')
+        parser.add_argument('--seed', type=int, default=DEFAULT_SEED, help='Seed generator acak')
+        parser.add_argument('--batch-size', type=int, default=SEED_BATCH_SIZE, help='Jumlah baris per bulk insert')
+        parser.add_argument('--today', type=date.fromisoformat, help='Tanggal acuan YYYY-MM-DD (default hari ini)')
+
+    def handle(self, *args, **options):
+        try:
+            run_seeder(
+                departemen=options['departemen'],
+                lowongan=options['lowongan'],
+                pendaftar=options['pendaftar'],
+                seed=options['seed'],
+                batch_size=options['batch_size'],
+                today=options['today'],
+                log=self.stdout.write
+            )
+        except ValueError as e:
+            raise CommandError(str(e))
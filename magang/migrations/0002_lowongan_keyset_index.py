@@ -0,0 +1,17 @@
+# Generated by Django 5.2.18 on 2026-10-18 08:44
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('magang', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='lowongan',
+            index=models.Index(fields=['-tanggal_mulai', 'id_lowongan'], name='magang_lowongan_keyset_idx'),
+        ),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 5.2.18 on 2026-10-18 08:46
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('magang', '0002_lowongan_keyset_index'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='transaksipendaftaran',
+            index=models.Index(fields=['status', '-created_at', '-id_transaksi_pendaftaran'], name='magang_transaksi_pending_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='transaksipendaftaran',
+            index=models.Index(fields=['status', '-updated_at', '-id_transaksi_pendaftaran'], name='magang_transaksi_history_idx'),
+        ),
+    ]
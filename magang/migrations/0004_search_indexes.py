@@ -0,0 +1,42 @@
+from django.db import migrations
+
+
+# Ekspresi tsvector harus sama persis dengan magang/services/search_service.py
+# agar planner PostgreSQL memakai index ini.
+SEARCH_INDEXES = [
+    ('magang_lowongan_fts_idx', 'magang_table',
+     "to_tsvector('simple', coalesce(posisi, '') || ' ' || coalesce(deskripsi, ''))"),
+    ('magang_lowongan_posisi_trgm_idx', 'magang_table', 'posisi gin_trgm_ops'),
+    ('magang_dept_nama_trgm_idx', 'm_dept', 'nama_dept gin_trgm_ops'),
+    ('magang_pendaftar_fts_idx', 'pendaftar',
+     "to_tsvector('simple', coalesce(name, '') || ' ' || coalesce(university, ''))"),
+    ('magang_pendaftar_name_trgm_idx', 'pendaftar', 'name gin_trgm_ops'),
+    ('magang_pendaftar_university_trgm_idx', 'pendaftar', 'university gin_trgm_ops'),
+]
+
+
+def create_search_indexes(apps, schema_editor):
+    # Database selain PostgreSQL memakai InMemorySearchIndex
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    for name, table, expression in SEARCH_INDEXES:
+        schema_editor.execute(f'CREATE INDEX IF NOT EXISTS {name} ON {table} USING gin ({expression})')
+
+
+def drop_search_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    for name, _table, _expression in SEARCH_INDEXES:
+        schema_editor.execute(f'DROP INDEX IF EXISTS {name}')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('magang', '0003_transaksi_keyset_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_indexes, drop_search_indexes),
+    ]
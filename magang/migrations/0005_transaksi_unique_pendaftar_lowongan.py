@@ -0,0 +1,55 @@
+# Generated by Django 5.2.18 on 2026-10-18 08:57
+
+from collections import Counter
+from django.db import migrations, models
+from django.db.models import Count, F
+
+
+def remove_duplicate_transaksi(apps, schema_editor):
+    """
+    Menghapus pendaftaran ganda (pendaftar, lowongan) sebelum constraint unik dibuat.
+    Per pasangan disimpan satu baris: yang sudah diproses (bukan pending) lebih dulu,
+    lalu yang paling awal dibuat. Counter dashboard yang sudah terisi ikut dikurangi.
+    """
+    TransaksiPendaftaran = apps.get_model('magang', 'TransaksiPendaftaran')
+    DashboardCounter = apps.get_model('admin_dashboard', 'DashboardCounter')
+
+    duplicates = TransaksiPendaftaran.objects.values('pendaftar_id', 'lowongan_id').annotate(
+        count=Count('pk')
+    ).filter(count__gt=1).order_by()
+
+    removed = []
+    deltas = Counter()
+    for pair in duplicates:
+        rows = list(TransaksiPendaftaran.objects.filter(
+            pendaftar_id=pair['pendaftar_id'], lowongan_id=pair['lowongan_id']
+        ).values('pk', 'status', 'lowongan__departement_id').order_by('created_at', 'pk'))
+        rows.sort(key=lambda row: row['status'] == 'pending')
+        for row in rows[1:]:
+            removed.append(row['pk'])
+            deltas[('total', 'transaksi')] += 1
+            deltas[('status', row['status'])] += 1
+            deltas[('departemen', str(row['lowongan__departement_id']))] += 1
+
+    if not removed:
+        return
+    for start in range(0, len(removed), 500):
+        TransaksiPendaftaran.objects.filter(pk__in=removed[start:start + 500]).delete()
+    for (scope, key), count in deltas.items():
+        DashboardCounter.objects.filter(scope=scope, key=key).update(value=F('value') - count)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('magang', '0004_search_indexes'),
+        ('admin_dashboard', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.RunPython(remove_duplicate_transaksi, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='transaksipendaftaran',
+            constraint=models.UniqueConstraint(fields=('pendaftar', 'lowongan'), name='uniq_transaksi_pendaftar_lowongan'),
+        ),
+    ]
@@ -0,0 +1,46 @@
+# Generated by Django 5.2.18 on 2026-10-18 08:59
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('magang', '0005_transaksi_unique_pendaftar_lowongan'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='pendaftar',
+            name='cv_metadata',
+            field=models.JSONField(blank=True, default=dict),
+        ),
+        migrations.AddField(
+            model_name='pendaftar',
+            name='cv_status',
+            field=models.CharField(choices=[('processing', 'Diproses'), ('ready', 'Siap'), ('invalid', 'Tidak Valid')], default='ready', max_length=20),
+        ),
+        migrations.CreateModel(
+            name='CvProcessingJob',
+            fields=[
+                ('id_job', models.AutoField(primary_key=True, serialize=False)),
+                ('staging_path', models.CharField(max_length=255)),
+                ('original_name', models.CharField(max_length=255)),
+                ('status', models.CharField(choices=[('pending', 'Pending'), ('processing', 'Processing'), ('done', 'Done'), ('failed', 'Failed')], default='pending', max_length=20)),
+                ('attempts', models.PositiveSmallIntegerField(default=0)),
+                ('available_at', models.DateTimeField()),
+                ('locked_at', models.DateTimeField(blank=True, null=True)),
+                ('last_error', models.TextField(blank=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('finished_at', models.DateTimeField(blank=True, null=True)),
+                ('pendaftar', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='cv_jobs', to='magang.pendaftar')),
+            ],
+            options={
+                'verbose_name': 'CV Processing Job',
+                'verbose_name_plural': 'CV Processing Jobs',
+                'db_table': 't_cv_job',
+                'indexes': [models.Index(fields=['status', 'available_at'], name='magang_cv_job_queue_idx')],
+            },
+        ),
+    ]
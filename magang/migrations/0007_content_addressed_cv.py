@@ -0,0 +1,35 @@
+# Generated by Django 5.2.18 on 2026-10-18 09:03
+
+import magang.storage
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('magang', '0006_cv_processing_job'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CvBlob',
+            fields=[
+                ('id_blob', models.AutoField(primary_key=True, serialize=False)),
+                ('sha256', models.CharField(max_length=64, unique=True)),
+                ('path', models.CharField(max_length=255)),
+                ('size', models.BigIntegerField(default=0)),
+                ('ref_count', models.PositiveIntegerField(default=0)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'verbose_name': 'CV Blob',
+                'verbose_name_plural': 'CV Blobs',
+                'db_table': 'm_cv_blob',
+            },
+        ),
+        migrations.AlterField(
+            model_name='pendaftar',
+            name='path_cv',
+            field=models.FileField(storage=magang.storage.get_cv_storage, upload_to='cv/'),
+        ),
+    ]
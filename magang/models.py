@@ -1,4 +1,5 @@
 from django.db import models
+from .storage import get_cv_storage
     
 # Create your models here.
 class Departement(models.Model):
@@ -28,6 +29,7 @@ class Lowongan(models.Model):
         ordering = ['tanggal_mulai']  
         indexes = [
             models.Index(fields=['tanggal_mulai', 'departement']),
+            models.Index(fields=['-tanggal_mulai', 'id_lowongan'], name='magang_lowongan_keyset_idx'),
         ]
 
     def __str__(self):
@@ -45,9 +47,17 @@ class Pendaftar(models.Model):
     no_telp = models.CharField(max_length=20)
     university = models.CharField(max_length=255)
     major = models.CharField(max_length=255)
-    path_cv = models.FileField(upload_to='cv/')  
+    # Disimpan berdasarkan hash isi (cv/ab/cd/<sha256>.pdf), dihitung pemakaiannya di CvBlob
+    path_cv = models.FileField(upload_to='cv/', storage=get_cv_storage)  
     ipk = models.DecimalField(max_digits=4, decimal_places=2, null=True, blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
+    # Status file CV: upload diproses di background oleh CvProcessingJob
+    cv_status = models.CharField(
+        max_length=20,
+        choices=[('processing', 'Diproses'), ('ready', 'Siap'), ('invalid', 'Tidak Valid')],
+        default='ready'
+    )
+    cv_metadata = models.JSONField(default=dict, blank=True)
 
     class Meta:
         db_table = 'pendaftar'
@@ -76,6 +86,74 @@ class TransaksiPendaftaran(models.Model):
         verbose_name = 'Transaksi Pendaftaran'
         verbose_name_plural = 'Transaksi Pendaftaran'
         ordering = ['-created_at']  
+        indexes = [
+            # Keyset pagination daftar pendaftar di dashboard admin
+            models.Index(fields=['status', '-created_at', '-id_transaksi_pendaftaran'], name='magang_transaksi_pending_idx'),
+            models.Index(fields=['status', '-updated_at', '-id_transaksi_pendaftaran'], name='magang_transaksi_history_idx'),
+        ]
+        constraints = [
+            # Satu pendaftar hanya boleh satu kali melamar lowongan yang sama
+            models.UniqueConstraint(fields=['pendaftar', 'lowongan'], name='uniq_transaksi_pendaftar_lowongan'),
+        ]
 
     def __str__(self):
         return f"{self.pendaftar.name} - {self.lowongan.posisi} ({self.status})"
+
+
+class CvProcessingJob(models.Model):
+    """Antrian pemrosesan file CV yang di-upload (validasi, metadata, finalisasi file)"""
+    STATUS_PENDING = 'pending'
+    STATUS_PROCESSING = 'processing'
+    STATUS_DONE = 'done'
+    STATUS_FAILED = 'failed'
+
+    id_job = models.AutoField(primary_key=True)
+    pendaftar = models.ForeignKey(Pendaftar, on_delete=models.CASCADE, related_name='cv_jobs')
+    staging_path = models.CharField(max_length=255)
+    original_name = models.CharField(max_length=255)
+    status = models.CharField(
+        max_length=20,
+        choices=[
+            (STATUS_PENDING, 'Pending'),
+            (STATUS_PROCESSING, 'Processing'),
+            (STATUS_DONE, 'Done'),
+            (STATUS_FAILED, 'Failed'),
+        ],
+        default=STATUS_PENDING
+    )
+    attempts = models.PositiveSmallIntegerField(default=0)
+    available_at = models.DateTimeField()
+    locked_at = models.DateTimeField(null=True, blank=True)
+    last_error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        db_table = 't_cv_job'
+        verbose_name = 'CV Processing Job'
+        verbose_name_plural = 'CV Processing Jobs'
+        indexes = [
+            # Worker mengambil job pending yang sudah waktunya diproses
+            models.Index(fields=['status', 'available_at'], name='magang_cv_job_queue_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.original_name} ({self.status})"
+
+
+class CvBlob(models.Model):
+    """File CV unik berdasarkan isi; ref_count = jumlah Pendaftar yang memakai file ini"""
+    id_blob = models.AutoField(primary_key=True)
+    sha256 = models.CharField(max_length=64, unique=True)
+    path = models.CharField(max_length=255)
+    size = models.BigIntegerField(default=0)
+    ref_count = models.PositiveIntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        db_table = 'm_cv_blob'
+        verbose_name = 'CV Blob'
+        verbose_name_plural = 'CV Blobs'
+
+    def __str__(self):
+        return f"{self.path} ({self.ref_count})"
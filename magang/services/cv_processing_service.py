@@ -0,0 +1,242 @@
+import hashlib
+import logging
+import os
+import re
+import uuid
+from datetime import timedelta
+from django.conf import settings
+from django.core.files import File
+from django.core.files.move import file_move_safe
+from django.db import transaction
+from django.db.models import F, Q
+from django.utils import timezone
+from ..models import CvProcessingJob, Pendaftar
+from .cv_storage_service import CvStorageService
+
+logger = logging.getLogger(__name__)
+
+# Header PDF boleh didahului byte sampah, pembaca PDF mencari di 1024 byte pertama
+PDF_HEADER = b'%PDF-'
+PDF_HEADER_WINDOW = 1024
+PDF_TRAILER = b'%%EOF'
+PDF_TRAILER_WINDOW = 2048
+PDF_VERSION_RE = re.compile(rb'%PDF-(\d\.\d)')
+# Perkiraan jumlah halaman: objek /Type /Page (bukan /Pages)
+PDF_PAGE_RE = re.compile(rb'/Type\s*/Page(?![a-zA-Z])')
+READ_CHUNK_SIZE = 64 * 1024
+
+
+class InvalidCvError(Exception):
+    """File CV bukan PDF yang valid; job tidak diulang"""
+
+
+class CvProcessingService:
+    """
+    Pemrosesan file CV di luar request submit.
+    Request hanya memindahkan upload ke direktori staging dan membuat CvProcessingJob;
+    worker (manage.py process_cv_jobs) memvalidasi magic byte PDF, mengambil metadata,
+    lalu memindahkan file ke storage cv/.
+    """
+
+    @staticmethod
+    def stage_upload(uploaded_file):
+        """
+        Memindahkan file upload ke direktori staging
+        Args:
+            uploaded_file (UploadedFile): file dari request.FILES
+        Returns:
+            str: path absolut file staging
+        """
+        os.makedirs(settings.CV_STAGING_DIR, exist_ok=True)
+        staging_path = os.path.join(settings.CV_STAGING_DIR, f'{uuid.uuid4().hex}.pdf')
+        if hasattr(uploaded_file, 'temporary_file_path'):
+            # File besar sudah ditulis Django ke disk, cukup dipindah (rename jika satu filesystem)
+            file_move_safe(uploaded_file.temporary_file_path(), staging_path)
+        else:
+            with open(staging_path, 'wb') as destination:
+                for chunk in uploaded_file.chunks():
+                    destination.write(chunk)
+        return staging_path
+
+    @staticmethod
+    def discard_staged(staging_path):
+        """Menghapus file staging yang tidak jadi dipakai"""
+        try:
+            os.remove(staging_path)
+        except FileNotFoundError:
+            pass
+
+    @staticmethod
+    def discard_pendaftar_jobs(pendaftar_qs):
+        """
+        Menghapus file staging job yang belum selesai milik pendaftar di queryset setelah
+        commit; panggil sebelum queryset dihapus (job ikut terhapus lewat CASCADE)
+        """
+        staging_paths = list(CvProcessingJob.objects.filter(
+            pendaftar__in=pendaftar_qs,
+            status__in=[CvProcessingJob.STATUS_PENDING, CvProcessingJob.STATUS_PROCESSING]
+        ).values_list('staging_path', flat=True))
+
+        def discard():
+            for path in staging_paths:
+                CvProcessingService.discard_staged(path)
+
+        if staging_paths:
+            transaction.on_commit(discard)
+
+    @staticmethod
+    def enqueue(pendaftar, staging_path, original_name):
+        """Membuat job untuk file staging milik pendaftar"""
+        return CvProcessingJob.objects.create(
+            pendaftar=pendaftar,
+            staging_path=staging_path,
+            original_name=original_name,
+            available_at=timezone.now()
+        )
+
+    @staticmethod
+    def claim_jobs(limit):
+        """
+        Mengambil dan mengunci job yang siap diproses. Job 'processing' yang terkunci
+        lebih lama dari CV_JOB_STALE_AFTER (worker mati) ikut diambil kembali.
+        SELECT ... FOR UPDATE SKIP LOCKED membuat beberapa worker tidak mengambil job yang sama.
+        Returns:
+            list: CvProcessingJob yang sudah ditandai 'processing'
+        """
+        now = timezone.now()
+        stale_before = now - timedelta(seconds=settings.CV_JOB_STALE_AFTER)
+        with transaction.atomic():
+            jobs = list(
+                CvProcessingJob.objects.select_for_update(skip_locked=True)
+                .filter(
+                    Q(status=CvProcessingJob.STATUS_PENDING, available_at__lte=now)
+                    | Q(status=CvProcessingJob.STATUS_PROCESSING, locked_at__lt=stale_before)
+                )
+                .order_by('available_at', 'id_job')[:limit]
+            )
+            if jobs:
+                CvProcessingJob.objects.filter(id_job__in=[job.id_job for job in jobs]).update(
+                    status=CvProcessingJob.STATUS_PROCESSING,
+                    locked_at=now,
+                    attempts=F('attempts') + 1
+                )
+                for job in jobs:
+                    job.status = CvProcessingJob.STATUS_PROCESSING
+                    job.locked_at = now
+                    job.attempts += 1
+        return jobs
+
+    @staticmethod
+    def inspect_pdf(path):
+        """
+        Validasi magic byte PDF dan ambil metadata dalam satu kali baca file
+        Returns:
+            dict: {'size', 'sha256', 'pdf_version', 'pages'}
+        Raises:
+            InvalidCvError: file kosong atau bukan PDF
+        """
+        digest = hashlib.sha256()
+        size = 0
+        head = b''
+        tail = b''
+        pages = 0
+        carry = b''
+        with open(path, 'rb') as source:
+            for chunk in iter(lambda: source.read(READ_CHUNK_SIZE), b''):
+                digest.update(chunk)
+                size += len(chunk)
+                if len(head) < PDF_HEADER_WINDOW:
+                    head += chunk[:PDF_HEADER_WINDOW - len(head)]
+                tail = (tail + chunk)[-PDF_TRAILER_WINDOW:]
+                # Sisa 32 byte chunk sebelumnya agar penanda yang terpotong batas chunk tetap
+                # terhitung; hanya penanda yang berakhir di chunk ini yang dihitung
+                window = carry + chunk
+                pages += sum(1 for match in PDF_PAGE_RE.finditer(window) if match.end() > len(carry))
+                carry = window[-32:]
+
+        if size == 0:
+            raise InvalidCvError('File CV kosong')
+        if PDF_HEADER not in head:
+            raise InvalidCvError('File CV bukan PDF (header %PDF- tidak ditemukan)')
+        if PDF_TRAILER not in tail:
+            raise InvalidCvError('File CV PDF tidak lengkap (penanda %%EOF tidak ditemukan)')
+
+        version = PDF_VERSION_RE.search(head)
+        return {
+            'size': size,
+            'sha256': digest.hexdigest(),
+            'pdf_version': version.group(1).decode() if version else None,
+            'pages': pages or None,
+        }
+
+    @staticmethod
+    def _finalize(job, metadata):
+        """Memindahkan file staging ke storage cv/ dan menandai CV pendaftar siap"""
+        metadata = {**metadata, 'original_name': job.original_name}
+        with transaction.atomic(), open(job.staging_path, 'rb') as source:
+            # CV dengan isi yang sama memakai file yang sudah ada (CvBlob)
+            stored_name = CvStorageService.store(File(source), job.original_name, sha256=metadata['sha256'])
+            Pendaftar.objects.filter(pk=job.pendaftar_id).update(
+                path_cv=stored_name, cv_status='ready', cv_metadata=metadata
+            )
+            CvProcessingJob.objects.filter(pk=job.pk).update(
+                status=CvProcessingJob.STATUS_DONE, finished_at=timezone.now(), last_error=''
+            )
+        CvProcessingService.discard_staged(job.staging_path)
+
+    @staticmethod
+    def _fail(job, error, retry):
+        now = timezone.now()
+        if retry and job.attempts < settings.CV_JOB_MAX_ATTEMPTS:
+            # Backoff eksponensial: delay, 2x delay, 4x delay, ...
+            delay = settings.CV_JOB_RETRY_DELAY * (2 ** (job.attempts - 1))
+            CvProcessingJob.objects.filter(pk=job.pk).update(
+                status=CvProcessingJob.STATUS_PENDING,
+                available_at=now + timedelta(seconds=delay),
+                locked_at=None,
+                last_error=error
+            )
+            return CvProcessingJob.STATUS_PENDING
+
+        with transaction.atomic():
+            CvProcessingJob.objects.filter(pk=job.pk).update(
+                status=CvProcessingJob.STATUS_FAILED, finished_at=now, last_error=error
+            )
+            Pendaftar.objects.filter(pk=job.pendaftar_id).update(cv_status='invalid')
+        CvProcessingService.discard_staged(job.staging_path)
+        return CvProcessingJob.STATUS_FAILED
+
+    @staticmethod
+    def process_job(job):
+        """
+        Memproses satu job yang sudah di-claim
+        Returns:
+            str: status akhir job ('done', 'pending' jika dijadwalkan ulang, atau 'failed')
+        """
+        try:
+            metadata = CvProcessingService.inspect_pdf(job.staging_path)
+        except InvalidCvError as e:
+            return CvProcessingService._fail(job, str(e), retry=False)
+        except FileNotFoundError:
+            return CvProcessingService._fail(job, 'File staging tidak ditemukan', retry=False)
+        except OSError as e:
+            return CvProcessingService._fail(job, f'Gagal membaca file: {e}', retry=True)
+
+        try:
+            CvProcessingService._finalize(job, metadata)
+        except Exception as e:
+            logger.exception('Finalisasi CV job %s gagal', job.pk)
+            return CvProcessingService._fail(job, f'Gagal menyimpan file: {e}', retry=True)
+        return CvProcessingJob.STATUS_DONE
+
+    @staticmethod
+    def run_pending(limit=20):
+        """
+        Claim lalu proses satu batch job
+        Returns:
+            dict: jumlah job per status akhir
+        """
+        summary = {CvProcessingJob.STATUS_DONE: 0, CvProcessingJob.STATUS_PENDING: 0, CvProcessingJob.STATUS_FAILED: 0}
+        for job in CvProcessingService.claim_jobs(limit):
+            summary[CvProcessingService.process_job(job)] += 1
+        return summary
@@ -0,0 +1,179 @@
+import os
+import time
+from collections import Counter
+from django.db import IntegrityError, transaction
+from datetime import timedelta
+from django.db.models import Count, F
+from django.utils import timezone
+from ..models import CvBlob, Pendaftar
+from ..storage import cv_storage, digest_from_name
+
+CV_PREFIX = 'cv'
+
+
+class CvStorageService:
+    """
+    Reference counting file CV content-addressed (ContentAddressedStorage).
+    Setiap Pendaftar yang path_cv-nya menunjuk file cv/ab/cd/<sha256>.pdf menambah
+    ref_count CvBlob; file dihapus dari disk ketika ref_count kembali 0. Baris CvBlob
+    dengan ref_count 0 dibiarkan sampai filenya dihapus, agar penghapusan file dan
+    store() dengan isi yang sama saling menunggu lewat lock baris tersebut.
+    File lama dengan nama asli (cv/nama.pdf) tidak dihitung dan tidak pernah dihapus.
+    Penghapusan Pendaftar (langsung maupun CASCADE dari lowongan/departemen) harus
+    memanggil release_pendaftar() sebelum delete(), sama seperti record_deletion counter
+    dan CvProcessingService.discard_pendaftar_jobs() untuk file staging.
+    """
+
+    @staticmethod
+    def _acquire(name, size):
+        """Menambah ref_count blob untuk name (dipanggil di dalam transaksi)"""
+        digest = digest_from_name(name)
+        updated = CvBlob.objects.filter(sha256=digest).update(ref_count=F('ref_count') + 1)
+        if updated:
+            return
+        try:
+            with transaction.atomic():
+                CvBlob.objects.create(sha256=digest, path=name, size=size, ref_count=1)
+        except IntegrityError:
+            # Blob yang sama baru dibuat request lain
+            CvBlob.objects.filter(sha256=digest).update(ref_count=F('ref_count') + 1)
+
+    @staticmethod
+    def store(content, original_name, sha256=None):
+        """
+        Menyimpan file CV (atau memakai file yang isinya sama) dan menambah ref_count.
+        Harus dipanggil di dalam transaksi yang sama dengan penyimpanan path_cv.
+        Args:
+            content (File): isi file
+            original_name (str): nama file asli, dipakai untuk ekstensi
+            sha256 (str): hash isi jika sudah diketahui; blob yang sudah ada tidak ditulis ulang
+        Returns:
+            str: nama file di storage untuk disimpan ke Pendaftar.path_cv
+        """
+        ext = os.path.splitext(original_name)[1].lower() or '.pdf'
+        with transaction.atomic(savepoint=False):
+            blob = None
+            if sha256:
+                blob = CvBlob.objects.select_for_update().filter(sha256=sha256).first()
+            # File blob bisa hilang jika GC berjalan bersamaan; tulis ulang dari content
+            if blob is not None and cv_storage.exists(blob.path):
+                name = blob.path
+            else:
+                name = cv_storage.save(f'{CV_PREFIX}/upload{ext}', content)
+            CvStorageService._acquire(name, content.size)
+            # _acquire menunggu _delete_files yang sedang memegang lock blob ini; jika file
+            # sempat terhapus sebelum lock didapat, tulis ulang (baris blob sekarang milik kita)
+            if not cv_storage.exists(name):
+                cv_storage.save(f'{CV_PREFIX}/upload{ext}', content)
+        return name
+
+    @staticmethod
+    def release(names):
+        """
+        Mengurangi ref_count untuk setiap nama file (boleh berulang). File yang tidak
+        dipakai lagi dihapus dari disk setelah transaksi di-commit.
+        """
+        released = Counter(digest for digest in map(digest_from_name, names) if digest)
+        if not released:
+            return
+        with transaction.atomic(savepoint=False):
+            blobs = CvBlob.objects.select_for_update().filter(sha256__in=list(released))
+            orphans = []
+            for blob in blobs:
+                remaining = max(blob.ref_count - released[blob.sha256], 0)
+                CvBlob.objects.filter(pk=blob.pk).update(ref_count=remaining)
+                if not remaining:
+                    orphans.append(blob.sha256)
+            if orphans:
+                transaction.on_commit(lambda: CvStorageService._delete_files(orphans))
+
+    @staticmethod
+    def release_pendaftar(pendaftar_qs):
+        """Melepas file CV semua pendaftar di queryset; panggil sebelum queryset dihapus"""
+        CvStorageService.release(
+            pendaftar_qs.filter(path_cv__startswith=f'{CV_PREFIX}/').values_list('path_cv', flat=True)
+        )
+
+    @staticmethod
+    def _delete_files(digests):
+        """
+        Menghapus file dan baris blob yang ref_count-nya masih 0. Lock baris blob membuat
+        store() dengan isi yang sama menunggu (atau ditunggu): blob yang sudah dipakai lagi
+        dilewati, dan store() yang datang setelahnya menulis ulang filenya.
+        """
+        for digest in digests:
+            with transaction.atomic():
+                blob = CvBlob.objects.select_for_update().filter(sha256=digest, ref_count=0).first()
+                if blob is None:
+                    continue
+                cv_storage.delete(blob.path)
+                blob.delete()
+
+    @staticmethod
+    def collect_garbage(grace_seconds=3600, dry_run=False):
+        """
+        Menyamakan ref_count dengan Pendaftar dan menghapus file yang tidak dipakai:
+        blob tanpa pendaftar, serta file content-addressed tanpa CvBlob (misal proses
+        berhenti setelah menulis file tetapi sebelum commit). Blob dan file yang lebih muda
+        dari grace_seconds tidak dihapus.
+        Returns:
+            dict: {'recounted': int, 'deleted_blobs': int, 'deleted_files': int, 'freed_bytes': int}
+        """
+        result = {'recounted': 0, 'deleted_blobs': 0, 'deleted_files': 0, 'freed_bytes': 0}
+        blob_cutoff = timezone.now() - timedelta(seconds=grace_seconds)
+        with transaction.atomic():
+            # Blob dikunci dulu: store()/release() yang sedang berjalan selesai (commit)
+            # sebelum pemakaian dihitung, jadi pendaftar barunya ikut terhitung
+            blobs = list(CvBlob.objects.select_for_update())
+            usage = dict(
+                Pendaftar.objects.filter(path_cv__startswith=f'{CV_PREFIX}/')
+                .values_list('path_cv').annotate(total=Count('pk')).order_by()
+            )
+            orphans = []
+            tracked = set()
+            for blob in blobs:
+                tracked.add(blob.path)
+                actual = usage.get(blob.path, 0)
+                if actual == 0:
+                    # Blob baru bisa milik transaksi yang belum menyimpan pendaftarnya
+                    if blob.created_at <= blob_cutoff:
+                        orphans.append(blob)
+                elif actual != blob.ref_count:
+                    result['recounted'] += 1
+                    if not dry_run:
+                        CvBlob.objects.filter(pk=blob.pk).update(ref_count=actual)
+            result['deleted_blobs'] = len(orphans)
+            result['freed_bytes'] = sum(blob.size for blob in orphans)
+            if orphans and not dry_run:
+                CvBlob.objects.filter(pk__in=[blob.pk for blob in orphans]).update(ref_count=0)
+                digests = [blob.sha256 for blob in orphans]
+                transaction.on_commit(lambda: CvStorageService._delete_files(digests))
+
+            # File yang dipakai pendaftar tetapi belum punya CvBlob dicatat ulang
+            for path in set(usage) - tracked:
+                digest = digest_from_name(path)
+                if digest is None:
+                    continue
+                result['recounted'] += 1
+                if not dry_run:
+                    size = cv_storage.size(path) if cv_storage.exists(path) else 0
+                    CvBlob.objects.create(sha256=digest, path=path, size=size, ref_count=usage[path])
+
+            known = tracked | set(usage)
+
+        cutoff = time.time() - grace_seconds
+        root = cv_storage.path(CV_PREFIX)
+        for directory, _dirs, files in os.walk(root):
+            for filename in files:
+                full_path = os.path.join(directory, filename)
+                name = os.path.relpath(full_path, cv_storage.location).replace(os.sep, '/')
+                # File upload lama (cv/nama.pdf) tidak disentuh; file sementara yang tertinggal ikut dibersihkan
+                if not (digest_from_name(name) or filename.startswith('.upload-')) or name in known:
+                    continue
+                if os.path.getmtime(full_path) > cutoff:
+                    continue
+                result['deleted_files'] += 1
+                result['freed_bytes'] += os.path.getsize(full_path)
+                if not dry_run:
+                    os.remove(full_path)
+        return result
@@ -0,0 +1,262 @@
+import csv
+import json
+import time
+from datetime import date
+from decimal import Decimal, InvalidOperation
+from django.db import IntegrityError, transaction
+from admin_dashboard.counter_service import DashboardCounterService
+from admin_dashboard.signals import invalidate_dashboard_cache
+from ..models import Lowongan, Pendaftar, TransaksiPendaftaran
+from .search_service import SearchService
+
+IMPORT_FORMATS = ('csv', 'jsonl')
+IMPORT_REQUIRED_FIELDS = ('nik', 'name', 'gender', 'dob', 'address', 'no_telp', 'university', 'major', 'id_lowongan')
+IMPORT_MAX_LENGTHS = {'nik': 20, 'name': 255, 'no_telp': 20, 'university': 255, 'major': 255}
+# Chunk besar mengurangi jumlah commit; di SQLite satu bulk_create tetap dipecah per ~70 baris
+IMPORT_CHUNK_SIZE = 5000
+# Error per baris yang dikembalikan dibatasi, jumlah baris gagal tetap dihitung semua
+IMPORT_MAX_REPORTED_ERRORS = 1000
+# Percobaan ulang satu chunk jika NIK yang sama di-insert proses lain di tengah import
+IMPORT_CHUNK_ATTEMPTS = 3
+
+
+def detect_format(filename, default='csv'):
+    """Format dari ekstensi file (.csv, .jsonl/.ndjson)"""
+    name = (filename or '').lower()
+    if name.endswith(('.jsonl', '.ndjson')):
+        return 'jsonl'
+    if name.endswith('.csv'):
+        return 'csv'
+    return default
+
+
+def read_rows(stream, file_format):
+    """
+    Membaca baris file import
+    Args:
+        stream: file teks (newline='' untuk CSV)
+        file_format (str): 'csv' atau 'jsonl'
+    Yields:
+        tuple: (nomor baris, dict data atau None, pesan error atau None)
+    """
+    if file_format == 'csv':
+        reader = csv.DictReader(stream)
+        for data in reader:
+            yield reader.line_num, data, None
+        return
+
+    for line_number, line in enumerate(stream, 1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            data = json.loads(line)
+        except ValueError as e:
+            yield line_number, None, f'JSON tidak valid: {e}'
+            continue
+        if not isinstance(data, dict):
+            yield line_number, None, 'Setiap baris JSONL harus berupa object'
+            continue
+        yield line_number, data, None
+
+
+def _clean(data, lowongan_map):
+    """
+    Validasi dan normalisasi satu baris
+    Returns:
+        tuple: (dict bersih, list pesan error)
+    """
+    cleaned = {}
+    errors = []
+    for field in IMPORT_REQUIRED_FIELDS + ('ipk',):
+        value = data.get(field)
+        cleaned[field] = str(value).strip() if value is not None else ''
+
+    for field in IMPORT_REQUIRED_FIELDS:
+        if not cleaned[field]:
+            errors.append(f'{field} wajib diisi')
+    for field, max_length in IMPORT_MAX_LENGTHS.items():
+        if len(cleaned[field]) > max_length:
+            errors.append(f'{field} maksimal {max_length} karakter')
+
+    if cleaned['nik'] and not cleaned['nik'].isdigit():
+        errors.append('nik harus berupa angka')
+    if cleaned['gender'] and cleaned['gender'] not in ('L', 'P'):
+        errors.append('gender harus L atau P')
+
+    if cleaned['dob']:
+        try:
+            cleaned['dob'] = date.fromisoformat(cleaned['dob'])
+        except ValueError:
+            errors.append('dob harus berformat YYYY-MM-DD')
+
+    if cleaned['ipk']:
+        try:
+            ipk = Decimal(cleaned['ipk']).quantize(Decimal('0.01'))
+            if not Decimal('0') <= ipk <= Decimal('4'):
+                raise InvalidOperation
+            cleaned['ipk'] = ipk
+        except (InvalidOperation, ValueError):
+            errors.append('ipk harus angka 0 - 4')
+    else:
+        cleaned['ipk'] = None
+
+    if cleaned['id_lowongan']:
+        try:
+            cleaned['lowongan'] = lowongan_map[int(cleaned['id_lowongan'])]
+        except (KeyError, ValueError):
+            errors.append(f"lowongan {cleaned['id_lowongan']} tidak ditemukan")
+    return cleaned, errors
+
+
+class ImportService:
+    """
+    Import pendaftar dari file CSV/JSONL (kiriman kampus mitra) ke Pendaftar dan
+    TransaksiPendaftaran dengan bulk_create per chunk. Aturannya sama dengan submit
+    pendaftaran: NIK yang sudah terdaftar memakai pendaftar yang ada, pasangan
+    (NIK, lowongan) yang sudah ada dilaporkan sebagai duplikat.
+    Kolom: nik, name, gender (L/P), dob (YYYY-MM-DD), address, no_telp, university,
+    major, ipk (opsional), id_lowongan.
+    """
+
+    @staticmethod
+    def _new_summary():
+        return {
+            'processed': 0,
+            'created_pendaftar': 0,
+            'reused_pendaftar': 0,
+            'created_transaksi': 0,
+            'duplicates': 0,
+            'failed': 0,
+            'errors': [],
+            'errors_truncated': False,
+        }
+
+    @staticmethod
+    def _report(summary, row_number, nik, errors):
+        summary['failed'] += 1
+        if len(summary['errors']) < IMPORT_MAX_REPORTED_ERRORS:
+            summary['errors'].append({'row': row_number, 'nik': nik or None, 'errors': errors})
+        else:
+            summary['errors_truncated'] = True
+
+    @staticmethod
+    def _insert_chunk(chunk):
+        """
+        Insert satu chunk baris valid dalam satu transaksi
+        Returns:
+            dict: hitungan chunk dan list (nomor baris, nik, error) untuk duplikat
+        """
+        niks = {cleaned['nik'] for _, cleaned in chunk}
+        existing = dict(Pendaftar.objects.filter(nik__in=niks).values_list('nik', 'id_pendaftar'))
+        existing_pairs = set(
+            TransaksiPendaftaran.objects.filter(pendaftar_id__in=existing.values())
+            .values_list('pendaftar_id', 'lowongan_id')
+        )
+
+        new_pendaftar = {}
+        accepted = []
+        duplicates = []
+        seen = set()
+        for row_number, cleaned in chunk:
+            nik = cleaned['nik']
+            lowongan = cleaned['lowongan']
+            if (nik, lowongan.id_lowongan) in seen or (existing.get(nik), lowongan.id_lowongan) in existing_pairs:
+                duplicates.append((row_number, nik, ['NIK sudah terdaftar pada lowongan ini']))
+                continue
+            seen.add((nik, lowongan.id_lowongan))
+            if nik not in existing and nik not in new_pendaftar:
+                new_pendaftar[nik] = Pendaftar(
+                    lowongan=lowongan,
+                    nik=nik,
+                    name=cleaned['name'],
+                    gender=cleaned['gender'],
+                    dob=cleaned['dob'],
+                    address=cleaned['address'],
+                    no_telp=cleaned['no_telp'],
+                    university=cleaned['university'],
+                    major=cleaned['major'],
+                    ipk=cleaned['ipk'],
+                    path_cv=''
+                )
+            accepted.append((nik, lowongan))
+
+        Pendaftar.objects.bulk_create(new_pendaftar.values())
+        pendaftar_ids = dict(existing)
+        pendaftar_ids.update((nik, pendaftar.pk) for nik, pendaftar in new_pendaftar.items())
+        if new_pendaftar and None in pendaftar_ids.values():
+            # Database tanpa RETURNING pada bulk insert
+            pendaftar_ids.update(Pendaftar.objects.filter(nik__in=new_pendaftar).values_list('nik', 'id_pendaftar'))
+
+        transaksi_list = TransaksiPendaftaran.objects.bulk_create([
+            TransaksiPendaftaran(pendaftar_id=pendaftar_ids[nik], lowongan=lowongan, status='pending')
+            for nik, lowongan in accepted
+        ])
+        DashboardCounterService.record_bulk_submission(new_pendaftar.values(), transaksi_list)
+
+        return {
+            'created_pendaftar': len(new_pendaftar),
+            'reused_pendaftar': sum(1 for nik, _ in accepted if nik in existing),
+            'created_transaksi': len(transaksi_list),
+        }, duplicates
+
+    @staticmethod
+    def import_rows(rows, chunk_size=IMPORT_CHUNK_SIZE, progress=None):
+        """
+        Import baris dari read_rows()
+        Args:
+            rows (iterable): (nomor baris, dict data atau None, pesan error atau None)
+            chunk_size (int): jumlah baris per bulk_create/transaksi
+            progress (callable): progress(summary) dipanggil setiap selesai satu chunk
+        Returns:
+            dict: processed, created_pendaftar, reused_pendaftar, created_transaksi,
+                  duplicates, failed, errors [{'row', 'nik', 'errors'}], errors_truncated,
+                  elapsed (detik), rows_per_second. failed termasuk baris duplikat.
+        """
+        started = time.perf_counter()
+        summary = ImportService._new_summary()
+        lowongan_map = {lowongan.id_lowongan: lowongan for lowongan in Lowongan.objects.only('id_lowongan', 'departement_id')}
+
+        def flush(chunk):
+            for attempt in range(IMPORT_CHUNK_ATTEMPTS):
+                try:
+                    with transaction.atomic():
+                        counts, duplicates = ImportService._insert_chunk(chunk)
+                    break
+                except IntegrityError:
+                    # NIK/pasangan baru dibuat proses lain: baca ulang data yang ada lalu ulangi
+                    if attempt == IMPORT_CHUNK_ATTEMPTS - 1:
+                        raise
+            for key, value in counts.items():
+                summary[key] += value
+            summary['duplicates'] += len(duplicates)
+            for row_number, nik, errors in duplicates:
+                ImportService._report(summary, row_number, nik, errors)
+            if progress:
+                progress(summary)
+
+        chunk = []
+        for row_number, data, error in rows:
+            summary['processed'] += 1
+            if error:
+                ImportService._report(summary, row_number, None, [error])
+                continue
+            cleaned, errors = _clean(data, lowongan_map)
+            if errors:
+                ImportService._report(summary, row_number, cleaned['nik'], errors)
+                continue
+            chunk.append((row_number, cleaned))
+            if len(chunk) >= chunk_size:
+                flush(chunk)
+                chunk = []
+        if chunk:
+            flush(chunk)
+
+        # bulk_create tidak memicu signal post_save
+        SearchService.invalidate()
+        transaction.on_commit(SearchService.invalidate)
+        invalidate_dashboard_cache()
+
+        summary['elapsed'] = round(time.perf_counter() - started, 3)
+        summary['rows_per_second'] = round(summary['processed'] / summary['elapsed']) if summary['elapsed'] else 0
+        return summary
@@ -1,7 +1,36 @@
-from django.db.models import Q
+from django.db import connection
+from admin_dashboard.counter_service import DashboardCounterService
+from admin_dashboard.metrics import instrument_service
 from ..models import Lowongan
+from .pagination import KeysetPaginator
+from .projection import Projection
+from .search_cache import SearchResultCache
+from .search_service import SearchService, score_document
 
 
+# Urutan feed publik: terbaru dulu, id sebagai pemecah seri agar cursor stabil
+LOWONGAN_PAGINATOR = KeysetPaginator(['-tanggal_mulai', 'id_lowongan'], default_limit=12, max_limit=100)
+# Urutan hasil pencarian: paling relevan dulu
+LOWONGAN_SEARCH_PAGINATOR = KeysetPaginator(['-search_rank', 'id_lowongan'], default_limit=12, max_limit=100)
+
+# Nama counter versi feed lowongan, naik setiap Lowongan/Departement berubah
+LOWONGAN_FEED_VERSION = 'lowongan'
+
+# Kolom yang dikirim ke /api/lowongan/
+LOWONGAN_API_PROJECTION = Projection(
+    ['id_lowongan', 'posisi', 'departement__nama_dept', 'deskripsi', 'tanggal_mulai', 'tanggal_selesai'],
+    lambda row, fmt: {
+        'id_lowongan': row['id_lowongan'],
+        'posisi': row['posisi'],
+        'nama_dept': row['departement__nama_dept'],
+        'deskripsi': row['deskripsi'],
+        'tanggal_mulai': fmt(row['tanggal_mulai'], '%Y-%m-%d'),
+        'tanggal_selesai': fmt(row['tanggal_selesai'], '%Y-%m-%d'),
+    }
+)
+
+
+@instrument_service
 class LowonganService:
     """Service untuk mengelola Lowongan (List & Search)"""
     
@@ -13,19 +42,84 @@ class LowonganService:
     @staticmethod
     def search_lowongan(query):
         """
-        Mencari lowongan berdasarkan posisi atau nama departemen
+        Mencari lowongan berdasarkan posisi, deskripsi atau nama departemen
         Args:
             query (str): kata kunci pencarian
         Returns:
-            QuerySet: Hasil pencarian lowongan
+            QuerySet: Hasil pencarian lowongan, paling relevan dulu
         """
         if not query:
             return LowonganService.get_all_lowongan()
         
-        return Lowongan.objects.select_related('departement').filter(
-            Q(posisi__icontains=query) | 
-            Q(departement__nama_dept__icontains=query)
-        ).order_by('-tanggal_mulai')
+        return SearchService.search_lowongan(
+            Lowongan.objects.select_related('departement'), query
+        ).order_by('-search_rank', '-tanggal_mulai')
+    
+    @staticmethod
+    def get_lowongan_page(query='', cursor=None, limit=None):
+        """
+        Mendapatkan satu halaman lowongan dengan keyset pagination
+        Args:
+            query (str): kata kunci pencarian
+            cursor (str): cursor dari halaman sebelumnya
+            limit (int): jumlah lowongan per halaman
+        Returns:
+            dict: {'items': [dict], 'next_cursor': str atau None, 'has_more': bool}
+        """
+        if query:
+            rows = LOWONGAN_SEARCH_CACHE.get(query)
+            if rows is not None:
+                page = LOWONGAN_SEARCH_PAGINATOR.paginate_list(rows, cursor, limit)
+                page['items'] = [
+                    {key: value for key, value in row.items() if key != 'search_rank'}
+                    for row in page['items']
+                ]
+                return page
+        
+        paginator = LOWONGAN_SEARCH_PAGINATOR if query else LOWONGAN_PAGINATOR
+        return LOWONGAN_API_PROJECTION.paginate(paginator, LowonganService.search_lowongan(query), cursor, limit)
+    
+    @staticmethod
+    def count_lowongan(query='', estimate=False):
+        """
+        Menghitung jumlah lowongan untuk pencarian
+        Args:
+            query (str): kata kunci pencarian
+            estimate (bool): gunakan estimasi statistik PostgreSQL jika tanpa pencarian
+        Returns:
+            int: jumlah lowongan
+        """
+        if query:
+            rows = LOWONGAN_SEARCH_CACHE.get(query)
+            if rows is not None:
+                return len(rows)
+        
+        if estimate and not query and connection.vendor == 'postgresql':
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    'SELECT reltuples::bigint FROM pg_class WHERE oid = %s::regclass',
+                    [Lowongan._meta.db_table]
+                )
+                row = cursor.fetchone()
+            # reltuples bernilai -1 jika tabel belum pernah di-ANALYZE
+            if row and row[0] >= 0:
+                return row[0]
+        
+        return LowonganService.search_lowongan(query).count()
+    
+    @staticmethod
+    def get_feed_marker():
+        """
+        Penanda perubahan feed lowongan untuk ETag/Last-Modified (satu query ringan)
+        Returns:
+            tuple: (versi, waktu perubahan terakhir atau None)
+        """
+        return DashboardCounterService.get_version(LOWONGAN_FEED_VERSION)
+    
+    @staticmethod
+    def bump_feed_version():
+        """Menandai feed lowongan berubah, dipanggil di dalam transaksi perubahan data"""
+        DashboardCounterService.bump_version(LOWONGAN_FEED_VERSION)
     
     @staticmethod
     def get_lowongan_by_id(id_lowongan):
@@ -35,3 +129,67 @@ class LowonganService:
         except Lowongan.DoesNotExist:
             return None
 
+
+def _score_lowongan_row(row, term):
+    # Bobot sama dengan index pencarian: posisi > deskripsi, frasa di posisi/departemen
+    return score_document(
+        term,
+        [(row['posisi'], 1.0), (row['deskripsi'], 0.4)],
+        [row['posisi'], row['nama_dept']]
+    )
+
+
+def _rank_lowongan_rows(rows, term, keep_unmatched=False):
+    ranked = []
+    for row in rows:
+        score = _score_lowongan_row(row, term)
+        if score is None and not keep_unmatched:
+            continue
+        ranked.append(dict(row, search_rank=score or 0.0))
+    ranked.sort(key=lambda row: (-row['search_rank'], row['id_lowongan']))
+    return ranked
+
+
+def _database_ranked_rows(queryset, term, max_rows):
+    # Rank PostgreSQL (ts_rank + trigram) disimpan apa adanya agar urutan dan nilai
+    # cursor sama persis dengan query database
+    queryset = SearchService.search_lowongan(queryset, term).order_by(*LOWONGAN_SEARCH_PAGINATOR.ordering)
+    rows = list(LOWONGAN_API_PROJECTION.values(queryset, ['search_rank'])[:max_rows + 1])
+    if len(rows) > max_rows:
+        return None
+    return [
+        dict(item, search_rank=row['search_rank'])
+        for row, item in zip(rows, LOWONGAN_API_PROJECTION.serialize(rows))
+    ]
+
+
+def _refine_lowongan_rows(rows, term):
+    matched = _rank_lowongan_rows(rows, term)
+    if not SearchService.uses_database_index() or not matched:
+        return matched
+    # Rank PostgreSQL tidak bisa dihitung di Python: baris yang cocok di memori diurutkan
+    # ulang dengan satu query yang dibatasi pada id tersebut (paling banyak MAX_ROWS)
+    ids = [row['id_lowongan'] for row in matched]
+    return _database_ranked_rows(Lowongan.objects.filter(id_lowongan__in=ids), term, len(ids))
+
+
+def _compute_lowongan_search(term, max_rows):
+    if SearchService.uses_database_index():
+        return _database_ranked_rows(Lowongan.objects.all(), term, max_rows)
+
+    queryset = SearchService.search_lowongan(Lowongan.objects.all(), term, rank=False)
+    rows = list(LOWONGAN_API_PROJECTION.iterate(queryset[:max_rows + 1]))
+    if len(rows) > max_rows:
+        return None
+    # Baris yang cocok di database tetap dipakai walau tokenisasi Python sedikit berbeda
+    return _rank_lowongan_rows(rows, term, keep_unmatched=True)
+
+
+# Cache hasil pencarian feed publik; versi sama dengan ETag feed sehingga
+# perubahan di proses lain juga membuat entry lama tidak terpakai
+LOWONGAN_SEARCH_CACHE = SearchResultCache(
+    compute=_compute_lowongan_search,
+    refine=_refine_lowongan_rows,
+    version=LowonganService.get_feed_marker,
+    setting_prefix='LOWONGAN_SEARCH_CACHE'
+)
@@ -0,0 +1,139 @@
+import base64
+import binascii
+import json
+from datetime import date, datetime
+from decimal import Decimal
+from django.db.models import Q
+
+
+class KeysetPaginator:
+    """
+    Keyset (cursor) pagination untuk queryset dengan urutan tetap.
+    Halaman berikutnya diambil dengan WHERE pada nilai kolom urutan baris
+    terakhir, bukan OFFSET, sehingga biaya per halaman tetap konstan.
+    Field urutan terakhir harus unik (biasanya primary key).
+    """
+
+    def __init__(self, ordering, default_limit=20, max_limit=100):
+        """
+        Args:
+            ordering (list): urutan field, contoh ['-tanggal_mulai', 'id_lowongan']
+            default_limit (int): jumlah baris per halaman jika limit tidak diisi
+            max_limit (int): batas maksimal jumlah baris per halaman
+        """
+        self.ordering = list(ordering)
+        self.fields = [field.lstrip('-') for field in self.ordering]
+        self.default_limit = default_limit
+        self.max_limit = max_limit
+
+    def parse_limit(self, limit):
+        """Validasi parameter limit dari request"""
+        if limit in (None, ''):
+            return self.default_limit
+        try:
+            limit = int(limit)
+        except (TypeError, ValueError):
+            raise ValueError('Limit harus berupa angka')
+        if limit < 1:
+            raise ValueError('Limit minimal 1')
+        return min(limit, self.max_limit)
+
+    @staticmethod
+    def _serialize(value):
+        # isoformat() dipakai langsung agar presisi mikrodetik tidak hilang
+        if isinstance(value, (datetime, date)):
+            return value.isoformat()
+        if isinstance(value, Decimal):
+            return str(value)
+        return value
+
+    @staticmethod
+    def _value(row, field):
+        return row[field] if isinstance(row, dict) else getattr(row, field)
+
+    def encode_cursor(self, row):
+        """Membuat cursor opaque dari baris terakhir halaman"""
+        payload = {
+            'o': ','.join(self.ordering),
+            'v': [self._serialize(self._value(row, field)) for field in self.fields],
+        }
+        raw = json.dumps(payload, separators=(',', ':')).encode()
+        return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+    def decode_cursor(self, cursor):
+        """Membaca nilai urutan dari cursor"""
+        try:
+            raw = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4))
+            payload = json.loads(raw)
+            values = payload['v']
+        except (binascii.Error, ValueError, TypeError, KeyError):
+            raise ValueError('Cursor tidak valid')
+        if payload.get('o') != ','.join(self.ordering) or len(values) != len(self.fields):
+            raise ValueError('Cursor tidak valid untuk urutan ini')
+        return values
+
+    def keyset_filter(self, values):
+        """
+        Membuat kondisi baris setelah cursor:
+        (a > x) OR (a = x AND b > y) OR ... sesuai arah urutan setiap field
+        """
+        condition = Q()
+        for i, field in enumerate(self.ordering):
+            lookup = 'lt' if field.startswith('-') else 'gt'
+            term = Q(**{f'{self.fields[j]}': values[j] for j in range(i)})
+            term &= Q(**{f'{self.fields[i]}__{lookup}': values[i]})
+            condition |= term
+        return condition
+
+    def paginate(self, queryset, cursor=None, limit=None):
+        """
+        Mengambil satu halaman dari queryset
+        Args:
+            queryset (QuerySet): queryset yang sudah difilter
+            cursor (str): cursor dari halaman sebelumnya (opsional)
+            limit (int): jumlah baris per halaman
+        Returns:
+            dict: {'items': list, 'next_cursor': str atau None, 'has_more': bool}
+        """
+        limit = self.parse_limit(limit)
+        if cursor:
+            queryset = queryset.filter(self.keyset_filter(self.decode_cursor(cursor)))
+
+        items = list(queryset.order_by(*self.ordering)[:limit + 1])
+        has_more = len(items) > limit
+        items = items[:limit]
+
+        return {
+            'items': items,
+            'next_cursor': self.encode_cursor(items[-1]) if has_more else None,
+            'has_more': has_more
+        }
+
+    def _is_after(self, row, values):
+        """Apakah baris berada setelah nilai cursor menurut urutan paginator"""
+        for field, ordering, value in zip(self.fields, self.ordering, values):
+            current = self._value(row, field)
+            if current == value:
+                continue
+            return current < value if ordering.startswith('-') else current > value
+        return False
+
+    def paginate_list(self, rows, cursor=None, limit=None):
+        """
+        Seperti paginate(), untuk list dict di memori yang sudah terurut sesuai ordering.
+        Field urutan harus berupa angka atau string agar bisa dibandingkan dengan nilai cursor.
+        """
+        limit = self.parse_limit(limit)
+        start = 0
+        if cursor:
+            values = self.decode_cursor(cursor)
+            start = next((i for i, row in enumerate(rows) if self._is_after(row, values)), len(rows))
+
+        items = rows[start:start + limit]
+        has_more = start + limit < len(rows)
+
+        return {
+            'items': items,
+            'next_cursor': self.encode_cursor(items[-1]) if has_more else None,
+            'has_more': has_more
+        }
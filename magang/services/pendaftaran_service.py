@@ -1,6 +1,13 @@
+from django.core.files import File
+from django.db import IntegrityError, transaction
 from django.db.models import Q
+from admin_dashboard.counter_service import DashboardCounterService
+from admin_dashboard.metrics import instrument_service
 from ..models import Lowongan, Pendaftar, TransaksiPendaftaran
+from .cv_processing_service import CvProcessingService
+from .cv_storage_service import CvStorageService
 
+@instrument_service
 class PendaftaranService:
     """Service untuk mengelola proses pendaftaran"""
     
@@ -62,67 +69,112 @@ class PendaftaranService:
                 'message': 'NIK belum terdaftar'
             }
     
+    @staticmethod
+    def _insert_or_get_pendaftar(lowongan, data):
+        """
+        Insert pendaftar baru, atau ambil pendaftar dengan NIK yang sama jika insert
+        bentrok dengan unique constraint (termasuk yang baru dibuat request lain)
+        Returns:
+            tuple: (Pendaftar, dibuat_baru)
+        """
+        path_cv = data.get('path_cv', '')
+        if isinstance(path_cv, File):
+            path_cv = CvStorageService.store(path_cv, path_cv.name)
+        pendaftar = Pendaftar(
+            lowongan=lowongan,
+            nik=data['nik'],
+            name=data['name'],
+            gender=data['gender'],
+            dob=data['dob'],
+            address=data['address'],
+            no_telp=data['no_telp'],
+            university=data['university'],
+            major=data['major'],
+            ipk=data.get('ipk') or None,
+            path_cv=path_cv
+        )
+        if data.get('cv_staging_path'):
+            # File final diisi worker process_cv_jobs setelah CV divalidasi
+            pendaftar.cv_status = 'processing'
+        try:
+            with transaction.atomic():
+                pendaftar.save(force_insert=True)
+            return pendaftar, True
+        except IntegrityError:
+            existing = Pendaftar.objects.filter(nik=data['nik']).first()
+            if existing is None:
+                raise
+            # File CV yang sempat di-upload untuk insert yang gagal tidak dipakai
+            if isinstance(data.get('path_cv'), File):
+                CvStorageService.release([path_cv])
+            return existing, False
+    
     @staticmethod
     def create_pendaftaran(data):
         """
-        Membuat pendaftaran baru (Pendaftar + TransaksiPendaftaran)
+        Membuat pendaftaran baru (Pendaftar + TransaksiPendaftaran) dalam satu transaksi.
+        Aman untuk submit bersamaan: NIK dan pasangan (pendaftar, lowongan) dijaga
+        unique constraint, insert yang bentrok dijawab sebagai duplikat, bukan error.
         Args:
             data (dict): Data pendaftar dan lowongan
                 - nik, name, gender, dob, address, no_telp
-                - university, major, ipk, path_cv
+                - university, major, ipk
+                - path_cv, atau cv_staging_path + cv_original_name dari
+                  CvProcessingService.stage_upload (diproses di background)
                 - id_lowongan
         Returns:
-            dict: {'success': bool, 'transaksi': TransaksiPendaftaran, 'message': str}
+            dict: {'success': bool, 'transaksi': TransaksiPendaftaran, 'message': str,
+                   'error': None, 'lowongan_not_found' atau 'duplicate'}
         """
+        staging_path = data.get('cv_staging_path')
+        staged_consumed = False
         try:
-            # 1. Cek apakah NIK sudah terdaftar
-            nik_check = PendaftaranService.check_nik_exists(data['nik'])
-            
-            if nik_check['exists']:
-                # NIK sudah ada, cek apakah sudah mendaftar di lowongan yang sama
-                duplicate_check = PendaftaranService.check_duplicate_application(
-                    data['nik'], 
-                    data['id_lowongan']
-                )
+            with transaction.atomic():
+                # 1. Ambil lowongan (departement_id dipakai untuk counter)
+                lowongan = Lowongan.objects.only('id_lowongan', 'departement_id').get(id_lowongan=data['id_lowongan'])
                 
-                if duplicate_check['exists']:
-                    return {
-                        'success': False,
-                        'transaksi': None,
-                        'message': f'NIK sudah terdaftar pada lowongan ini dengan status {duplicate_check["transaksi"].status}'
-                    }
+                # 2. Pendaftar baru, atau pendaftar lama jika NIK sudah terdaftar
+                pendaftar, created = PendaftaranService._insert_or_get_pendaftar(lowongan, data)
                 
-                # NIK ada tapi belum daftar di lowongan ini, gunakan pendaftar yang ada
-                pendaftar = nik_check['pendaftar']
-            else:
-                # NIK belum ada, buat pendaftar baru
-                pendaftar = Pendaftar.objects.create(
-                    nik=data['nik'],
-                    name=data['name'],
-                    gender=data['gender'],
-                    dob=data['dob'],
-                    address=data['address'],
-                    no_telp=data['no_telp'],
-                    university=data['university'],
-                    major=data['major'],
-                    ipk=data.get('ipk'),
-                    path_cv=data['path_cv']
-                )
-            
-            # 2. Ambil lowongan
-            lowongan = Lowongan.objects.get(id_lowongan=data['id_lowongan'])
-            
-            # 3. Buat transaksi pendaftaran
-            transaksi = TransaksiPendaftaran.objects.create(
-                pendaftar=pendaftar,
-                lowongan=lowongan,
-                status='pending'
-            )
+                # 3. Buat transaksi pendaftaran. Pendaftar baru belum mungkin punya transaksi,
+                # jadi savepoint hanya diperlukan untuk pendaftar lama.
+                if created:
+                    transaksi = TransaksiPendaftaran.objects.create(
+                        pendaftar=pendaftar,
+                        lowongan=lowongan,
+                        status='pending'
+                    )
+                else:
+                    try:
+                        with transaction.atomic():
+                            transaksi = TransaksiPendaftaran.objects.create(
+                                pendaftar=pendaftar,
+                                lowongan=lowongan,
+                                status='pending'
+                            )
+                    except IntegrityError:
+                        status = TransaksiPendaftaran.objects.filter(
+                            pendaftar=pendaftar, lowongan=lowongan
+                        ).values_list('status', flat=True).first()
+                        return {
+                            'success': False,
+                            'transaksi': None,
+                            'error': 'duplicate',
+                            'message': f'NIK sudah terdaftar pada lowongan ini dengan status {status}'
+                        }
+                
+                # 4. CV pendaftar baru diproses worker; pendaftar lama tetap memakai CV sebelumnya
+                if staging_path and created:
+                    CvProcessingService.enqueue(pendaftar, staging_path, data.get('cv_original_name') or 'cv.pdf')
+                
+                DashboardCounterService.record_submission(pendaftar, transaksi, pendaftar_created=created)
             
+            staged_consumed = created
             return {
                 'success': True,
                 'transaksi': transaksi,
                 'pendaftar': pendaftar,
+                'error': None,
                 'message': 'Pendaftaran berhasil dibuat dengan status pending'
             }
             
@@ -130,12 +182,18 @@ class PendaftaranService:
             return {
                 'success': False,
                 'transaksi': None,
+                'error': 'lowongan_not_found',
                 'message': 'Lowongan tidak ditemukan'
             }
         except Exception as e:
             return {
                 'success': False,
                 'transaksi': None,
+                'error': 'unexpected',
                 'message': f'Terjadi kesalahan: {str(e)}'
             }
+        finally:
+            # File staging tanpa job (duplikat, rollback, NIK lama) tidak akan diambil worker
+            if staging_path and not staged_consumed:
+                CvProcessingService.discard_staged(staging_path)
 
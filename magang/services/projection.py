@@ -0,0 +1,64 @@
+from datetime import datetime
+
+
+class DateFormatter:
+    """
+    Format tanggal dengan memo per tanggal. Banyak baris berbagi tanggal yang
+    sama sehingga strftime cukup dipanggil sekali per (format, tanggal).
+    """
+
+    def __init__(self):
+        self._cache = {}
+
+    def __call__(self, value, pattern):
+        if value is None:
+            return None
+        # Format yang dipakai hanya bagian tanggal, jam tidak ikut menjadi key
+        day = value.date() if isinstance(value, datetime) else value
+        key = (pattern, day)
+        formatted = self._cache.get(key)
+        if formatted is None:
+            formatted = self._cache[key] = day.strftime(pattern)
+        return formatted
+
+
+class Projection:
+    """
+    Serialisasi baca-saja untuk API JSON: hanya kolom yang dibutuhkan diambil
+    lewat values(), tanpa membuat instance model.
+    """
+
+    def __init__(self, columns, build):
+        """
+        Args:
+            columns (list): path ORM yang diambil, contoh ['posisi', 'departement__nama_dept']
+            build (callable): build(row, fmt) -> dict output; fmt adalah DateFormatter
+        """
+        self.columns = list(columns)
+        self.build = build
+
+    def values(self, queryset, extra=()):
+        """Queryset dict berisi kolom proyeksi ditambah kolom lain (misal kolom cursor)"""
+        columns = self.columns + [column for column in extra if column not in self.columns]
+        return queryset.values(*columns)
+
+    def serialize(self, rows):
+        """Mengubah baris values() yang sudah diambil menjadi list dict output"""
+        fmt = DateFormatter()
+        return [self.build(row, fmt) for row in rows]
+
+    def iterate(self, queryset, chunk_size=2000):
+        """Streaming dict output dari queryset dengan iterator() tanpa cache queryset"""
+        fmt = DateFormatter()
+        for row in self.values(queryset).iterator(chunk_size=chunk_size):
+            yield self.build(row, fmt)
+
+    def paginate(self, paginator, queryset, cursor=None, limit=None):
+        """
+        Satu halaman keyset pagination dalam bentuk dict output
+        Returns:
+            dict: {'items': [dict], 'next_cursor': str atau None, 'has_more': bool}
+        """
+        page = paginator.paginate(self.values(queryset, paginator.fields), cursor, limit)
+        page['items'] = self.serialize(page['items'])
+        return page
@@ -0,0 +1,126 @@
+import threading
+import time
+from collections import OrderedDict
+from django.conf import settings
+from .search_service import tokenize
+
+
+def normalize_term(term):
+    """Huruf kecil dan spasi dirapikan, agar 'Eng ' dan 'eng' memakai entry yang sama"""
+    return ' '.join((term or '').lower().split())
+
+
+class SearchResultCache:
+    """
+    Cache LRU hasil pencarian per term di memori proses.
+    Setiap entry menyimpan seluruh hasil (sudah terurut) untuk satu term, ditandai
+    dengan versi data saat dihitung; entry dengan versi lama tidak dipakai lagi.
+    Term yang diawali term lain yang sudah di-cache ("engi" dari "eng") dijawab
+    dengan memfilter hasil term pendek di memori, karena hasilnya pasti subset.
+    """
+
+    def __init__(self, compute, refine, version, setting_prefix):
+        """
+        Args:
+            compute (callable): compute(term, max_rows) -> list baris hasil dari database,
+                atau None jika hasil lebih dari max_rows
+            refine (callable): refine(rows, term) -> list baris yang cocok dengan term
+            version (callable): version() -> penanda versi data saat ini
+            setting_prefix (str): prefix setting {prefix}_SIZE, {prefix}_TTL, {prefix}_MAX_ROWS
+        """
+        self.compute = compute
+        self.refine = refine
+        self.version = version
+        self.setting_prefix = setting_prefix
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+        self._stats = {}
+        self.reset_stats()
+
+    def _settings(self):
+        # Dibaca setiap kali agar bisa diubah lewat override_settings
+        return tuple(getattr(settings, f'{self.setting_prefix}_{name}') for name in ('SIZE', 'TTL', 'MAX_ROWS'))
+
+    def _count(self, name):
+        self._stats[name] += 1
+
+    def _count_locked(self, name):
+        with self._lock:
+            self._count(name)
+
+    def _lookup(self, term, version, now):
+        """Entry untuk term persis atau prefix terpanjang yang masih valid (dipanggil dengan lock)"""
+        best = None
+        for key, (expires_at, entry_version, rows) in list(self._entries.items()):
+            if entry_version != version or expires_at <= now:
+                del self._entries[key]
+                self._count('expirations')
+                continue
+            # Prefix hanya dipakai jika term diperpanjang, bukan sekadar kata lain yang mirip
+            if term.startswith(key) and (best is None or len(key) > len(best)):
+                best = key
+        if best is not None:
+            self._entries.move_to_end(best)
+            return best, self._entries[best][2]
+        return None, None
+
+    def get(self, term):
+        """
+        Hasil pencarian untuk term
+        Returns:
+            list: baris hasil terurut, atau None jika cache nonaktif atau hasil terlalu
+            banyak untuk disimpan (pemanggil memakai query database biasa)
+        """
+        term = normalize_term(term)
+        size, ttl, max_rows = self._settings()
+        if size <= 0 or ttl <= 0 or not tokenize(term):
+            return None
+
+        # Versi dibaca sebelum query agar hasil yang disimpan tidak lebih lama dari versinya
+        version = self.version()
+        now = time.monotonic()
+        with self._lock:
+            key, rows = self._lookup(term, version, now)
+            if key == term:
+                self._count('hits')
+                return rows
+
+        if key is not None:
+            rows = self.refine(rows, term)
+            self._count_locked('prefix_hits')
+        else:
+            rows = self.compute(term, max_rows)
+            self._count_locked('misses')
+            if rows is None:
+                return None
+
+        with self._lock:
+            self._entries[term] = (now + ttl, version, rows)
+            self._entries.move_to_end(term)
+            while len(self._entries) > size:
+                self._entries.popitem(last=False)
+                self._count('evictions')
+        return rows
+
+    def invalidate(self):
+        """Membuang seluruh entry di proses ini"""
+        with self._lock:
+            self._entries.clear()
+            self._count('invalidations')
+
+    def get_stats(self):
+        """Statistik hit/miss untuk proses ini"""
+        with self._lock:
+            stats = dict(self._stats)
+            stats['entries'] = len(self._entries)
+        lookups = stats['hits'] + stats['prefix_hits'] + stats['misses']
+        stats['hit_ratio'] = round((stats['hits'] + stats['prefix_hits']) / lookups, 4) if lookups else 0
+        stats['max_entries'], stats['ttl'], stats['max_rows'] = self._settings()
+        return stats
+
+    def reset_stats(self):
+        with self._lock:
+            self._stats = {
+                'hits': 0, 'prefix_hits': 0, 'misses': 0,
+                'evictions': 0, 'expirations': 0, 'invalidations': 0,
+            }
@@ -0,0 +1,275 @@
+import bisect
+import json
+import re
+import threading
+from django.db import connection
+from django.db.models import Case, FloatField, Q, Value, When
+from django.db.models.expressions import RawSQL
+from ..models import Lowongan, TransaksiPendaftaran
+
+
+# Konfigurasi text search PostgreSQL. 'simple' dipakai karena data campuran
+# Indonesia/Inggris dan nama orang tidak boleh di-stem.
+SEARCH_CONFIG = 'simple'
+
+# Harus sama persis dengan ekspresi index di migration 0004_search_indexes
+LOWONGAN_DOCUMENT_SQL = "coalesce({t}.posisi, '') || ' ' || coalesce({t}.deskripsi, '')"
+PENDAFTAR_DOCUMENT_SQL = "coalesce({t}.name, '') || ' ' || coalesce({t}.university, '')"
+
+LOWONGAN_MATCH_SQL = f"""
+    SELECT l.id_lowongan FROM magang_table l
+    WHERE to_tsvector('{SEARCH_CONFIG}', {LOWONGAN_DOCUMENT_SQL.format(t='l')}) @@ to_tsquery('{SEARCH_CONFIG}', %s)
+       OR l.posisi ILIKE %s
+    UNION
+    SELECT l.id_lowongan FROM magang_table l JOIN m_dept d ON d.id_dept = l.departement_id
+    WHERE d.nama_dept ILIKE %s
+"""
+
+# ts_rank dan word_similarity bertipe real (float4); di-cast ke double precision agar nilai
+# yang dikembalikan ke Python, disimpan di cursor dan dibandingkan lagi di WHERE sama persis
+# (tanpa cast, parameter float8 dari cursor tidak pernah sama dengan nilai float4 kolomnya)
+LOWONGAN_RANK_SQL = f"""
+    (ts_rank(
+        to_tsvector('{SEARCH_CONFIG}', {LOWONGAN_DOCUMENT_SQL.format(t='magang_table')}),
+        to_tsquery('{SEARCH_CONFIG}', %s)
+    ) + word_similarity(%s, magang_table.posisi))::double precision
+"""
+
+APPLICANT_MATCH_SQL = f"""
+    SELECT t.id_transaksi_pendaftaran FROM t_pendaftaran_magang t JOIN pendaftar p ON p.id_pendaftar = t.pendaftar_id
+    WHERE to_tsvector('{SEARCH_CONFIG}', {PENDAFTAR_DOCUMENT_SQL.format(t='p')}) @@ to_tsquery('{SEARCH_CONFIG}', %s)
+       OR p.name ILIKE %s OR p.university ILIKE %s
+    UNION
+    SELECT t.id_transaksi_pendaftaran FROM t_pendaftaran_magang t JOIN magang_table l ON l.id_lowongan = t.lowongan_id
+    WHERE l.posisi ILIKE %s
+"""
+
+
+def tokenize(text):
+    """Memecah teks menjadi kata huruf kecil"""
+    # Underscore dibuang karena parser tsquery menganggapnya pemisah
+    return re.findall(r'[^\W_]+', (text or '').lower())
+
+
+def score_document(query, weighted_texts, phrase_texts):
+    """
+    Mencocokkan satu dokumen dengan aturan yang sama seperti InMemorySearchIndex
+    Args:
+        query (str): kata kunci pencarian
+        weighted_texts (list): [(teks, bobot)] untuk pencocokan awalan kata
+        phrase_texts (list): teks untuk pencocokan substring query utuh
+    Returns:
+        float: skor relevansi, atau None jika dokumen tidak cocok
+    """
+    tokens = tokenize(query)
+    if not tokens:
+        return None
+
+    words = {}
+    for text, weight in weighted_texts:
+        for word in tokenize(text):
+            words[word] = max(words.get(word, 0), weight)
+
+    score = 0
+    for token in tokens:
+        weights = [weight for word, weight in words.items() if word.startswith(token)]
+        if not weights:
+            score = None
+            break
+        score += max(weights)
+
+    phrase = query.lower()
+    if any(phrase in text.lower() for text in phrase_texts if text):
+        score = (score or 0) + 1.0
+    return score
+
+
+def like_pattern(query):
+    """Pola ILIKE '%query%' dengan karakter wildcard di-escape"""
+    escaped = query.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+    return f'%{escaped}%'
+
+
+class InMemorySearchIndex:
+    """
+    Index pencarian di memori proses, dipakai jika database bukan PostgreSQL
+    (SQLite saat development/test). Semantik dibuat sama dengan versi PostgreSQL:
+    setiap kata query harus menjadi awalan salah satu kata dokumen, atau
+    query utuh muncul sebagai substring di salah satu field frasa.
+    Index dibangun ulang secara lazy setelah invalidate().
+    """
+
+    def __init__(self, loader):
+        """
+        Args:
+            loader (callable): menghasilkan (pk, [(teks, bobot)], [teks frasa]) per dokumen
+        """
+        self.loader = loader
+        self._lock = threading.Lock()
+        self._index = None
+
+    def invalidate(self):
+        with self._lock:
+            self._index = None
+
+    def _build(self):
+        postings = {}
+        phrases = {}
+        for pk, weighted_texts, phrase_texts in self.loader():
+            for text, weight in weighted_texts:
+                for word in tokenize(text):
+                    docs = postings.setdefault(word, {})
+                    docs[pk] = max(docs.get(pk, 0), weight)
+            phrases[pk] = [text.lower() for text in phrase_texts if text]
+        return sorted(postings), postings, phrases
+
+    def _get_index(self):
+        with self._lock:
+            if self._index is None:
+                self._index = self._build()
+            return self._index
+
+    def search(self, query):
+        """
+        Args:
+            query (str): kata kunci pencarian
+        Returns:
+            dict: {pk: skor} untuk dokumen yang cocok
+        """
+        tokens = tokenize(query)
+        if not tokens:
+            return {}
+        vocabulary, postings, phrases = self._get_index()
+
+        scores = None
+        for token in tokens:
+            # Kata dengan awalan token berada berurutan di vocabulary yang terurut
+            token_scores = {}
+            start = bisect.bisect_left(vocabulary, token)
+            for word in vocabulary[start:]:
+                if not word.startswith(token):
+                    break
+                for pk, weight in postings[word].items():
+                    token_scores[pk] = max(token_scores.get(pk, 0), weight)
+            if scores is None:
+                scores = token_scores
+            else:
+                scores = {pk: scores[pk] + weight for pk, weight in token_scores.items() if pk in scores}
+
+        phrase = query.lower()
+        for pk, texts in phrases.items():
+            if any(phrase in text for text in texts):
+                scores[pk] = scores.get(pk, 0) + 1.0
+        return scores
+
+
+def _load_lowongan_documents():
+    rows = Lowongan.objects.values_list('id_lowongan', 'posisi', 'deskripsi', 'departement__nama_dept')
+    for pk, posisi, deskripsi, nama_dept in rows.iterator():
+        yield pk, [(posisi, 1.0), (deskripsi, 0.4)], [posisi, nama_dept]
+
+
+def _load_applicant_documents():
+    rows = TransaksiPendaftaran.objects.values_list(
+        'id_transaksi_pendaftaran', 'pendaftar__name', 'pendaftar__university', 'lowongan__posisi'
+    )
+    for pk, name, university, posisi in rows.iterator():
+        yield pk, [(name, 1.0), (university, 0.5)], [name, university, posisi]
+
+
+class SearchService:
+    """
+    Pencarian lowongan dan pendaftar memakai index.
+    PostgreSQL: full-text (GIN tsvector) + trigram (GIN gin_trgm_ops) dari migration
+    0004_search_indexes. SQLite: InMemorySearchIndex, hasilnya dikirim ke query lewat json_each.
+    """
+    lowongan_index = InMemorySearchIndex(_load_lowongan_documents)
+    applicant_index = InMemorySearchIndex(_load_applicant_documents)
+
+    @staticmethod
+    def uses_database_index():
+        return connection.vendor == 'postgresql'
+
+    @staticmethod
+    def _tsquery(tokens):
+        # Prefix match per kata, semua kata wajib ada
+        return ' & '.join(f'{token}:*' for token in tokens)
+
+    @staticmethod
+    def _pk_in(ids):
+        """
+        Subquery daftar pk hasil index di memori dengan satu parameter JSON (json_each SQLite),
+        bukan satu parameter per pk yang bisa melewati batas variabel SQLite
+        """
+        return RawSQL('SELECT value FROM json_each(%s)', [json.dumps(sorted(ids))])
+
+    @staticmethod
+    def _rank_annotation(scores):
+        # Satu WHEN per nilai skor (hanya sedikit: kombinasi bobot kata), bukan per pk
+        by_score = {}
+        for pk, score in scores.items():
+            by_score.setdefault(score, []).append(pk)
+        return Case(
+            *[When(pk__in=SearchService._pk_in(pks), then=Value(float(score))) for score, pks in by_score.items()],
+            default=Value(0.0),
+            output_field=FloatField()
+        )
+
+    @staticmethod
+    def search_lowongan(queryset, query, rank=True):
+        """
+        Memfilter queryset Lowongan dengan query pencarian
+        Args:
+            queryset (QuerySet): queryset Lowongan
+            query (str): kata kunci (posisi, deskripsi, nama departemen)
+            rank (bool): tambahkan anotasi search_rank
+        Returns:
+            QuerySet: lowongan yang cocok dengan anotasi search_rank (makin besar makin relevan)
+        """
+        tokens = tokenize(query)
+        if not tokens:
+            # Query tanpa kata (misal hanya tanda baca) dicari sebagai substring biasa
+            queryset = queryset.filter(Q(posisi__icontains=query) | Q(departement__nama_dept__icontains=query))
+            return queryset.annotate(search_rank=Value(0.0, output_field=FloatField())) if rank else queryset
+
+        if SearchService.uses_database_index():
+            tsquery = SearchService._tsquery(tokens)
+            pattern = like_pattern(query)
+            queryset = queryset.filter(id_lowongan__in=RawSQL(LOWONGAN_MATCH_SQL, [tsquery, pattern, pattern]))
+            if rank:
+                queryset = queryset.annotate(
+                    search_rank=RawSQL(LOWONGAN_RANK_SQL, [tsquery, query], output_field=FloatField())
+                )
+            return queryset
+
+        scores = SearchService.lowongan_index.search(query)
+        queryset = queryset.filter(id_lowongan__in=SearchService._pk_in(scores))
+        return queryset.annotate(search_rank=SearchService._rank_annotation(scores)) if rank else queryset
+
+    @staticmethod
+    def search_applicants(queryset, query):
+        """
+        Memfilter queryset TransaksiPendaftaran berdasarkan nama, universitas pendaftar
+        atau posisi yang dilamar
+        """
+        tokens = tokenize(query)
+        if not tokens:
+            return queryset.filter(
+                Q(pendaftar__name__icontains=query) |
+                Q(pendaftar__university__icontains=query) |
+                Q(lowongan__posisi__icontains=query)
+            )
+
+        if SearchService.uses_database_index():
+            pattern = like_pattern(query)
+            return queryset.filter(id_transaksi_pendaftaran__in=RawSQL(
+                APPLICANT_MATCH_SQL, [SearchService._tsquery(tokens), pattern, pattern, pattern]
+            ))
+
+        return queryset.filter(id_transaksi_pendaftaran__in=SearchService._pk_in(SearchService.applicant_index.search(query)))
+
+    @staticmethod
+    def invalidate():
+        """Membuang index di memori (tidak berpengaruh pada index PostgreSQL)"""
+        SearchService.lowongan_index.invalidate()
+        SearchService.applicant_index.invalidate()
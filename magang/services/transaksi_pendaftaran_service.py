@@ -1,7 +1,12 @@
+from django.db import IntegrityError, transaction
 from django.db.models import Q
 from django.core.exceptions import ValidationError
+from admin_dashboard.counter_service import DashboardCounterService
+from admin_dashboard.metrics import instrument_service
+from admin_dashboard.signals import invalidate_dashboard_cache
 from ..models import Lowongan, Pendaftar, TransaksiPendaftaran
 
+@instrument_service
 class TransaksiPendaftaranService:
     """Service untuk mengelola CRUD Transaksi Pendaftaran (Admin)"""
     
@@ -49,10 +54,12 @@ class TransaksiPendaftaranService:
             }
         
         try:
-            transaksi = TransaksiPendaftaran.objects.get(id_transaksi_pendaftaran=id_transaksi)
-            old_status = transaksi.status
-            transaksi.status = new_status
-            transaksi.save()
+            with transaction.atomic():
+                transaksi = TransaksiPendaftaran.objects.select_for_update().get(id_transaksi_pendaftaran=id_transaksi)
+                old_status = transaksi.status
+                transaksi.status = new_status
+                transaksi.save()
+                DashboardCounterService.record_status_change(old_status, new_status)
             
             return {
                 'success': True,
@@ -82,11 +89,18 @@ class TransaksiPendaftaranService:
             dict: {'success': bool, 'message': str}
         """
         try:
-            transaksi = TransaksiPendaftaran.objects.get(id_transaksi_pendaftaran=id_transaksi)
+            transaksi = TransaksiPendaftaran.objects.select_related(
+                'pendaftar', 'lowongan'
+            ).get(id_transaksi_pendaftaran=id_transaksi)
             pendaftar_name = transaksi.pendaftar.name
             lowongan_posisi = transaksi.lowongan.posisi
             
-            transaksi.delete()
+            with transaction.atomic():
+                DashboardCounterService.record_deletion(
+                    transaksi_qs=TransaksiPendaftaran.objects.filter(id_transaksi_pendaftaran=id_transaksi)
+                )
+                transaksi.delete()
+                invalidate_dashboard_cache()
             
             return {
                 'success': True,
@@ -118,24 +132,28 @@ class TransaksiPendaftaranService:
             pendaftar = Pendaftar.objects.get(id_pendaftar=id_pendaftar)
             lowongan = Lowongan.objects.get(id_lowongan=id_lowongan)
             
-            # Cek duplikasi
-            existing = TransaksiPendaftaran.objects.filter(
-                pendaftar=pendaftar,
-                lowongan=lowongan
-            ).first()
-            
-            if existing:
-                return {
-                    'success': False,
-                    'transaksi': None,
-                    'message': f'Transaksi sudah ada dengan status {existing.status}'
-                }
-            
-            transaksi = TransaksiPendaftaran.objects.create(
-                pendaftar=pendaftar,
-                lowongan=lowongan,
-                status=status
-            )
+            with transaction.atomic():
+                # Duplikasi dicegah constraint unik (pendaftar, lowongan), bukan cek lalu insert
+                # yang bisa lolos jika dua request berjalan bersamaan
+                try:
+                    with transaction.atomic():
+                        transaksi = TransaksiPendaftaran.objects.create(
+                            pendaftar=pendaftar,
+                            lowongan=lowongan,
+                            status=status
+                        )
+                except IntegrityError:
+                    existing_status = TransaksiPendaftaran.objects.filter(
+                        pendaftar=pendaftar, lowongan=lowongan
+                    ).values_list('status', flat=True).first()
+                    if existing_status is None:
+                        raise
+                    return {
+                        'success': False,
+                        'transaksi': None,
+                        'message': f'Transaksi sudah ada dengan status {existing_status}'
+                    }
+                DashboardCounterService.record_transaksi_created(transaksi)
             
             return {
                 'success': True,
@@ -0,0 +1,31 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from .models import Departement, Lowongan, Pendaftar, TransaksiPendaftaran
+from .services.lowongan_service import LOWONGAN_SEARCH_CACHE, LowonganService
+from .services.search_service import SearchService
+
+
+# Baris yang terhapus tidak perlu dibuang dari index di memori karena hasil
+# pencarian selalu difilter ulang ke tabel asli, jadi post_delete tidak dipasang.
+@receiver(post_save, sender=Departement)
+@receiver(post_save, sender=Lowongan)
+@receiver(post_save, sender=Pendaftar)
+@receiver(post_save, sender=TransaksiPendaftaran)
+def invalidate_search_index(sender=None, **kwargs):
+    """Invalidasi index pencarian di memori setelah data sumber berubah"""
+    SearchService.invalidate()
+    # Dibuang lagi setelah commit jika index sempat dibangun dari data sebelum commit
+    transaction.on_commit(SearchService.invalidate)
+
+
+@receiver(post_save, sender=Departement)
+@receiver(post_save, sender=Lowongan)
+@receiver(post_delete, sender=Departement)
+@receiver(post_delete, sender=Lowongan)
+def bump_lowongan_feed_version(sender=None, **kwargs):
+    """Menaikkan versi feed /api/lowongan/ di transaksi yang sama dengan perubahan data"""
+    LowonganService.bump_feed_version()
+    # Entry lama sudah tidak valid karena versinya berbeda, dibuang agar memori segera lepas
+    transaction.on_commit(LOWONGAN_SEARCH_CACHE.invalidate)
+
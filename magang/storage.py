@@ -0,0 +1,74 @@
+import hashlib
+import os
+import re
+import uuid
+from django.core.files.storage import FileSystemStorage
+from django.utils.deconstruct import deconstructible
+
+
+# cv/ab/cd/<sha256>.pdf
+CONTENT_NAME_RE = re.compile(r'^(?P<prefix>.+)/[0-9a-f]{2}/[0-9a-f]{2}/(?P<digest>[0-9a-f]{64})(?P<ext>\.[a-z0-9]+)?$')
+
+
+def content_name(prefix, digest, ext=''):
+    """Nama file berdasarkan hash isi, dibagi dua level direktori agar direktori tidak terlalu besar"""
+    return f'{prefix}/{digest[:2]}/{digest[2:4]}/{digest}{ext}'
+
+
+def digest_from_name(name):
+    """sha256 dari nama file content-addressed, atau None untuk file lama (cv/nama_asli.pdf)"""
+    match = CONTENT_NAME_RE.match(name or '')
+    return match.group('digest') if match else None
+
+
+@deconstructible
+class ContentAddressedStorage(FileSystemStorage):
+    """
+    FileSystemStorage yang menyimpan file berdasarkan sha256 isinya.
+    File di-hash sambil ditulis ke file sementara, lalu di-rename ke cv/ab/cd/<sha256>.pdf.
+    Isi yang sama hanya disimpan sekali; pemakaian dihitung di CvBlob (CvStorageService).
+    """
+
+    def get_available_name(self, name, max_length=None):
+        # Nama final ditentukan _save dari hash isi, file yang sama boleh "ditimpa"
+        return name
+
+    def _save(self, name, content):
+        prefix = os.path.dirname(name) or 'files'
+        ext = os.path.splitext(name)[1].lower()
+        directory = self.path(prefix)
+        os.makedirs(directory, exist_ok=True)
+
+        # File sementara di direktori yang sama agar os.replace atomik (satu filesystem)
+        temp_path = os.path.join(directory, f'.upload-{uuid.uuid4().hex}')
+        digest = hashlib.sha256()
+        try:
+            with open(temp_path, 'wb') as destination:
+                if hasattr(content, 'seek'):
+                    content.seek(0)
+                for chunk in content.chunks():
+                    digest.update(chunk)
+                    destination.write(chunk)
+
+            final_name = content_name(prefix, digest.hexdigest(), ext)
+            final_path = self.path(final_name)
+            if os.path.exists(final_path):
+                os.remove(temp_path)
+            else:
+                os.makedirs(os.path.dirname(final_path), exist_ok=True)
+                if self.file_permissions_mode is not None:
+                    os.chmod(temp_path, self.file_permissions_mode)
+                os.replace(temp_path, final_path)
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+        return final_name
+
+
+cv_storage = ContentAddressedStorage()
+
+
+def get_cv_storage():
+    # Callable agar migration tidak menyimpan konfigurasi storage
+    return cv_storage
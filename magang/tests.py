@@ -1,3 +1,855 @@
-from django.test import TestCase
+import hashlib
+import io
+import os
+import shutil
+import tempfile
+import threading
+from datetime import date, timedelta
+from unittest import mock
 
-# Create your tests here.
+from django.core.files.base import ContentFile
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import connection
+from django.db.migrations.executor import MigrationExecutor
+from django.db.models import F
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from admin_dashboard.counter_service import DashboardCounterService
+from admin_dashboard.models import DashboardCounter
+from admin_dashboard.service import DashboardService
+from seeder.seed_data import _explicit_timestamps, clear_data, run_seeder
+from .models import CvBlob, CvProcessingJob, Departement, Lowongan, Pendaftar, TransaksiPendaftaran
+from .services.cv_processing_service import CvProcessingService
+from .services.cv_storage_service import CvStorageService
+from .services.import_service import ImportService, read_rows
+from .services.lowongan_service import LOWONGAN_SEARCH_CACHE, LowonganService
+from .services.pendaftaran_service import PendaftaranService
+from .services.search_service import SearchService
+from .services.transaksi_pendaftaran_service import TransaksiPendaftaranService
+from .storage import cv_storage
+
+
+class LowonganApiPaginationTest(TestCase):
+    """Test keyset pagination pada /api/lowongan/"""
+
+    def setUp(self):
+        LOWONGAN_SEARCH_CACHE.invalidate()
+        engineering = Departement.objects.create(nama_dept='Engineering')
+        marketing = Departement.objects.create(nama_dept='Marketing')
+        start = date(2025, 1, 1)
+        # Banyak lowongan dengan tanggal_mulai yang sama untuk menguji pemecah seri
+        Lowongan.objects.bulk_create([
+            Lowongan(
+                posisi=f'Intern {i:02d}',
+                deskripsi='Deskripsi lowongan',
+                tanggal_mulai=start + timedelta(days=i // 4),
+                tanggal_selesai=start + timedelta(days=90),
+                departement=engineering if i % 2 else marketing
+            )
+            for i in range(25)
+        ])
+
+    def fetch_all(self, url):
+        ids = []
+        cursor = None
+        while True:
+            page_url = f'{url}&cursor={cursor}' if cursor else url
+            result = self.client.get(page_url).json()
+            self.assertTrue(result['success'])
+            ids += [item['id_lowongan'] for item in result['data']]
+            cursor = result['next_cursor']
+            if not result['has_more']:
+                self.assertIsNone(cursor)
+                return ids
+
+    def test_pages_cover_all_rows_in_order(self):
+        ids = self.fetch_all('/api/lowongan/?limit=4')
+
+        expected = list(
+            Lowongan.objects.order_by('-tanggal_mulai', 'id_lowongan').values_list('id_lowongan', flat=True)
+        )
+        self.assertEqual(ids, expected)
+
+    def test_search_with_pagination(self):
+        ids = self.fetch_all('/api/lowongan/?limit=5&search=marketing')
+
+        self.assertEqual(len(ids), 13)
+        self.assertEqual(len(set(ids)), 13)
+
+    def test_total_modes(self):
+        result = self.client.get('/api/lowongan/?limit=10').json()
+        self.assertEqual(result['total'], 25)
+        self.assertEqual(len(result['data']), 10)
+
+        result = self.client.get('/api/lowongan/?limit=10&total=none').json()
+        self.assertIsNone(result['total'])
+
+        self.assertEqual(LowonganService.count_lowongan(estimate=True), 25)
+
+    def test_invalid_parameters(self):
+        self.assertEqual(self.client.get('/api/lowongan/?cursor=bukan-cursor').status_code, 400)
+        self.assertEqual(self.client.get('/api/lowongan/?limit=abc').status_code, 400)
+
+    def test_limit_capped(self):
+        result = self.client.get('/api/lowongan/?limit=1000').json()
+
+        self.assertEqual(len(result['data']), 25)
+
+
+class SearchServiceTest(TestCase):
+    """Test pencarian lowongan dan pendaftar (InMemorySearchIndex pada SQLite)"""
+
+    def setUp(self):
+        self.engineering = Departement.objects.create(nama_dept='Engineering')
+        legal = Departement.objects.create(nama_dept='Legal')
+        self.backend = self.create_lowongan('Backend Developer Intern', 'Membangun API Django', self.engineering)
+        self.data = self.create_lowongan('Data Analyst Intern', 'Analisis data dengan Python dan Django', self.engineering)
+        self.legal = self.create_lowongan('Legal Research Intern', 'Riset regulasi', legal)
+
+    def create_lowongan(self, posisi, deskripsi, departement):
+        return Lowongan.objects.create(
+            posisi=posisi,
+            deskripsi=deskripsi,
+            tanggal_mulai=date(2025, 1, 1),
+            tanggal_selesai=date(2025, 4, 1),
+            departement=departement
+        )
+
+    def search_ids(self, query):
+        return [lowongan.id_lowongan for lowongan in LowonganService.search_lowongan(query)]
+
+    def test_prefix_and_multi_word_match(self):
+        self.assertEqual(self.search_ids('back'), [self.backend.id_lowongan])
+        self.assertEqual(self.search_ids('intern legal'), [self.legal.id_lowongan])
+        self.assertEqual(self.search_ids('tidakada'), [])
+
+    def test_departement_name_match(self):
+        self.assertEqual(set(self.search_ids('engineer')), {self.backend.id_lowongan, self.data.id_lowongan})
+
+    def test_posisi_ranked_above_deskripsi(self):
+        self.assertEqual(self.search_ids('django')[0], self.backend.id_lowongan)
+        self.assertEqual(self.search_ids('data')[0], self.data.id_lowongan)
+
+    def test_index_follows_writes(self):
+        self.assertEqual(self.search_ids('frontend'), [])
+
+        self.backend.posisi = 'Frontend Developer Intern'
+        self.backend.save()
+        new = self.create_lowongan('Frontend Designer Intern', 'UI', self.engineering)
+
+        self.assertEqual(set(self.search_ids('frontend')), {self.backend.id_lowongan, new.id_lowongan})
+        self.assertEqual(self.search_ids('backend'), [])
+
+    def test_wildcard_characters_are_literal(self):
+        self.assertEqual(self.search_ids('%'), [])
+        self.assertEqual(self.search_ids('_'), [])
+
+    def test_query_without_words_uses_substring_match(self):
+        cpp = self.create_lowongan('C++ Developer Intern', 'Embedded', self.engineering)
+
+        self.assertEqual(self.search_ids('++'), [cpp.id_lowongan])
+
+    def test_broad_query_parameters_do_not_grow_with_matches(self):
+        Lowongan.objects.bulk_create([
+            Lowongan(posisi=f'Support Intern {i}', deskripsi='Helpdesk', tanggal_mulai=date(2025, 1, 1),
+                     tanggal_selesai=date(2025, 4, 1), departement=self.engineering)
+            for i in range(1200)
+        ])
+        SearchService.invalidate()
+
+        queryset = LowonganService.search_lowongan('intern')
+        _, params = queryset.query.sql_with_params()
+
+        self.assertLess(len(params), 10)
+        self.assertEqual(len(queryset), 1203)
+
+
+class LowonganFeedConditionalTest(TestCase):
+    """Test ETag/Last-Modified pada /api/lowongan/"""
+
+    def setUp(self):
+        self.departement = Departement.objects.create(nama_dept='Engineering')
+        self.lowongan = Lowongan.objects.create(
+            posisi='Backend Developer Intern',
+            deskripsi='Deskripsi lowongan',
+            tanggal_mulai=date(2025, 1, 1),
+            tanggal_selesai=date(2025, 4, 1),
+            departement=self.departement
+        )
+
+    def test_not_modified_without_feed_query(self):
+        response = self.client.get('/api/lowongan/')
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('ETag', response)
+        self.assertIn('Last-Modified', response)
+        self.assertIn('s-maxage=30', response['Cache-Control'])
+
+        # Hanya query penanda versi yang dijalankan
+        with self.assertNumQueries(1):
+            cached = self.client.get('/api/lowongan/', HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(cached.status_code, 304)
+        self.assertEqual(cached['ETag'], response['ETag'])
+        self.assertIn('public', cached['Cache-Control'])
+
+    def test_write_changes_etag(self):
+        etag = self.client.get('/api/lowongan/')['ETag']
+
+        self.departement.nama_dept = 'Software Engineering'
+        self.departement.save()
+
+        response = self.client.get('/api/lowongan/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+        self.assertEqual(response.json()['data'][0]['nama_dept'], 'Software Engineering')
+
+    def test_delete_changes_etag(self):
+        etag = self.client.get('/api/lowongan/')['ETag']
+
+        self.lowongan.delete()
+
+        response = self.client.get('/api/lowongan/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['data'], [])
+
+
+class LowonganSearchCacheTest(TestCase):
+    """Test cache hasil pencarian per term pada /api/lowongan/"""
+
+    def setUp(self):
+        LOWONGAN_SEARCH_CACHE.invalidate()
+        LOWONGAN_SEARCH_CACHE.reset_stats()
+        self.engineering = Departement.objects.create(nama_dept='Engineering')
+        self.marketing = Departement.objects.create(nama_dept='Marketing')
+        for i in range(6):
+            self.create_lowongan(f'Engineer Intern {i}', self.engineering)
+        self.create_lowongan('English Teacher Intern', self.marketing)
+        self.create_lowongan('Marketing Intern', self.marketing)
+
+    def create_lowongan(self, posisi, departement):
+        return Lowongan.objects.create(
+            posisi=posisi,
+            deskripsi='Deskripsi lowongan',
+            tanggal_mulai=date(2025, 1, 1),
+            tanggal_selesai=date(2025, 4, 1),
+            departement=departement
+        )
+
+    def search(self, term, **params):
+        query = '&'.join(f'{key}={value}' for key, value in params.items())
+        return self.client.get(f'/api/lowongan/?search={term}&{query}').json()
+
+    def test_repeat_search_served_from_cache(self):
+        first = self.search('engineer')
+        # Cache hit hanya membaca penanda versi (ETag + cache untuk page dan total)
+        with self.assertNumQueries(3):
+            second = self.search('Engineer ')
+
+        self.assertEqual(first['data'], second['data'])
+        self.assertEqual(second['total'], 6)
+        stats = LOWONGAN_SEARCH_CACHE.get_stats()
+        self.assertEqual(stats['misses'], 1)
+        self.assertEqual(stats['hits'], 3)
+
+    def test_prefix_reuse_matches_database_result(self):
+        self.search('en')
+        refined = self.search('engl')
+
+        self.assertEqual(LOWONGAN_SEARCH_CACHE.get_stats()['prefix_hits'], 1)
+        self.assertEqual([row['posisi'] for row in refined['data']], ['English Teacher Intern'])
+        uncached = [lowongan.posisi for lowongan in LowonganService.search_lowongan('engl')]
+        self.assertEqual(uncached, ['English Teacher Intern'])
+
+    def test_prefix_reuse_reranked_by_database_on_postgresql(self):
+        self.search('en')
+        english = Lowongan.objects.get(posisi='English Teacher Intern')
+
+        # Rank PostgreSQL tidak bisa diuji di SQLite; cukup pastikan query rank dibatasi id hasil prefix
+        with mock.patch.object(SearchService, 'uses_database_index', return_value=True), \
+                mock.patch('magang.services.lowongan_service._database_ranked_rows', return_value=[]) as ranked:
+            self.search('engl')
+
+        queryset, term, max_rows = ranked.call_args.args
+        self.assertEqual(list(queryset.values_list('id_lowongan', flat=True)), [english.id_lowongan])
+        self.assertEqual((term, max_rows), ('engl', 1))
+        self.assertEqual(LOWONGAN_SEARCH_CACHE.get_stats()['prefix_hits'], 1)
+
+    def test_pagination_over_cached_rows(self):
+        ids = []
+        cursor = None
+        while True:
+            result = self.search('intern', limit=3, **({'cursor': cursor} if cursor else {}))
+            ids += [row['id_lowongan'] for row in result['data']]
+            cursor = result['next_cursor']
+            if not result['has_more']:
+                break
+
+        self.assertEqual(len(ids), 8)
+        self.assertEqual(len(set(ids)), 8)
+        self.assertNotIn('search_rank', result['data'][0])
+
+    def test_write_invalidates(self):
+        self.search('marketing')
+        self.create_lowongan('Marketing Analyst Intern', self.marketing)
+
+        self.assertEqual(self.search('marketing')['total'], 3)
+
+    @override_settings(LOWONGAN_SEARCH_CACHE_SIZE=2)
+    def test_lru_eviction(self):
+        for term in ['engineer', 'marketing', 'teacher']:
+            self.search(term)
+
+        stats = LOWONGAN_SEARCH_CACHE.get_stats()
+        self.assertEqual(stats['entries'], 2)
+        self.assertEqual(stats['evictions'], 1)
+
+    @override_settings(LOWONGAN_SEARCH_CACHE_MAX_ROWS=3)
+    def test_large_result_not_cached(self):
+        result = self.search('intern', limit=5)
+
+        self.assertEqual(result['total'], 8)
+        self.assertEqual(len(result['data']), 5)
+        self.assertEqual(LOWONGAN_SEARCH_CACHE.get_stats()['entries'], 0)
+
+
+class SubmissionDataMixin:
+    """Helper data submit pendaftaran"""
+
+    def create_lowongan_list(self, count=2):
+        departement = Departement.objects.create(nama_dept='Engineering')
+        return [
+            Lowongan.objects.create(
+                posisi=f'Intern {i}',
+                deskripsi='Deskripsi lowongan',
+                tanggal_mulai=date(2025, 1, 1),
+                tanggal_selesai=date(2025, 4, 1),
+                departement=departement
+            )
+            for i in range(count)
+        ]
+
+    def data(self, nik, lowongan):
+        return {
+            'id_lowongan': lowongan.id_lowongan,
+            'nik': nik,
+            'name': 'Siti Nurhaliza',
+            'gender': 'P',
+            'dob': '2000-02-02',
+            'address': 'Jl. Gatot Subroto No. 45',
+            'no_telp': '081234567891',
+            'university': 'Institut Teknologi Bandung',
+            'major': 'Teknik Informatika',
+            'ipk': '3.78',
+            'path_cv': 'cv/dummy.pdf',
+        }
+
+
+class SubmissionTest(SubmissionDataMixin, TestCase):
+    """Test jalur submit pendaftaran"""
+
+    def setUp(self):
+        self.lowongan = self.create_lowongan_list()
+
+    def test_submission_round_trips(self):
+        PendaftaranService.create_pendaftaran(self.data('3174020202960001', self.lowongan[0]))
+
+        # transaksi (savepoint di dalam TestCase), lowongan, savepoint + insert pendaftar + release,
+        # insert transaksi, satu UPDATE untuk semua counter, commit
+        with self.assertNumQueries(8):
+            result = PendaftaranService.create_pendaftaran(self.data('3174020202960002', self.lowongan[0]))
+        self.assertTrue(result['success'])
+
+    def test_duplicate_and_missing_lowongan(self):
+        self.assertTrue(PendaftaranService.create_pendaftaran(self.data('3174020202960001', self.lowongan[0]))['success'])
+
+        duplicate = PendaftaranService.create_pendaftaran(self.data('3174020202960001', self.lowongan[0]))
+        self.assertEqual(duplicate['error'], 'duplicate')
+
+        other = PendaftaranService.create_pendaftaran(self.data('3174020202960001', self.lowongan[1]))
+        self.assertTrue(other['success'])
+        self.assertEqual(Pendaftar.objects.count(), 1)
+
+        missing = self.data('3174020202960002', self.lowongan[0])
+        missing['id_lowongan'] = 999
+        self.assertEqual(PendaftaranService.create_pendaftaran(missing)['error'], 'lowongan_not_found')
+
+
+    def test_manual_transaksi_duplicate_uses_constraint(self):
+        pendaftar = PendaftaranService.create_pendaftaran(self.data('3174020202960001', self.lowongan[0]))['pendaftar']
+
+        duplicate = TransaksiPendaftaranService.create_transaksi_manual(pendaftar.pk, self.lowongan[0].id_lowongan)
+        self.assertFalse(duplicate['success'])
+        self.assertEqual(duplicate['message'], 'Transaksi sudah ada dengan status pending')
+
+        other = TransaksiPendaftaranService.create_transaksi_manual(pendaftar.pk, self.lowongan[1].id_lowongan)
+        self.assertTrue(other['success'])
+        self.assertEqual(DashboardCounter.objects.get(scope='total', key='transaksi').value, 2)
+
+
+class SubmissionConcurrencyTest(SubmissionDataMixin, TransactionTestCase):
+    """Stress test submit pendaftaran bersamaan: tidak boleh ada duplikat atau pendaftar yatim"""
+
+    THREADS = 8
+
+    def setUp(self):
+        if connection.vendor == 'sqlite':
+            if connection.is_in_memory_db():
+                # Koneksi thread pada SQLite in-memory (shared cache) gagal dengan "table is locked"
+                # alih-alih menunggu; jalankan dengan PostgreSQL atau TEST NAME berupa file
+                self.skipTest('Butuh database yang mendukung koneksi bersamaan')
+            # SQLite file: transaksi DEFERRED yang naik dari baca ke tulis langsung gagal dengan
+            # "database is locked". Koneksi thread dibuat dari dict settings yang sama, jadi
+            # BEGIN IMMEDIATE + timeout di sini membuat submit saling menunggu seperti di PostgreSQL
+            patcher = mock.patch.dict(connection.settings_dict['OPTIONS'], {'transaction_mode': 'IMMEDIATE', 'timeout': 20})
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.lowongan = self.create_lowongan_list()
+
+    def run_concurrently(self, payloads):
+        results = []
+        barrier = threading.Barrier(len(payloads))
+
+        def submit(payload):
+            try:
+                barrier.wait()
+                results.append(PendaftaranService.create_pendaftaran(payload))
+            finally:
+                connection.close()
+
+        threads = [threading.Thread(target=submit, args=(payload,)) for payload in payloads]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return results
+
+    def test_same_nik_same_lowongan(self):
+        results = self.run_concurrently([self.data('3174020202960001', self.lowongan[0])] * self.THREADS)
+
+        self.assertEqual(sum(result['success'] for result in results), 1)
+        self.assertEqual({result['error'] for result in results if not result['success']}, {'duplicate'})
+        self.assertEqual(Pendaftar.objects.count(), 1)
+        self.assertEqual(TransaksiPendaftaran.objects.count(), 1)
+
+    def test_same_nik_different_lowongan(self):
+        payloads = [self.data('3174020202960001', self.lowongan[i % 2]) for i in range(self.THREADS)]
+        results = self.run_concurrently(payloads)
+
+        self.assertEqual(sum(result['success'] for result in results), 2)
+        self.assertEqual(Pendaftar.objects.count(), 1)
+        self.assertEqual(TransaksiPendaftaran.objects.count(), 2)
+        # Tidak ada pendaftar tanpa transaksi
+        self.assertFalse(Pendaftar.objects.filter(transaksi_pendaftaran__isnull=True).exists())
+
+        incremental = set(DashboardCounter.objects.values_list('scope', 'key', 'value'))
+        DashboardCounterService.rebuild()
+        self.assertEqual(incremental, set(DashboardCounter.objects.values_list('scope', 'key', 'value')))
+
+
+class UniqueTransaksiMigrationTest(TransactionTestCase):
+    """Test migrasi 0005: pendaftaran ganda dihapus sebelum constraint unik dibuat"""
+
+    before = [('magang', '0004_search_indexes'), ('admin_dashboard', '0002_counter_scope_versi')]
+    after = [('magang', '0005_transaksi_unique_pendaftar_lowongan')]
+
+    def tearDown(self):
+        executor = MigrationExecutor(connection)
+        executor.loader.build_graph()
+        executor.migrate(executor.loader.graph.leaf_nodes())
+
+    def test_duplicates_removed_and_counters_adjusted(self):
+        executor = MigrationExecutor(connection)
+        executor.migrate(self.before)
+        apps = executor.loader.project_state(self.before).apps
+        departement = apps.get_model('magang', 'Departement').objects.create(nama_dept='Engineering')
+        lowongan = apps.get_model('magang', 'Lowongan').objects.create(
+            posisi='Intern', deskripsi='-', tanggal_mulai=date(2025, 1, 1),
+            tanggal_selesai=date(2025, 4, 1), departement=departement
+        )
+        pendaftar = apps.get_model('magang', 'Pendaftar').objects.create(
+            lowongan=lowongan, nik='3174020202960001', name='Siti', gender='P', dob=date(2000, 2, 2),
+            address='-', no_telp='0812', university='ITB', major='Informatika'
+        )
+        Transaksi = apps.get_model('magang', 'TransaksiPendaftaran')
+        for status in ['pending', 'approved', 'pending']:
+            Transaksi.objects.create(pendaftar=pendaftar, lowongan=lowongan, status=status)
+        for scope, key, value in [('total', 'transaksi', 3), ('status', 'pending', 2),
+                                  ('status', 'approved', 1), ('departemen', str(departement.pk), 3)]:
+            apps.get_model('admin_dashboard', 'DashboardCounter').objects.update_or_create(
+                scope=scope, key=key, defaults={'value': value}
+            )
+
+        executor = MigrationExecutor(connection)
+        executor.migrate(self.after)
+        apps = executor.loader.project_state(self.after).apps
+
+        self.assertEqual(
+            list(apps.get_model('magang', 'TransaksiPendaftaran').objects.values_list('status', flat=True)),
+            ['approved']
+        )
+        counters = {
+            (counter.scope, counter.key): counter.value
+            for counter in apps.get_model('admin_dashboard', 'DashboardCounter').objects.all()
+        }
+        expected = {('total', 'transaksi'): 1, ('status', 'pending'): 0,
+                    ('status', 'approved'): 1, ('departemen', str(departement.pk)): 1}
+        self.assertEqual({key: counters[key] for key in expected}, expected)
+
+
+VALID_PDF = (
+    b'%PDF-1.4\n1 0 obj << /Type /Catalog /Pages 2 0 R >> endobj\n'
+    b'2 0 obj << /Type /Pages /Kids [3 0 R 4 0 R] /Count 2 >> endobj\n'
+    b'3 0 obj << /Type /Page /Parent 2 0 R >> endobj\n'
+    b'4 0 obj << /Type/Page /Parent 2 0 R >> endobj\n'
+    b'trailer << /Root 1 0 R >>\n%%EOF\n'
+)
+
+
+class CvUploadMixin(SubmissionDataMixin):
+    """MEDIA_ROOT dan staging sementara untuk test file CV"""
+
+    def setUp(self):
+        self.media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media_root, ignore_errors=True)
+        staging_dir = os.path.join(self.media_root, 'staging')
+        override = override_settings(MEDIA_ROOT=self.media_root, CV_STAGING_DIR=staging_dir)
+        override.enable()
+        self.addCleanup(override.disable)
+        self.lowongan = self.create_lowongan_list()
+
+    def submit(self, nik, content, lowongan=None):
+        data = self.data(nik, lowongan or self.lowongan[0])
+        del data['path_cv']
+        data['cv_staging_path'] = CvProcessingService.stage_upload(SimpleUploadedFile('cv budi.pdf', content))
+        data['cv_original_name'] = 'cv budi.pdf'
+        return data['cv_staging_path'], PendaftaranService.create_pendaftaran(data)
+
+
+class CvProcessingJobTest(CvUploadMixin, TestCase):
+    """Test antrian pemrosesan CV di luar request submit"""
+
+    def test_valid_pdf_finalized(self):
+        staging_path, result = self.submit('3174020202960001', VALID_PDF)
+        self.assertEqual(result['pendaftar'].cv_status, 'processing')
+        self.assertFalse(result['pendaftar'].path_cv)
+
+        self.assertEqual(CvProcessingService.run_pending(), {'done': 1, 'pending': 0, 'failed': 0})
+
+        pendaftar = Pendaftar.objects.get(pk=result['pendaftar'].pk)
+        self.assertEqual(pendaftar.cv_status, 'ready')
+        self.assertTrue(pendaftar.path_cv.name.startswith('cv/'))
+        self.assertEqual(pendaftar.path_cv.read(), VALID_PDF)
+        self.assertEqual(pendaftar.cv_metadata['pages'], 2)
+        self.assertEqual(pendaftar.cv_metadata['pdf_version'], '1.4')
+        self.assertEqual(pendaftar.cv_metadata['size'], len(VALID_PDF))
+        self.assertFalse(os.path.exists(staging_path))
+        self.assertEqual(CvProcessingJob.objects.get().status, CvProcessingJob.STATUS_DONE)
+
+    def test_invalid_magic_bytes_not_retried(self):
+        staging_path, result = self.submit('3174020202960001', b'MZ\x90\x00 bukan pdf')
+
+        self.assertEqual(CvProcessingService.run_pending(), {'done': 0, 'pending': 0, 'failed': 1})
+
+        job = CvProcessingJob.objects.get()
+        self.assertEqual(job.attempts, 1)
+        self.assertIn('%PDF-', job.last_error)
+        self.assertEqual(Pendaftar.objects.get(pk=result['pendaftar'].pk).cv_status, 'invalid')
+        self.assertFalse(os.path.exists(staging_path))
+
+    @override_settings(CV_JOB_MAX_ATTEMPTS=2)
+    def test_storage_error_retried_with_backoff(self):
+        staging_path, _ = self.submit('3174020202960001', VALID_PDF)
+
+        with mock.patch('django.core.files.storage.FileSystemStorage.save', side_effect=OSError('disk penuh')), \
+                self.assertLogs('magang.services.cv_processing_service', 'ERROR'):
+            self.assertEqual(CvProcessingService.run_pending(), {'done': 0, 'pending': 1, 'failed': 0})
+            # Belum waktunya dicoba ulang
+            self.assertEqual(CvProcessingService.run_pending(), {'done': 0, 'pending': 0, 'failed': 0})
+            self.assertTrue(os.path.exists(staging_path))
+
+            CvProcessingJob.objects.update(available_at=timezone.now())
+            self.assertEqual(CvProcessingService.run_pending(), {'done': 0, 'pending': 0, 'failed': 1})
+
+        job = CvProcessingJob.objects.get()
+        self.assertEqual(job.attempts, 2)
+        self.assertIn('disk penuh', job.last_error)
+
+    def test_staging_file_removed_with_deleted_lowongan(self):
+        staging_path, _ = self.submit('3174020202960001', VALID_PDF)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            DashboardService.delete_lowongan(self.lowongan[0].id_lowongan)
+
+        self.assertFalse(CvProcessingJob.objects.exists())
+        self.assertFalse(os.path.exists(staging_path))
+
+    def test_unused_staging_file_discarded(self):
+        self.submit('3174020202960001', VALID_PDF)
+
+        # NIK lama: CV sebelumnya tetap dipakai, file staging baru dibuang
+        staging_path, result = self.submit('3174020202960001', VALID_PDF, self.lowongan[1])
+        self.assertTrue(result['success'])
+        self.assertFalse(os.path.exists(staging_path))
+
+        staging_path, result = self.submit('3174020202960001', VALID_PDF, self.lowongan[1])
+        self.assertEqual(result['error'], 'duplicate')
+        self.assertFalse(os.path.exists(staging_path))
+        self.assertEqual(CvProcessingJob.objects.count(), 1)
+
+
+class CvStorageTest(CvUploadMixin, TestCase):
+    """Test penyimpanan CV content-addressed dengan reference counting"""
+
+    def cv_files(self):
+        return [files for _dir, _dirs, files in os.walk(os.path.join(self.media_root, 'cv')) if files]
+
+    def test_same_content_stored_once(self):
+        other_lowongan = self.create_lowongan_list(1)[0]
+        _, first = self.submit('3174020202960001', VALID_PDF)
+        _, second = self.submit('3174020202960002', VALID_PDF, other_lowongan)
+        CvProcessingService.run_pending()
+
+        paths = set(Pendaftar.objects.values_list('path_cv', flat=True))
+        self.assertEqual(len(paths), 1)
+        digest = hashlib.sha256(VALID_PDF).hexdigest()
+        self.assertEqual(paths.pop(), f'cv/{digest[:2]}/{digest[2:4]}/{digest}.pdf')
+        self.assertEqual(self.cv_files(), [[f'{digest}.pdf']])
+        self.assertEqual(CvBlob.objects.get().ref_count, 2)
+
+    def test_file_deleted_with_last_reference(self):
+        other_lowongan = self.create_lowongan_list(1)[0]
+        self.submit('3174020202960001', VALID_PDF)
+        self.submit('3174020202960002', VALID_PDF, other_lowongan)
+        CvProcessingService.run_pending()
+        path = os.path.join(self.media_root, CvBlob.objects.get().path)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            DashboardService.delete_lowongan(self.lowongan[0].id_lowongan)
+        self.assertEqual(CvBlob.objects.get().ref_count, 1)
+        self.assertTrue(os.path.exists(path))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            DashboardService.delete_departemen(other_lowongan.departement_id)
+        self.assertFalse(CvBlob.objects.exists())
+        self.assertFalse(os.path.exists(path))
+
+    def test_store_before_pending_file_delete_keeps_file(self):
+        self.submit('3174020202960001', VALID_PDF)
+        CvProcessingService.run_pending()
+        path = os.path.join(self.media_root, CvBlob.objects.get().path)
+
+        with self.captureOnCommitCallbacks() as callbacks:
+            DashboardService.delete_lowongan(self.lowongan[0].id_lowongan)
+        # Isi yang sama disimpan lagi sebelum file sempat dihapus
+        name = CvStorageService.store(ContentFile(VALID_PDF), 'cv.pdf')
+        for callback in callbacks:
+            callback()
+
+        self.assertTrue(os.path.exists(path))
+        self.assertEqual((CvBlob.objects.get().path, CvBlob.objects.get().ref_count), (name, 1))
+
+    def test_file_deleted_before_acquire_is_rewritten(self):
+        name = CvStorageService.store(ContentFile(VALID_PDF), 'cv.pdf')
+        path = cv_storage.path(name)
+        acquire = CvStorageService._acquire
+
+        def acquire_after_delete(name, size):
+            # _delete_files selesai tepat sebelum store() mendapat lock blob
+            os.remove(path)
+            acquire(name, size)
+
+        with mock.patch.object(CvStorageService, '_acquire', side_effect=acquire_after_delete):
+            CvStorageService.store(ContentFile(VALID_PDF), 'cv.pdf')
+
+        self.assertTrue(os.path.exists(path))
+        self.assertEqual(CvBlob.objects.get().ref_count, 2)
+
+    def test_collect_garbage(self):
+        self.submit('3174020202960001', VALID_PDF)
+        CvProcessingService.run_pending()
+        CvBlob.objects.update(ref_count=5)
+        # File tanpa CvBlob, misal tertinggal dari transaksi yang di-rollback
+        orphan = ContentFile(b'%PDF-1.4 orphan %%EOF')
+        orphan_path = os.path.join(self.media_root, cv_storage.save('cv/lain.pdf', orphan))
+        legacy_path = os.path.join(self.media_root, 'cv', 'cv_lama.pdf')
+        with open(legacy_path, 'wb') as legacy:
+            legacy.write(VALID_PDF)
+
+        # File baru masih dalam masa tenggang
+        result = CvStorageService.collect_garbage()
+        self.assertEqual((result['recounted'], result['deleted_files']), (1, 0))
+        self.assertEqual(CvBlob.objects.get().ref_count, 1)
+        self.assertTrue(os.path.exists(orphan_path))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            result = CvStorageService.collect_garbage(grace_seconds=0)
+        self.assertEqual((result['recounted'], result['deleted_files']), (0, 1))
+        self.assertFalse(os.path.exists(orphan_path))
+        self.assertTrue(os.path.exists(legacy_path))
+
+    def test_collect_garbage_keeps_new_unreferenced_blob(self):
+        _, result = self.submit('3174020202960001', VALID_PDF)
+        CvProcessingService.run_pending()
+        path = Pendaftar.objects.get(pk=result['pendaftar'].pk).path_cv.path
+        # Referensi sudah diambil, pendaftar yang memakainya belum terlihat
+        Pendaftar.objects.update(path_cv='')
+
+        self.assertEqual(CvStorageService.collect_garbage()['deleted_blobs'], 0)
+        self.assertTrue(CvBlob.objects.exists())
+
+        CvBlob.objects.update(created_at=timezone.now() - timedelta(hours=2))
+        with self.captureOnCommitCallbacks(execute=True):
+            self.assertEqual(CvStorageService.collect_garbage()['deleted_blobs'], 1)
+        self.assertFalse(os.path.exists(path))
+
+
+class ImportServiceTest(SubmissionDataMixin, TestCase):
+    """Test bulk import pendaftar dari CSV/JSONL"""
+
+    HEADER = 'nik,name,gender,dob,address,no_telp,university,major,ipk,id_lowongan\n'
+
+    def setUp(self):
+        self.lowongan = self.create_lowongan_list()
+
+    def csv_line(self, nik, lowongan_id, gender='P', ipk='3.50'):
+        return f'{nik},Siti Nurhaliza,{gender},2000-02-02,"Jl. Gatot Subroto, Bandung",0812,ITB,Informatika,{ipk},{lowongan_id}\n'
+
+    def run_import(self, content, file_format='csv', **kwargs):
+        return ImportService.import_rows(read_rows(io.StringIO(content, newline=''), file_format), **kwargs)
+
+    def test_csv_import_with_row_errors(self):
+        PendaftaranService.create_pendaftaran(self.data('3174020202960009', self.lowongan[0]))
+        first, second = self.lowongan[0].id_lowongan, self.lowongan[1].id_lowongan
+        content = self.HEADER + ''.join([
+            self.csv_line('3174020202960001', first),
+            self.csv_line('3174020202960001', second),
+            self.csv_line('3174020202960002', first, gender='X', ipk='5'),
+            self.csv_line('3174020202960009', first),
+            self.csv_line('3174020202960009', second),
+            self.csv_line('3174020202960003', 999),
+            self.csv_line('3174020202960001', first),
+        ])
+
+        summary = self.run_import(content, chunk_size=4)
+
+        self.assertEqual(summary['processed'], 7)
+        self.assertEqual(summary['created_pendaftar'], 1)
+        self.assertEqual(summary['reused_pendaftar'], 1)
+        self.assertEqual(summary['created_transaksi'], 3)
+        self.assertEqual(summary['duplicates'], 2)
+        self.assertEqual(summary['failed'], 4)
+        errors = {error['row']: error['errors'] for error in summary['errors']}
+        self.assertEqual(sorted(errors), [4, 5, 7, 8])
+        self.assertEqual(errors[4], ['gender harus L atau P', 'ipk harus angka 0 - 4'])
+        self.assertEqual(Pendaftar.objects.get(nik='3174020202960001').address, 'Jl. Gatot Subroto, Bandung')
+
+        incremental = set(DashboardCounter.objects.values_list('scope', 'key', 'value'))
+        DashboardCounterService.rebuild()
+        self.assertEqual(incremental, set(DashboardCounter.objects.values_list('scope', 'key', 'value')))
+
+    def test_jsonl_import(self):
+        content = '\n'.join([
+            f'{{"nik": "3174020202960001", "name": "Budi", "gender": "L", "dob": "2000-01-01", "address": "Jl. A",'
+            f' "no_telp": "0812", "university": "UI", "major": "TI", "ipk": 3.75, "id_lowongan": {self.lowongan[0].id_lowongan}}}',
+            '{"nik": rusak}',
+            '["bukan", "object"]',
+        ])
+
+        summary = self.run_import(content, 'jsonl')
+
+        self.assertEqual((summary['created_transaksi'], summary['failed']), (1, 2))
+        self.assertEqual([error['row'] for error in summary['errors']], [2, 3])
+        self.assertEqual(str(Pendaftar.objects.get().ipk), '3.75')
+
+    def test_query_count_independent_of_rows(self):
+        def content(start, count):
+            return self.HEADER + ''.join(
+                self.csv_line(f'31740202{start + i:08d}', self.lowongan[0].id_lowongan) for i in range(count)
+            )
+
+        def lookups(context):
+            # SQLite memecah bulk INSERT sesuai batas jumlah parameter, yang dihitung hanya query lain
+            return [query for query in context.captured_queries if not query['sql'].startswith('INSERT')]
+
+        # Baris counter harian dibuat pada import pertama
+        self.run_import(content(0, 1))
+        with CaptureQueriesContext(connection) as small:
+            self.run_import(content(100, 10), chunk_size=500)
+        with CaptureQueriesContext(connection) as large:
+            self.run_import(content(1000, 300), chunk_size=500)
+        self.assertEqual(len(lookups(small)), len(lookups(large)))
+        self.assertEqual(TransaksiPendaftaran.objects.count(), 311)
+
+
+class SeederTest(TestCase):
+    """Test seeder data sintetis"""
+
+    def seed(self, **options):
+        options = {'departemen': 12, 'lowongan': 30, 'pendaftar': 200, 'batch_size': 64,
+                   'today': date(2025, 6, 1), 'log': lambda message: None, **options}
+        return run_seeder(**options)
+
+    def snapshot(self):
+        pendaftar = list(Pendaftar.objects.order_by('nik').values_list(
+            'nik', 'name', 'ipk', 'created_at', 'lowongan__posisi', 'lowongan__departement__nama_dept'
+        ))
+        transaksi = list(TransaksiPendaftaran.objects.order_by('pendaftar__nik', 'created_at').values_list(
+            'pendaftar__nik', 'lowongan__tanggal_mulai', 'status', 'created_at', 'updated_at'
+        ))
+        return pendaftar, transaksi
+
+    def test_deterministic_dataset(self):
+        result = self.seed()
+        self.assertEqual((result['departemen'], result['lowongan'], result['pendaftar']), (12, 30, 200))
+        self.assertEqual(TransaksiPendaftaran.objects.count(), result['transaksi'])
+        self.assertGreater(result['transaksi'], 200)
+        first = self.snapshot()
+
+        self.seed()
+        self.assertEqual(first, self.snapshot())
+        self.seed(seed=7)
+        self.assertNotEqual(first, self.snapshot())
+
+    def test_explicit_timestamps_only_in_seeding_thread(self):
+        field = TransaksiPendaftaran._meta.get_field('updated_at')
+        synthetic = timezone.now() - timedelta(days=30)
+        other_thread = []
+
+        def save_elsewhere():
+            other_thread.append(field.pre_save(TransaksiPendaftaran(updated_at=synthetic), False))
+
+        with _explicit_timestamps(TransaksiPendaftaran):
+            self.assertEqual(field.pre_save(TransaksiPendaftaran(updated_at=synthetic), False), synthetic)
+            thread = threading.Thread(target=save_elsewhere)
+            thread.start()
+            thread.join()
+
+        self.assertNotEqual(other_thread[0], synthetic)
+        self.assertNotEqual(field.pre_save(TransaksiPendaftaran(updated_at=synthetic), False), synthetic)
+
+    def test_clear_does_not_load_rows(self):
+        self.seed()
+        with mock.patch.object(Pendaftar, '__init__', side_effect=AssertionError('baris dimuat')):
+            clear_data(log=lambda message: None)
+        self.assertFalse(Pendaftar.objects.exists())
+        self.assertFalse(Departement.objects.exists())
+
+    def test_synthetic_timestamps_and_counters(self):
+        self.seed()
+        statuses = set(TransaksiPendaftaran.objects.values_list('status', flat=True))
+        self.assertEqual(statuses, {'pending', 'approved', 'rejected'})
+        self.assertGreater(Pendaftar.objects.dates('created_at', 'month').count(), 3)
+        self.assertFalse(TransaksiPendaftaran.objects.filter(updated_at__lt=F('created_at')).exists())
+
+        incremental = sorted(DashboardCounter.objects.filter(value__gt=0).values_list('scope', 'key', 'value'))
+        DashboardCounterService.rebuild()
+        self.assertEqual(incremental, sorted(DashboardCounter.objects.filter(value__gt=0).values_list('scope', 'key', 'value')))
+
+        # Timestamp otomatis kembali berlaku setelah seeding
+        created = Pendaftar.objects.create(
+            lowongan=Lowongan.objects.first(), nik='9999999999999999', name='Baru', gender='P',
+            dob=date(2000, 1, 1), address='-', no_telp='0812', university='ITB', major='Informatika',
+            created_at=timezone.now() - timedelta(days=365)
+        )
+        self.assertGreater(created.created_at, timezone.now() - timedelta(minutes=1))
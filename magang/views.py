@@ -1,8 +1,13 @@
+from functools import wraps
+from django.conf import settings
 from django.shortcuts import render
 from django.http import JsonResponse
-from django.db.models import Q
+from django.utils.cache import patch_cache_control
 from django.views.decorators.csrf import csrf_exempt
-from .models import Lowongan, Pendaftar, TransaksiPendaftaran
+from django.views.decorators.http import condition
+from .services.cv_processing_service import CvProcessingService
+from .services.lowongan_service import LowonganService
+from .services.pendaftaran_service import PendaftaranService
 import json
 
 # Create your views here.
@@ -15,38 +20,78 @@ def home(request):
     return render(request, 'list_magang_screen.html', context)
 
 
+def _lowongan_feed_marker(request):
+    # Dipakai oleh etag_func dan last_modified_func, cukup dibaca sekali per request
+    if not hasattr(request, '_lowongan_feed_marker'):
+        request._lowongan_feed_marker = LowonganService.get_feed_marker()
+    return request._lowongan_feed_marker
+
+
+def _lowongan_feed_etag(request):
+    version, updated_at = _lowongan_feed_marker(request)
+    stamp = int(updated_at.timestamp() * 1000000) if updated_at else 0
+    return f'lowongan-{version}-{stamp}'
+
+
+def _lowongan_feed_last_modified(request):
+    return _lowongan_feed_marker(request)[1]
+
+
+def lowongan_feed_cache_control(view_func):
+    """Cache-Control untuk feed publik, termasuk respons 304"""
+    @wraps(view_func)
+    def wrapper(request, *args, **kwargs):
+        response = view_func(request, *args, **kwargs)
+        patch_cache_control(response, public=True, max_age=0, s_maxage=settings.LOWONGAN_FEED_PROXY_MAX_AGE)
+        return response
+    return wrapper
+
+
+@lowongan_feed_cache_control
+@condition(etag_func=_lowongan_feed_etag, last_modified_func=_lowongan_feed_last_modified)
 def get_lowongan_api(request):
-    """API endpoint untuk mengambil list lowongan via AJAX"""
+    """
+    API endpoint untuk mengambil list lowongan via AJAX (keyset pagination)
+    Query params:
+        search: kata kunci pencarian
+        limit: jumlah lowongan per halaman
+        cursor: next_cursor dari halaman sebelumnya
+        total: 'exact' (default), 'estimate' atau 'none'
+    Mendukung If-None-Match/If-Modified-Since: jika feed belum berubah
+    dijawab 304 tanpa menjalankan query lowongan.
+    """
     search_query = request.GET.get('search', '').strip()
+    cursor = request.GET.get('cursor') or None
+    total_mode = request.GET.get('total', 'exact')
     
-    magang_list = Lowongan.objects.select_related('departement').order_by('-tanggal_mulai')
-    
-    if search_query:
-        magang_list = magang_list.filter(
-            Q(posisi__icontains=search_query) | 
-            Q(departement__nama_dept__icontains=search_query)
-        )
+    try:
+        page = LowonganService.get_lowongan_page(search_query, cursor, request.GET.get('limit'))
+    except ValueError as e:
+        return JsonResponse({
+            'success': False,
+            'message': str(e)
+        }, status=400)
     
-    # Convert queryset to list of dicts for JSON response
-    data = [
-        {
-            'id_lowongan': lowongan.id_lowongan,
-            'posisi': lowongan.posisi,
-            'nama_dept': lowongan.departement.nama_dept,
-            'deskripsi': lowongan.deskripsi,
-            'tanggal_mulai': lowongan.tanggal_mulai.strftime('%Y-%m-%d'),
-            'tanggal_selesai': lowongan.tanggal_selesai.strftime('%Y-%m-%d'),
-        }
-        for lowongan in magang_list
-    ]
+    total = None
+    if total_mode != 'none':
+        total = LowonganService.count_lowongan(search_query, estimate=(total_mode == 'estimate'))
     
     return JsonResponse({
         'success': True,
-        'data': data,
-        'total': len(data)
+        'data': page['items'],
+        'total': total,
+        'next_cursor': page['next_cursor'],
+        'has_more': page['has_more']
     })
 
 
+# Status HTTP untuk kegagalan PendaftaranService.create_pendaftaran
+SUBMISSION_ERROR_STATUS = {
+    'lowongan_not_found': 404,
+    'duplicate': 409,
+}
+
+
 @csrf_exempt
 def submit_pendaftaran(request):
     """API endpoint untuk submit pendaftaran magang via AJAX"""
@@ -77,22 +122,6 @@ def submit_pendaftaran(request):
                 'message': 'Semua field wajib diisi'
             }, status=400)
         
-        # Check if lowongan exists
-        try:
-            lowongan = Lowongan.objects.get(id_lowongan=id_lowongan)
-        except Lowongan.DoesNotExist:
-            return JsonResponse({
-                'success': False,
-                'message': 'Lowongan tidak ditemukan'
-            }, status=404)
-        
-        # Check if NIK already exists
-        if Pendaftar.objects.filter(nik=nik).exists():
-            return JsonResponse({
-                'success': False,
-                'message': 'NIK sudah terdaftar. Gunakan NIK yang berbeda.'
-            }, status=400)
-        
         # Validate file type
         if not cv_file.name.endswith('.pdf'):
             return JsonResponse({
@@ -107,27 +136,33 @@ def submit_pendaftaran(request):
                 'message': 'Ukuran file CV maksimal 2MB'
             }, status=400)
         
-        # Create Pendaftar
-        pendaftar = Pendaftar.objects.create(
-            lowongan=lowongan,
-            nik=nik,
-            name=name,
-            gender=gender,
-            dob=dob,
-            address=address,
-            no_telp=no_telp,
-            university=university,
-            major=major,
-            path_cv=cv_file,
-            ipk=ipk if ipk else None
-        )
+        # Validasi isi PDF, metadata dan penyimpanan final dikerjakan worker process_cv_jobs
+        staging_path = CvProcessingService.stage_upload(cv_file)
+        
+        # Satu transaksi: lowongan, pendaftar (insert atau pakai NIK yang ada), transaksi, counter, job CV
+        result = PendaftaranService.create_pendaftaran({
+            'id_lowongan': id_lowongan,
+            'nik': nik,
+            'name': name,
+            'gender': gender,
+            'dob': dob,
+            'address': address,
+            'no_telp': no_telp,
+            'university': university,
+            'major': major,
+            'ipk': ipk,
+            'cv_staging_path': staging_path,
+            'cv_original_name': cv_file.name,
+        })
+        if not result['success']:
+            status = SUBMISSION_ERROR_STATUS.get(result['error'], 500)
+            return JsonResponse({
+                'success': False,
+                'message': result['message']
+            }, status=status)
         
-        # Create TransaksiPendaftaran
-        transaksi = TransaksiPendaftaran.objects.create(
-            pendaftar=pendaftar,
-            lowongan=lowongan,
-            status='pending'
-        )
+        pendaftar = result['pendaftar']
+        transaksi = result['transaksi']
         
         return JsonResponse({
             'success': True,
@@ -1,552 +1,432 @@
+"""
+Seeder data sintetis untuk development dan uji performa.
+
+Data dibuat dengan bulk_create per batch dan bersifat deterministik: seed dan tanggal
+acuan yang sama selalu menghasilkan dataset yang sama. Skala bisa diatur, misalnya:
+
+    python manage.py seed_data                                  # dataset demo kecil
+    python manage.py seed_data --departemen 100 --lowongan 10000 --pendaftar 1000000
+
+File ini juga tetap bisa dijalankan langsung: python seeder/seed_data.py [opsi yang sama]
+"""
 import os
 import sys
-import django
+import random
+import threading
+import time
+from bisect import bisect
+from contextlib import contextmanager
 from datetime import datetime, timedelta
 from decimal import Decimal
+from itertools import accumulate
+
+if __name__ == "__main__":
+    # Setup Django environment
+    sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings.local')
+
+    from django.core.management import execute_from_command_line
+    execute_from_command_line([sys.argv[0], 'seed_data', *sys.argv[1:]])
+    sys.exit()
+
+from django.db import connection, transaction
+from django.utils import timezone
+from admin_dashboard.cache import DashboardCache
+from admin_dashboard.counter_service import DashboardCounterService
+from magang.models import CvProcessingJob, Departement, Lowongan, Pendaftar, TransaksiPendaftaran
+from magang.services.cv_processing_service import CvProcessingService
+from magang.services.cv_storage_service import CvStorageService
+from magang.services.lowongan_service import LOWONGAN_SEARCH_CACHE, LowonganService
+from magang.services.search_service import SearchService
+
+DEFAULT_SCALE = {'departemen': 9, 'lowongan': 20, 'pendaftar': 300}
+DEFAULT_SEED = 42
+SEED_BATCH_SIZE = 5000
+
+# Departemen dasar beserta posisi magangnya; departemen ke-10 dan seterusnya
+# memakai nama dasar + kota (misal "Engineering Surabaya")
+DEPARTEMEN_POSISI = {
+    "Accounting": [
+        ("Finance Administration Intern", "Membantu proses pembukuan, rekapitulasi data keuangan harian, dan pengarsipan dokumen keuangan perusahaan."),
+        ("Tax Compliance Intern", "Mendukung tim dalam mempersiapkan laporan pajak bulanan dan tahunan serta dokumentasi compliance."),
+    ],
+    "Business Development": [
+        ("Business Analyst Intern", "Melakukan riset pasar, analisis kompetitor, dan menyusun business proposal untuk pengembangan bisnis baru."),
+        ("Partnership Development Intern", "Membantu identifikasi calon mitra strategis dan mempersiapkan presentation deck untuk pitching."),
+    ],
+    "Engineering": [
+        ("Software Engineering Intern", "Pengembangan fitur aplikasi web menggunakan Django dan React, code review, dan testing automation."),
+        ("DevOps Intern", "Membantu deployment aplikasi, monitoring server, dan implementasi CI/CD pipeline."),
+        ("Quality Assurance Intern", "Melakukan testing manual dan automated testing untuk memastikan kualitas software sebelum release."),
+    ],
+    "Human Resources": [
+        ("HR Recruitment Intern", "Membantu proses screening CV, penjadwalan interview, dan administrasi rekrutmen karyawan baru."),
+        ("HR Learning & Development Intern", "Mendukung pelaksanaan program training karyawan dan mempersiapkan materi pelatihan internal."),
+    ],
+    "Legal": [
+        ("Legal Research Intern", "Melakukan riset hukum, review kontrak, dan membantu penyusunan legal opinion untuk keperluan bisnis."),
+        ("Corporate Legal Intern", "Membantu proses perizinan perusahaan, dokumentasi legal, dan monitoring compliance regulasi."),
+    ],
+    "Marketing": [
+        ("Digital Marketing Intern", "Membuat konten untuk social media, mengelola campaign iklan digital, dan analisis engagement metrics."),
+        ("Content Marketing Intern", "Menulis artikel blog, membuat video tutorial, dan mengoptimasi SEO untuk meningkatkan brand awareness."),
+        ("Brand Marketing Intern", "Membantu pelaksanaan event marketing, merchandise design, dan brand campaign activation."),
+    ],
+    "Product Management": [
+        ("Product Manager Intern", "Melakukan user research, membuat product roadmap, dan koordinasi dengan tim engineering untuk development."),
+        ("Product Analyst Intern", "Analisis data pengguna, A/B testing, dan membuat dashboard metrics untuk product performance."),
+    ],
+    "Sales": [
+        ("Sales Development Intern", "Melakukan prospecting calon klien, cold calling, dan mempersiapkan sales presentation."),
+        ("Account Management Intern", "Membantu maintain relationship dengan existing clients dan follow up sales pipeline."),
+    ],
+    "Training": [
+        ("Corporate Training Intern", "Membantu persiapan dan pelaksanaan program pelatihan internal karyawan serta evaluasi training."),
+        ("E-Learning Content Developer", "Membuat konten e-learning interaktif, video tutorial, dan modul pelatihan digital."),
+    ],
+}
+
+KOTA = [
+    "Jakarta", "Bandung", "Surabaya", "Yogyakarta", "Semarang", "Medan", "Makassar",
+    "Denpasar", "Palembang", "Balikpapan", "Malang", "Bogor",
+]
+# Kode wilayah 6 digit awal NIK
+KODE_WILAYAH = ["317401", "317402", "327301", "357801", "347103", "337401", "127101", "737101", "517101", "327101"]
+NAMA_DEPAN_L = [
+    "Budi", "Ahmad", "Rizky", "Andi", "Dimas", "Fajar", "Hendra", "Bayu", "Agus", "Yoga",
+    "Reza", "Arif", "Dwi", "Eko", "Gilang", "Ilham", "Kevin", "Muhammad", "Raka", "Teguh",
+]
+NAMA_DEPAN_P = [
+    "Siti", "Dewi", "Maya", "Putri", "Rina", "Indah", "Citra", "Ayu", "Nadia", "Fitri",
+    "Anisa", "Bella", "Dinda", "Laras", "Nur", "Rahma", "Salsa", "Tari", "Wulan", "Yuni",
+]
+NAMA_BELAKANG = [
+    "Santoso", "Nurhaliza", "Fauzi", "Lestari", "Pratama", "Angelina", "Setiawan", "Wulandari",
+    "Prasetyo", "Marlina", "Ramadhan", "Permatasari", "Wijaya", "Aditya", "Saputra", "Hidayat",
+    "Kusuma", "Nugroho", "Siregar", "Hutapea", "Sihombing", "Halim", "Gunawan", "Susanto",
+]
+UNIVERSITAS = [
+    "Universitas Indonesia", "Institut Teknologi Bandung", "Universitas Gadjah Mada",
+    "Institut Teknologi Sepuluh Nopember", "Universitas Airlangga", "Universitas Diponegoro",
+    "Universitas Padjadjaran", "Universitas Brawijaya", "Universitas Negeri Jakarta",
+    "Universitas Multimedia Nusantara", "Universitas Bina Nusantara", "Universitas Hasanuddin",
+    "Universitas Sumatera Utara", "Universitas Udayana", "Telkom University",
+]
+JURUSAN = [
+    "Akuntansi", "Manajemen", "Teknik Informatika", "Sistem Informasi", "Teknik Komputer",
+    "Statistika", "Hukum", "Psikologi", "Ilmu Komunikasi", "Marketing", "Perpajakan",
+    "Desain Komunikasi Visual", "Pendidikan", "Teknik Industri",
+]
+JALAN = [
+    "Sudirman", "Gatot Subroto", "Thamrin", "Diponegoro", "Asia Afrika", "Malioboro",
+    "Pahlawan", "Ahmad Yani", "Merdeka", "Pemuda", "Basuki Rahmat", "Rasuna Said",
+]
+# Jam kirim lamaran: ramai di jam kerja dan malam hari
+JAM_KIRIM = list(range(24))
+BOBOT_JAM = list(accumulate([1, 1, 1, 1, 1, 2, 3, 5, 8, 10, 10, 9, 7, 8, 9, 9, 8, 7, 6, 7, 8, 7, 5, 3]))
+# Proporsi pendaftar yang melamar lebih dari satu lowongan
+PROB_LAMARAN_KEDUA = 0.12
+PROB_LAMARAN_KETIGA = 0.03
+
+
+# Urutan tabel dihapus oleh clear_data: tabel anak dulu
+CLEAR_MODELS = [TransaksiPendaftaran, CvProcessingJob, Pendaftar, Lowongan, Departement]
+
+_explicit_timestamps_state = threading.local()
+_explicit_timestamps_lock = threading.Lock()
+
+
+def _install_explicit_timestamps(model):
+    """Membungkus pre_save field auto_now/auto_now_add model (sekali per field)"""
+    with _explicit_timestamps_lock:
+        for field in model._meta.concrete_fields:
+            if not (getattr(field, 'auto_now', False) or getattr(field, 'auto_now_add', False)):
+                continue
+            if 'pre_save' in vars(field):
+                continue
+
+            def pre_save(model_instance, add, field=field, original=field.pre_save):
+                value = getattr(model_instance, field.attname)
+                if getattr(_explicit_timestamps_state, 'active', False) and value is not None:
+                    return value
+                return original(model_instance, add)
+
+            field.pre_save = pre_save
+
+
+@contextmanager
+def _explicit_timestamps(*models):
+    """
+    created_at/updated_at sintetis yang sudah diisi di instance disimpan apa adanya, hanya
+    di thread ini. Flag auto_now tidak diubah, sehingga thread lain di proses yang sama
+    (runserver, benchmark) tetap mendapat timestamp otomatis.
+    """
+    for model in models:
+        _install_explicit_timestamps(model)
+    _explicit_timestamps_state.active = True
+    try:
+        yield
+    finally:
+        _explicit_timestamps_state.active = False
+
+
+def _cum_weights(rng, count, alpha=2.0):
+    """Bobot kumulatif berekor panjang (Pareto): sebagian kecil item sangat populer"""
+    return list(accumulate(rng.paretovariate(alpha) for _ in range(count)))
+
+
+def _pick(rng, cum_weights):
+    return bisect(cum_weights, rng.random() * cum_weights[-1])
+
 
-# Setup Django environment
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings.local')
-django.setup()
-
-from magang.models import Departement, Lowongan, Pendaftar, TransaksiPendaftaran
-
-
-def clear_data():
-    """Hapus semua data existing"""
-    print("Menghapus data existing...")
-    TransaksiPendaftaran.objects.all().delete()
-    Pendaftar.objects.all().delete()
-    Lowongan.objects.all().delete()
-    Departement.objects.all().delete()
-    print("✓ Data existing berhasil dihapus\n")
-
-
-def seed_departements():
-    """Seed data Departemen"""
-    print("Seeding Departements...")
-    
-    departements_data = [
-        "Accounting",
-        "Business Development",
-        "Engineering",
-        "Human Resources",
-        "Legal",
-        "Marketing",
-        "Product Management",
-        "Sales",
-        "Training"
-    ]
-    
-    departements = []
-    for nama in departements_data:
-        dept = Departement.objects.create(nama_dept=nama)
-        departements.append(dept)
-        print(f"  ✓ Created: {nama} (ID: {dept.id_dept})")
-    
-    print(f"✓ {len(departements)} Departements berhasil dibuat\n")
+def clear_data(batch_size=SEED_BATCH_SIZE, log=print):
+    """
+    Hapus semua data existing tanpa memuat baris ke memori: TRUNCATE di PostgreSQL,
+    DELETE per batch id di database lain. Signal delete tidak dipicu; counter dan
+    cache diperbarui oleh refresh_derived_data.
+    """
+    log("Menghapus data existing...")
+    with transaction.atomic():
+        # File CV content-addressed milik pendaftar dilepas sebelum barisnya dihapus
+        CvStorageService.release_pendaftar(Pendaftar.objects.all())
+        CvProcessingService.discard_pendaftar_jobs(Pendaftar.objects.all())
+        if connection.vendor == 'postgresql':
+            tables = ', '.join(connection.ops.quote_name(model._meta.db_table) for model in CLEAR_MODELS)
+            with connection.cursor() as cursor:
+                cursor.execute(f'TRUNCATE {tables} CASCADE')
+        else:
+            for model in CLEAR_MODELS:
+                while True:
+                    ids = list(model.objects.values_list('pk', flat=True)[:batch_size])
+                    if not ids:
+                        break
+                    model.objects.filter(pk__in=ids)._raw_delete(connection.alias)
+    log("✓ Data existing berhasil dihapus\n")
+
+
+def seed_departements(count, batch_size=SEED_BATCH_SIZE, log=print):
+    """
+    Seed data Departemen
+    Returns:
+        list: Departement yang dibuat
+    """
+    log("Seeding Departements...")
+    base_names = list(DEPARTEMEN_POSISI)
+    names = base_names[:count]
+    for i in range(len(names), count):
+        cycle, kota = divmod(i // len(base_names) - 1, len(KOTA))
+        names.append(f"{base_names[i % len(base_names)]} {KOTA[kota]}" + (f" {cycle + 1}" if cycle else ""))
+
+    departements = Departement.objects.bulk_create(
+        [Departement(nama_dept=name) for name in names], batch_size=batch_size
+    )
+    if any(dept.pk is None for dept in departements):
+        # Database tanpa RETURNING pada bulk insert
+        departements = list(Departement.objects.order_by('id_dept'))
+    log(f"✓ {len(departements)} Departements berhasil dibuat\n")
     return departements
 
 
-def seed_lowongan(departements):
-    """Seed data Lowongan"""
-    print("Seeding Lowongan...")
-    
-    today = datetime.now().date()
-    
-    lowongan_data = [
-        {
-            "posisi": "Finance Administration Intern",
-            "deskripsi": "Membantu proses pembukuan, rekapitulasi data keuangan harian, dan pengarsipan dokumen keuangan perusahaan.",
-            "departement": departements[0],  # Accounting
-            "tanggal_mulai": today + timedelta(days=15),
-            "tanggal_selesai": today + timedelta(days=105)
-        },
-        {
-            "posisi": "Tax Compliance Intern",
-            "deskripsi": "Mendukung tim dalam mempersiapkan laporan pajak bulanan dan tahunan serta dokumentasi compliance.",
-            "departement": departements[0],  # Accounting
-            "tanggal_mulai": today + timedelta(days=30),
-            "tanggal_selesai": today + timedelta(days=120)
-        },
-        {
-            "posisi": "Business Analyst Intern",
-            "deskripsi": "Melakukan riset pasar, analisis kompetitor, dan menyusun business proposal untuk pengembangan bisnis baru.",
-            "departement": departements[1],  # Business Development
-            "tanggal_mulai": today + timedelta(days=10),
-            "tanggal_selesai": today + timedelta(days=100)
-        },
-        {
-            "posisi": "Partnership Development Intern",
-            "deskripsi": "Membantu identifikasi calon mitra strategis dan mempersiapkan presentation deck untuk pitching.",
-            "departement": departements[1],  # Business Development
-            "tanggal_mulai": today + timedelta(days=20),
-            "tanggal_selesai": today + timedelta(days=110)
-        },
-        {
-            "posisi": "Software Engineering Intern",
-            "deskripsi": "Pengembangan fitur aplikasi web menggunakan Django dan React, code review, dan testing automation.",
-            "departement": departements[2],  # Engineering
-            "tanggal_mulai": today + timedelta(days=7),
-            "tanggal_selesai": today + timedelta(days=97)
-        },
-        {
-            "posisi": "DevOps Intern",
-            "deskripsi": "Membantu deployment aplikasi, monitoring server, dan implementasi CI/CD pipeline.",
-            "departement": departements[2],  # Engineering
-            "tanggal_mulai": today + timedelta(days=14),
-            "tanggal_selesai": today + timedelta(days=104)
-        },
-        {
-            "posisi": "Quality Assurance Intern",
-            "deskripsi": "Melakukan testing manual dan automated testing untuk memastikan kualitas software sebelum release.",
-            "departement": departements[2],  # Engineering
-            "tanggal_mulai": today + timedelta(days=5),
-            "tanggal_selesai": today + timedelta(days=95)
-        },
-        {
-            "posisi": "HR Recruitment Intern",
-            "deskripsi": "Membantu proses screening CV, penjadwalan interview, dan administrasi rekrutmen karyawan baru.",
-            "departement": departements[3],  # Human Resources
-            "tanggal_mulai": today + timedelta(days=12),
-            "tanggal_selesai": today + timedelta(days=102)
-        },
-        {
-            "posisi": "HR Learning & Development Intern",
-            "deskripsi": "Mendukung pelaksanaan program training karyawan dan mempersiapkan materi pelatihan internal.",
-            "departement": departements[3],  # Human Resources
-            "tanggal_mulai": today + timedelta(days=25),
-            "tanggal_selesai": today + timedelta(days=115)
-        },
-        {
-            "posisi": "Legal Research Intern",
-            "deskripsi": "Melakukan riset hukum, review kontrak, dan membantu penyusunan legal opinion untuk keperluan bisnis.",
-            "departement": departements[4],  # Legal
-            "tanggal_mulai": today + timedelta(days=18),
-            "tanggal_selesai": today + timedelta(days=108)
-        },
-        {
-            "posisi": "Corporate Legal Intern",
-            "deskripsi": "Membantu proses perizinan perusahaan, dokumentasi legal, dan monitoring compliance regulasi.",
-            "departement": departements[4],  # Legal
-            "tanggal_mulai": today + timedelta(days=28),
-            "tanggal_selesai": today + timedelta(days=118)
-        },
-        {
-            "posisi": "Digital Marketing Intern",
-            "deskripsi": "Membuat konten untuk social media, mengelola campaign iklan digital, dan analisis engagement metrics.",
-            "departement": departements[5],  # Marketing
-            "tanggal_mulai": today + timedelta(days=8),
-            "tanggal_selesai": today + timedelta(days=98)
-        },
-        {
-            "posisi": "Content Marketing Intern",
-            "deskripsi": "Menulis artikel blog, membuat video tutorial, dan mengoptimasi SEO untuk meningkatkan brand awareness.",
-            "departement": departements[5],  # Marketing
-            "tanggal_mulai": today + timedelta(days=6),
-            "tanggal_selesai": today + timedelta(days=96)
-        },
-        {
-            "posisi": "Brand Marketing Intern",
-            "deskripsi": "Membantu pelaksanaan event marketing, merchandise design, dan brand campaign activation.",
-            "departement": departements[5],  # Marketing
-            "tanggal_mulai": today + timedelta(days=22),
-            "tanggal_selesai": today + timedelta(days=112)
-        },
-        {
-            "posisi": "Product Manager Intern",
-            "deskripsi": "Melakukan user research, membuat product roadmap, dan koordinasi dengan tim engineering untuk development.",
-            "departement": departements[6],  # Product Management
-            "tanggal_mulai": today + timedelta(days=16),
-            "tanggal_selesai": today + timedelta(days=106)
-        },
-        {
-            "posisi": "Product Analyst Intern",
-            "deskripsi": "Analisis data pengguna, A/B testing, dan membuat dashboard metrics untuk product performance.",
-            "departement": departements[6],  # Product Management
-            "tanggal_mulai": today + timedelta(days=11),
-            "tanggal_selesai": today + timedelta(days=101)
-        },
-        {
-            "posisi": "Sales Development Intern",
-            "deskripsi": "Melakukan prospecting calon klien, cold calling, dan mempersiapkan sales presentation.",
-            "departement": departements[7],  # Sales
-            "tanggal_mulai": today + timedelta(days=9),
-            "tanggal_selesai": today + timedelta(days=99)
-        },
-        {
-            "posisi": "Account Management Intern",
-            "deskripsi": "Membantu maintain relationship dengan existing clients dan follow up sales pipeline.",
-            "departement": departements[7],  # Sales
-            "tanggal_mulai": today + timedelta(days=19),
-            "tanggal_selesai": today + timedelta(days=109)
-        },
-        {
-            "posisi": "Corporate Training Intern",
-            "deskripsi": "Membantu persiapan dan pelaksanaan program pelatihan internal karyawan serta evaluasi training.",
-            "departement": departements[8],  # Training
-            "tanggal_mulai": today + timedelta(days=13),
-            "tanggal_selesai": today + timedelta(days=103)
-        },
-        {
-            "posisi": "E-Learning Content Developer",
-            "deskripsi": "Membuat konten e-learning interaktif, video tutorial, dan modul pelatihan digital.",
-            "departement": departements[8],  # Training
-            "tanggal_mulai": today + timedelta(days=26),
-            "tanggal_selesai": today + timedelta(days=116)
-        }
-    ]
-    
+def seed_lowongan(rng, departements, count, today, batch_size=SEED_BATCH_SIZE, log=print):
+    """
+    Seed data Lowongan. Tanggal mulai tersebar dari ±18 bulan lalu sampai 2 bulan ke depan
+    dengan durasi 2-6 bulan, departemen dipilih dengan distribusi berekor panjang.
+    Returns:
+        list: tuple (id_lowongan, tanggal_mulai) untuk pembuatan pendaftar
+    """
+    log("Seeding Lowongan...")
+    dept_weights = _cum_weights(rng, len(departements))
+    durations = [60, 90, 90, 120, 180]
+
     lowongan_list = []
-    for data in lowongan_data:
-        lowongan = Lowongan.objects.create(**data)
-        lowongan_list.append(lowongan)
-        print(f"  ✓ Created: {lowongan.posisi} - {lowongan.departement.nama_dept} (ID: {lowongan.id_lowongan})")
-    
-    print(f"✓ {len(lowongan_list)} Lowongan berhasil dibuat\n")
-    return lowongan_list
-
-
-def seed_pendaftar(lowongan_list):
-    """Seed data Pendaftar"""
-    print("Seeding Pendaftar...")
-    
-    today = datetime.now().date()
-    
-    pendaftar_data = [
-        {
-            "lowongan": lowongan_list[0],  # Finance Administration Intern
-            "nik": "3273010101950001",
-            "name": "Budi Santoso",
-            "gender": "L",
-            "dob": datetime(1995, 1, 1).date(),
-            "address": "Jl. Sudirman No. 123, Jakarta Selatan",
-            "no_telp": "081234567890",
-            "university": "Universitas Indonesia",
-            "major": "Akuntansi",
-            "path_cv": "cv/budi_santoso_cv.pdf",
-            "ipk": Decimal("3.45")
-        },
-        {
-            "lowongan": lowongan_list[4],  # Software Engineering Intern
-            "nik": "3174020202960002",
-            "name": "Siti Nurhaliza",
-            "gender": "P",
-            "dob": datetime(1996, 2, 2).date(),
-            "address": "Jl. Gatot Subroto No. 45, Jakarta Pusat",
-            "no_telp": "081234567891",
-            "university": "Institut Teknologi Bandung",
-            "major": "Teknik Informatika",
-            "path_cv": "cv/siti_nurhaliza_cv.pdf",
-            "ipk": Decimal("3.78")
-        },
-        {
-            "lowongan": lowongan_list[11],  # Digital Marketing Intern
-            "nik": "3201030303970003",
-            "name": "Ahmad Fauzi",
-            "gender": "L",
-            "dob": datetime(1997, 3, 3).date(),
-            "address": "Jl. Ahmad Yani No. 78, Bogor",
-            "no_telp": "081234567892",
-            "university": "Universitas Gadjah Mada",
-            "major": "Ilmu Komunikasi",
-            "path_cv": "cv/ahmad_fauzi_cv.pdf",
-            "ipk": Decimal("3.56")
-        },
-        {
-            "lowongan": lowongan_list[7],  # HR Recruitment Intern
-            "nik": "3275040404980004",
-            "name": "Dewi Lestari",
-            "gender": "P",
-            "dob": datetime(1998, 4, 4).date(),
-            "address": "Jl. Diponegoro No. 56, Bandung",
-            "no_telp": "081234567893",
-            "university": "Universitas Padjadjaran",
-            "major": "Psikologi",
-            "path_cv": "cv/dewi_lestari_cv.pdf",
-            "ipk": Decimal("3.62")
-        },
-        {
-            "lowongan": lowongan_list[2],  # Business Analyst Intern
-            "nik": "3374050505990005",
-            "name": "Rizky Pratama",
-            "gender": "L",
-            "dob": datetime(1999, 5, 5).date(),
-            "address": "Jl. Pemuda No. 89, Semarang",
-            "no_telp": "081234567894",
-            "university": "Universitas Diponegoro",
-            "major": "Manajemen",
-            "path_cv": "cv/rizky_pratama_cv.pdf",
-            "ipk": Decimal("3.71")
-        },
-        {
-            "lowongan": lowongan_list[14],  # Product Manager Intern
-            "nik": "3578060600000006",
-            "name": "Maya Angelina",
-            "gender": "P",
-            "dob": datetime(2000, 6, 6).date(),
-            "address": "Jl. Basuki Rahmat No. 34, Surabaya",
-            "no_telp": "081234567895",
-            "university": "Institut Teknologi Sepuluh Nopember",
-            "major": "Sistem Informasi",
-            "path_cv": "cv/maya_angelina_cv.pdf",
-            "ipk": Decimal("3.84")
-        },
-        {
-            "lowongan": lowongan_list[16],  # Sales Development Intern
-            "nik": "3471070701010007",
-            "name": "Andi Setiawan",
-            "gender": "L",
-            "dob": datetime(2001, 7, 7).date(),
-            "address": "Jl. Pahlawan No. 67, Yogyakarta",
-            "no_telp": "081234567896",
-            "university": "Universitas Gadjah Mada",
-            "major": "Marketing",
-            "path_cv": "cv/andi_setiawan_cv.pdf",
-            "ipk": Decimal("3.50")
-        },
-        {
-            "lowongan": lowongan_list[9],  # Legal Research Intern
-            "nik": "3172080802020008",
-            "name": "Putri Wulandari",
-            "gender": "P",
-            "dob": datetime(2002, 8, 8).date(),
-            "address": "Jl. Rasuna Said No. 12, Jakarta Selatan",
-            "no_telp": "081234567897",
-            "university": "Universitas Indonesia",
-            "major": "Hukum",
-            "path_cv": "cv/putri_wulandari_cv.pdf",
-            "ipk": Decimal("3.68")
-        },
-        {
-            "lowongan": lowongan_list[5],  # DevOps Intern
-            "nik": "3273090903030009",
-            "name": "Dimas Prasetyo",
-            "gender": "L",
-            "dob": datetime(2003, 9, 9).date(),
-            "address": "Jl. Asia Afrika No. 90, Bandung",
-            "no_telp": "081234567898",
-            "university": "Institut Teknologi Bandung",
-            "major": "Teknik Komputer",
-            "path_cv": "cv/dimas_prasetyo_cv.pdf",
-            "ipk": Decimal("3.73")
-        },
-        {
-            "lowongan": lowongan_list[18],  # Corporate Training Intern
-            "nik": "3201100104040010",
-            "name": "Rina Marlina",
-            "gender": "P",
-            "dob": datetime(2004, 10, 10).date(),
-            "address": "Jl. Merdeka No. 23, Bogor",
-            "no_telp": "081234567899",
-            "university": "Universitas Negeri Jakarta",
-            "major": "Pendidikan",
-            "path_cv": "cv/rina_marlina_cv.pdf",
-            "ipk": Decimal("3.59")
-        },
-        {
-            "lowongan": lowongan_list[12],  # Content Marketing Intern
-            "nik": "3174111105050011",
-            "name": "Fajar Ramadhan",
-            "gender": "L",
-            "dob": datetime(2001, 11, 11).date(),
-            "address": "Jl. Thamrin No. 45, Jakarta Pusat",
-            "no_telp": "081234567800",
-            "university": "Universitas Multimedia Nusantara",
-            "major": "Desain Komunikasi Visual",
-            "path_cv": "cv/fajar_ramadhan_cv.pdf",
-            "ipk": Decimal("3.65")
-        },
-        {
-            "lowongan": lowongan_list[1],  # Tax Compliance Intern
-            "nik": "3275121206060012",
-            "name": "Indah Permatasari",
-            "gender": "P",
-            "dob": datetime(2000, 12, 12).date(),
-            "address": "Jl. Cihampelas No. 78, Bandung",
-            "no_telp": "081234567801",
-            "university": "Universitas Padjadjaran",
-            "major": "Perpajakan",
-            "path_cv": "cv/indah_permatasari_cv.pdf",
-            "ipk": Decimal("3.81")
-        },
-        {
-            "lowongan": lowongan_list[6],  # Quality Assurance Intern
-            "nik": "3374010107070013",
-            "name": "Hendra Wijaya",
-            "gender": "L",
-            "dob": datetime(1999, 1, 13).date(),
-            "address": "Jl. Pandanaran No. 56, Semarang",
-            "no_telp": "081234567802",
-            "university": "Universitas Diponegoro",
-            "major": "Sistem Informasi",
-            "path_cv": "cv/hendra_wijaya_cv.pdf",
-            "ipk": Decimal("3.55")
-        },
-        {
-            "lowongan": lowongan_list[13],  # Brand Marketing Intern
-            "nik": "3578020208080014",
-            "name": "Citra Dewi",
-            "gender": "P",
-            "dob": datetime(1998, 2, 14).date(),
-            "address": "Jl. Darmo No. 89, Surabaya",
-            "no_telp": "081234567803",
-            "university": "Universitas Airlangga",
-            "major": "Marketing Communication",
-            "path_cv": "cv/citra_dewi_cv.pdf",
-            "ipk": Decimal("3.70")
-        },
-        {
-            "lowongan": lowongan_list[15],  # Product Analyst Intern
-            "nik": "3471030309090015",
-            "name": "Bayu Aditya",
-            "gender": "L",
-            "dob": datetime(1997, 3, 15).date(),
-            "address": "Jl. Malioboro No. 12, Yogyakarta",
-            "no_telp": "081234567804",
-            "university": "Universitas Gadjah Mada",
-            "major": "Statistika",
-            "path_cv": "cv/bayu_aditya_cv.pdf",
-            "ipk": Decimal("3.76")
-        }
-    ]
-    
-    pendaftar_list = []
-    for data in pendaftar_data:
-        pendaftar = Pendaftar.objects.create(**data)
-        pendaftar_list.append(pendaftar)
-        print(f"  ✓ Created: {pendaftar.name} - {pendaftar.lowongan.posisi} (ID: {pendaftar.id_pendaftar})")
-    
-    print(f"✓ {len(pendaftar_list)} Pendaftar berhasil dibuat\n")
-    return pendaftar_list
-
-
-def seed_transaksi_pendaftaran(pendaftar_list):
-    """Seed data Transaksi Pendaftaran"""
-    print("Seeding Transaksi Pendaftaran...")
-    
-    # Menggunakan ID asli dari pendaftar yang sudah dibuat
-    transaksi_data = [
-        {
-            "pendaftar": pendaftar_list[0],  # Budi Santoso
-            "lowongan": pendaftar_list[0].lowongan,
-            "status": "approved"
-        },
-        {
-            "pendaftar": pendaftar_list[1],  # Siti Nurhaliza
-            "lowongan": pendaftar_list[1].lowongan,
-            "status": "approved"
-        },
-        {
-            "pendaftar": pendaftar_list[2],  # Ahmad Fauzi
-            "lowongan": pendaftar_list[2].lowongan,
-            "status": "pending"
-        },
-        {
-            "pendaftar": pendaftar_list[3],  # Dewi Lestari
-            "lowongan": pendaftar_list[3].lowongan,
-            "status": "approved"
-        },
-        {
-            "pendaftar": pendaftar_list[4],  # Rizky Pratama
-            "lowongan": pendaftar_list[4].lowongan,
-            "status": "pending"
-        },
-        {
-            "pendaftar": pendaftar_list[5],  # Maya Angelina
-            "lowongan": pendaftar_list[5].lowongan,
-            "status": "approved"
-        },
-        {
-            "pendaftar": pendaftar_list[6],  # Andi Setiawan
-            "lowongan": pendaftar_list[6].lowongan,
-            "status": "rejected"
-        },
-        {
-            "pendaftar": pendaftar_list[7],  # Putri Wulandari
-            "lowongan": pendaftar_list[7].lowongan,
-            "status": "pending"
-        },
-        {
-            "pendaftar": pendaftar_list[8],  # Dimas Prasetyo
-            "lowongan": pendaftar_list[8].lowongan,
-            "status": "approved"
-        },
-        {
-            "pendaftar": pendaftar_list[9],  # Rina Marlina
-            "lowongan": pendaftar_list[9].lowongan,
-            "status": "pending"
-        },
-        {
-            "pendaftar": pendaftar_list[10],  # Fajar Ramadhan
-            "lowongan": pendaftar_list[10].lowongan,
-            "status": "approved"
-        },
-        {
-            "pendaftar": pendaftar_list[11],  # Indah Permatasari
-            "lowongan": pendaftar_list[11].lowongan,
-            "status": "approved"
-        },
-        {
-            "pendaftar": pendaftar_list[12],  # Hendra Wijaya
-            "lowongan": pendaftar_list[12].lowongan,
-            "status": "rejected"
-        },
-        {
-            "pendaftar": pendaftar_list[13],  # Citra Dewi
-            "lowongan": pendaftar_list[13].lowongan,
-            "status": "pending"
-        },
-        {
-            "pendaftar": pendaftar_list[14],  # Bayu Aditya
-            "lowongan": pendaftar_list[14].lowongan,
-            "status": "approved"
-        }
-    ]
-    
-    transaksi_list = []
-    for data in transaksi_data:
-        transaksi = TransaksiPendaftaran.objects.create(**data)
-        transaksi_list.append(transaksi)
-        print(f"  ✓ Created: {transaksi.pendaftar.name} -> {transaksi.lowongan.posisi} [{transaksi.status}] (ID: {transaksi.id_transaksi_pendaftaran})")
-    
-    print(f"✓ {len(transaksi_list)} Transaksi Pendaftaran berhasil dibuat\n")
-    return transaksi_list
-
-
-def run_seeder():
-    """Jalankan semua seeder"""
-    print("="*60)
-    print("STARTING DATABASE SEEDER")
-    print("="*60 + "\n")
-    
-    try:
-        # Clear existing data
-        clear_data()
-        
-        # Seed data
-        departements = seed_departements()
-        lowongan_list = seed_lowongan(departements)
-        pendaftar_list = seed_pendaftar(lowongan_list)
-        transaksi_list = seed_transaksi_pendaftaran(pendaftar_list)
-        
-        print("="*60)
-        print("SEEDER COMPLETED SUCCESSFULLY!")
-        print("="*60)
-        print(f"Total Departements: {len(departements)}")
-        print(f"Total Lowongan: {len(lowongan_list)}")
-        print(f"Total Pendaftar: {len(pendaftar_list)}")
-        print(f"Total Transaksi: {len(transaksi_list)}")
-        print("="*60)
-        
-    except Exception as e:
-        print("\n" + "="*60)
-        print("ERROR DURING SEEDING!")
-        print("="*60)
-        print(f"Error: {str(e)}")
-        import traceback
-        traceback.print_exc()
+    posisi_list = list(DEPARTEMEN_POSISI.values())
+    for i in range(count):
+        # Setiap departemen mendapat minimal satu lowongan selama jumlahnya cukup
+        index = i if i < len(departements) else _pick(rng, dept_weights)
+        dept = departements[index]
+        # Departemen ke-n memakai posisi dari departemen dasar ke-(n mod 9)
+        posisi, deskripsi = rng.choice(posisi_list[index % len(posisi_list)])
+        tanggal_mulai = today + timedelta(days=rng.randint(-540, 60))
+        lowongan_list.append(Lowongan(
+            posisi=posisi,
+            deskripsi=deskripsi,
+            departement_id=dept.id_dept,
+            tanggal_mulai=tanggal_mulai,
+            tanggal_selesai=tanggal_mulai + timedelta(days=rng.choice(durations))
+        ))
 
+    created = Lowongan.objects.bulk_create(lowongan_list, batch_size=batch_size)
+    if any(lowongan.pk is None for lowongan in created):
+        created = list(Lowongan.objects.order_by('id_lowongan'))
+    log(f"✓ {len(created)} Lowongan berhasil dibuat\n")
+    return [(lowongan.id_lowongan, lowongan.tanggal_mulai) for lowongan in created]
 
-if __name__ == "__main__":
-    run_seeder()
+
+def _application(rng, lowongan, today, now):
+    """Waktu daftar, status dan waktu diproses satu lamaran ke lowongan (id, tanggal_mulai)"""
+    id_lowongan, tanggal_mulai = lowongan
+    # Pendaftaran dibuka 45 hari sebelum mulai, ramai mendekati tenggat
+    window_end = min(tanggal_mulai, today)
+    window_start = min(tanggal_mulai - timedelta(days=45), window_end - timedelta(days=1))
+    span = (window_end - window_start).days
+    day = window_start + timedelta(days=int(rng.triangular(0, span, span)))
+    created_at = timezone.make_aware(datetime(
+        day.year, day.month, day.day,
+        rng.choices(JAM_KIRIM, cum_weights=BOBOT_JAM)[0], rng.randrange(60), rng.randrange(60)
+    ))
+    created_at = min(created_at, now - timedelta(minutes=rng.randrange(1, 600)))
+    return id_lowongan, tanggal_mulai, created_at
+
+
+def _decide(rng, tanggal_mulai, created_at, ipk, today, now):
+    """Status lamaran: lowongan yang sudah mulai hampir selesai direview, IPK tinggi lebih sering diterima"""
+    reviewed = 0.92 if tanggal_mulai <= today else 0.3
+    if rng.random() >= reviewed:
+        return 'pending', created_at
+    score = float(ipk) if ipk is not None else 3.0
+    approve = min(max(0.22 + (score - 3.35) * 0.5, 0.03), 0.7)
+    status = 'approved' if rng.random() < approve else 'rejected'
+    updated_at = min(created_at + timedelta(hours=rng.randint(12, 21 * 24)), now)
+    return status, updated_at
+
+
+def seed_pendaftar(rng, lowongan_list, count, today, batch_size=SEED_BATCH_SIZE, log=print):
+    """
+    Seed data Pendaftar dan Transaksi Pendaftaran per batch bulk_create.
+    Sebagian pendaftar melamar 2-3 lowongan; popularitas lowongan, jam daftar,
+    IPK (normal sekitar 3.35) dan status mengikuti distribusi yang menyerupai data asli.
+    Returns:
+        tuple: (jumlah pendaftar, jumlah transaksi)
+    """
+    log("Seeding Pendaftar dan Transaksi Pendaftaran...")
+    now = timezone.make_aware(datetime.combine(today, datetime.min.time())) + timedelta(hours=17)
+    lowongan_weights = _cum_weights(rng, len(lowongan_list))
+    total_transaksi = 0
+    started = time.perf_counter()
+
+    for batch_start in range(0, count, batch_size):
+        pendaftar_batch = []
+        applications = []
+        for i in range(batch_start, min(batch_start + batch_size, count)):
+            gender = rng.choice('LP')
+            name = f"{rng.choice(NAMA_DEPAN_L if gender == 'L' else NAMA_DEPAN_P)} {rng.choice(NAMA_BELAKANG)}"
+            ipk = None if rng.random() < 0.03 else Decimal(f"{min(max(rng.gauss(3.35, 0.3), 2.0), 4.0):.2f}")
+
+            lamaran = 1 + (rng.random() < PROB_LAMARAN_KEDUA) + (rng.random() < PROB_LAMARAN_KETIGA)
+            picked = {}
+            while len(picked) < min(lamaran, len(lowongan_list)):
+                lowongan = lowongan_list[_pick(rng, lowongan_weights)]
+                picked.setdefault(lowongan[0], _application(rng, lowongan, today, now))
+            first = min(picked.values(), key=lambda item: item[2])
+            applications.append((ipk, list(picked.values())))
+
+            dob = first[2].date() - timedelta(days=rng.randint(19 * 365, 25 * 365))
+            slug = name.lower().replace(' ', '_')
+            pendaftar_batch.append(Pendaftar(
+                lowongan_id=first[0],
+                nik=f"{rng.choice(KODE_WILAYAH)}{i:010d}",
+                name=name,
+                gender=gender,
+                dob=dob,
+                address=f"Jl. {rng.choice(JALAN)} No. {rng.randint(1, 250)}, {rng.choice(KOTA)}",
+                no_telp=f"08{rng.randint(1100000000, 9999999999)}",
+                university=rng.choice(UNIVERSITAS),
+                major=rng.choice(JURUSAN),
+                path_cv=f"cv/{slug}_{i}_cv.pdf",
+                ipk=ipk,
+                created_at=first[2],
+            ))
+
+        with transaction.atomic(), _explicit_timestamps(Pendaftar, TransaksiPendaftaran):
+            Pendaftar.objects.bulk_create(pendaftar_batch)
+            if any(pendaftar.pk is None for pendaftar in pendaftar_batch):
+                ids = dict(Pendaftar.objects.filter(
+                    nik__in=[pendaftar.nik for pendaftar in pendaftar_batch]
+                ).values_list('nik', 'id_pendaftar'))
+                for pendaftar in pendaftar_batch:
+                    pendaftar.pk = ids[pendaftar.nik]
+
+            transaksi_batch = []
+            for pendaftar, (ipk, lamaran) in zip(pendaftar_batch, applications):
+                for id_lowongan, tanggal_mulai, created_at in lamaran:
+                    status, updated_at = _decide(rng, tanggal_mulai, created_at, ipk, today, now)
+                    transaksi_batch.append(TransaksiPendaftaran(
+                        pendaftar_id=pendaftar.pk,
+                        lowongan_id=id_lowongan,
+                        status=status,
+                        created_at=created_at,
+                        updated_at=updated_at,
+                    ))
+            TransaksiPendaftaran.objects.bulk_create(transaksi_batch)
+        total_transaksi += len(transaksi_batch)
+
+        done = min(batch_start + batch_size, count)
+        elapsed = time.perf_counter() - started
+        log(f"  ✓ {done}/{count} pendaftar ({done / elapsed:.0f} baris/detik)")
+
+    log(f"✓ {count} Pendaftar dan {total_transaksi} Transaksi Pendaftaran berhasil dibuat\n")
+    return count, total_transaksi
+
+
+def refresh_derived_data(log=print):
+    """bulk_create tidak memicu signal: bangun ulang counter dan buang cache/index turunan"""
+    log("Membangun ulang counter dashboard...")
+    DashboardCounterService.rebuild()
+    LowonganService.bump_feed_version()
+    DashboardCache.invalidate()
+    SearchService.invalidate()
+    LOWONGAN_SEARCH_CACHE.invalidate()
+    log("✓ Counter dan cache diperbarui\n")
+
+
+def run_seeder(departemen=None, lowongan=None, pendaftar=None, seed=DEFAULT_SEED,
+               batch_size=SEED_BATCH_SIZE, today=None, log=print):
+    """
+    Jalankan semua seeder (data lama dihapus)
+    Args:
+        departemen, lowongan, pendaftar (int): skala dataset, default DEFAULT_SCALE
+        seed (int): seed generator acak; seed dan today yang sama menghasilkan data yang sama
+        batch_size (int): jumlah baris per bulk_create/transaksi
+        today (date): tanggal acuan data, default hari ini
+        log (callable): penulis pesan progress
+    Returns:
+        dict: jumlah baris per tabel dan durasi (detik)
+    """
+    departemen = DEFAULT_SCALE['departemen'] if departemen is None else departemen
+    lowongan = DEFAULT_SCALE['lowongan'] if lowongan is None else lowongan
+    pendaftar = DEFAULT_SCALE['pendaftar'] if pendaftar is None else pendaftar
+    if departemen < 1 or lowongan < 0 or pendaftar < 0 or batch_size < 1:
+        raise ValueError('Jumlah departemen dan batch minimal 1, lowongan dan pendaftar tidak boleh negatif')
+    if pendaftar and not lowongan:
+        raise ValueError('Pendaftar membutuhkan minimal satu lowongan')
+    today = today or timezone.localdate()
+    rng = random.Random(seed)
+
+    log("=" * 60)
+    log("STARTING DATABASE SEEDER")
+    log("=" * 60 + "\n")
+    started = time.perf_counter()
+
+    clear_data(batch_size, log)
+    departements = seed_departements(departemen, batch_size, log)
+    lowongan_list = seed_lowongan(rng, departements, lowongan, today, batch_size, log)
+    total_pendaftar, total_transaksi = seed_pendaftar(rng, lowongan_list, pendaftar, today, batch_size, log)
+    refresh_derived_data(log)
+
+    result = {
+        'departemen': len(departements),
+        'lowongan': len(lowongan_list),
+        'pendaftar': total_pendaftar,
+        'transaksi': total_transaksi,
+        'elapsed': round(time.perf_counter() - started, 3),
+    }
+    log("=" * 60)
+    log("SEEDER COMPLETED SUCCESSFULLY!")
+    log("=" * 60)
+    log(f"Total Departements: {result['departemen']}")
+    log(f"Total Lowongan: {result['lowongan']}")
+    log(f"Total Pendaftar: {result['pendaftar']}")
+    log(f"Total Transaksi: {result['transaksi']}")
+    log(f"Durasi: {result['elapsed']} detik")
+    log("=" * 60)
+    return result